@@ -0,0 +1,248 @@
+# Convex hull by divide and conquer
+#
+# This module builds the hull without any OpenGL, so that it can be
+# imported and used without a display.  main.py shows it being built.
+#
+# A HullJob holds the points of one hull and the settings for building
+# it, and there are no globals, so hulls can be built in several threads
+# at once:
+#
+#   with open('points5.txt', 'rb') as f:
+#       hull = HullJob(readPoints(f)).run()
+
+
+# Point
+#
+# A Point stores its coordinates and pointers to the two points beside
+# it (CW and CCW) on its hull.  The CW and CCW pointers are None if
+# the point is not on any hull.
+#
+# For debugging, you can set the 'highlight' flag of a point.  This
+# will cause the point to be highlighted when it's drawn.
+
+class Point(object):
+
+    def __init__(self, coords):
+
+        self.x = float(coords[0])  # coordinates
+        self.y = float(coords[1])
+
+        self.ccwPoint = None  # point CCW of this on hull
+        self.cwPoint = None  # point CW of this on hull
+
+        self.highlight = False  # to cause drawing to highlight this point
+
+    def __repr__(self):
+        return 'pt(%g,%g)' % (self.x, self.y)
+
+
+# Read points from a file of lines "x y", sorted by increasing x and,
+# for equal x, by increasing y
+
+def readPoints(f):
+
+    points = [Point(line.split(b' ')) for line in f.readlines()]
+    points.sort(key=lambda p: (p.x, p.y))
+
+    return points
+
+
+# Determine whether three points make a left or right turn
+
+LEFT_TURN = 1
+RIGHT_TURN = 2
+COLLINEAR = 3
+
+
+def turn(a, b, c):
+    det = (a.x - c.x) * (b.y - c.y) - (b.x - c.x) * (a.y - c.y)
+
+    if det > 0:
+        return LEFT_TURN
+    elif det < 0:
+        return RIGHT_TURN
+    else:
+        return COLLINEAR
+
+
+# A hull job
+#
+# The points to find the hull of and how to find it.  run() builds the
+# hull and returns the points on it, CCW.
+
+class HullJob(object):
+
+    def __init__(self, points, discardPoints=False, show=None):
+
+        self.points = points  # sorted by increasing x, then y (see readPoints())
+        self.discardPoints = discardPoints  # unlink points from the hull as they are passed over in merge()
+        self.show = show  # if set, called as the hull is built (see buildHull())
+        self.hull = None  # points on the hull, once built
+
+    def run(self):
+
+        self.hull = self.buildHull(self.points)
+        return self.hull
+
+    # Merge two hulls
+    def merge(self, left_hull, right_hull):
+        p1 = max(left_hull, key = lambda point: point.x)
+        q1 = min(right_hull, key = lambda point: point.x)
+        p2 = p1
+        q2 = q1
+
+        tempP = None
+
+        prev_p = None
+        prev_q = None
+        while (True):
+            prev_p = p1
+            prev_q = q1
+            if q1.cwPoint:
+                # Whenever you turn left, move P clockwise
+                while turn(p1, q1, q1.cwPoint) == LEFT_TURN:
+                    tempP = q1
+                    q1 = q1.cwPoint
+                    if self.discardPoints:
+                        tempP.cwPoint = None
+            if p1.ccwPoint:
+                # Just turn right and move P
+                while turn(q1, p1, p1.ccwPoint) != LEFT_TURN:
+                    tempP = p1
+                    p1 = p1.ccwPoint
+                    if self.discardPoints:
+                        tempP.ccwPoint = None
+
+            if p1 == prev_p and q1 == prev_q:
+                break
+
+        prev_p = None
+        prev_q = None
+        while (True):
+            prev_p = p2
+            prev_q = q2
+            if q2.ccwPoint:
+                # Just turn right and move P
+                while turn(p2, q2, q2.ccwPoint) != LEFT_TURN:
+                    tempP = q2
+                    q2 = q2.ccwPoint
+                    if self.discardPoints:
+                        tempP.ccwPoint = None
+            if p2.cwPoint:
+                # Move P every time you turn left
+                while turn(q2, p2, p2.cwPoint) == LEFT_TURN:
+                    tempP = p2
+                    p2 = p2.cwPoint
+                    if self.discardPoints:
+                        tempP.cwPoint = None
+            if p2 == prev_p and q2 == prev_q:
+                break
+
+        # connect
+        p1.cwPoint = q1
+        q1.ccwPoint = p1
+
+        p2.ccwPoint = q2
+        q2.cwPoint = p2
+
+        # result
+        result = []
+        start = p1
+        while (True):
+            result.append(p1)
+            p1 = p1.ccwPoint
+
+            if p1 == start:
+                break
+
+        return result
+
+    # Build a convex hull from a set of point
+    #
+    # Use the method described in class
+    #
+    # If the job has a 'show' function, it is called as the hull is built
+    # to show the points: show(True) to show them and pause, show(False)
+    # to show them without pausing.
+
+    def buildHull(self, points):
+
+        result = None
+
+        # Check cases
+        if len(points) == 3:
+
+            # Base case of 3 points: make a hull
+            # [YOUR CODE HERE]
+            t = turn(points[0], points[1], points[2])
+            if t == LEFT_TURN:
+                points[0].ccwPoint = points[1]
+                points[1].ccwPoint = points[2]
+                points[2].ccwPoint = points[0]
+                points[0].cwPoint = points[2]
+                points[1].cwPoint = points[0]
+                points[2].cwPoint = points[1]
+            elif t == RIGHT_TURN:
+                points[0].ccwPoint = points[2]
+                points[1].ccwPoint = points[0]
+                points[2].ccwPoint = points[1]
+                points[0].cwPoint = points[1]
+                points[1].cwPoint = points[2]
+                points[2].cwPoint = points[0]
+
+            result = points
+
+        elif len(points) == 2:
+            # Base case of 2 points: make a hull
+            # [YOUR CODE HERE]
+            points[0].ccwPoint = points[1]
+            points[0].cwPoint = points[1]
+            points[1].ccwPoint = points[0]
+            points[1].cwPoint = points[0]
+
+            result = points
+
+        else:
+            # Recurse to build left and right hull
+            # [YOUR CODE HERE]
+            left_hull = self.buildHull(points[0: int(len(points)/2)])
+            right_hull = self.buildHull(points[int(len(points)/2):])
+
+            # You can do the following to help in debugging.  The code
+            # below highlights all the points, then shows them, then
+            # pauses until you press 'p'.  While paused, you can click on
+            # a point and its coordinates will be printed in the console
+            # window.  If you are using an IDE in which you can inspect
+            # your variables, this will help you to identify which point
+            # on the screen is which point in your data structure.
+            #
+            # This is good to do, for example, after you have recursively
+            # built two hulls (above), to see that the two hulls look right.
+            #
+            # This same highlighting can also be done immediately after you have merged to hulls
+            # ... again, to see that the merged hull looks right.
+
+            if self.show:
+                for p in points:
+                    p.highlight = True
+                self.show(True)
+
+            # Merge the two hulls
+            # [YOUR CODE HERE]
+            result = self.merge(left_hull, right_hull)
+
+            # Pause to see the result, then remove the highlighting from
+            # the points that you previously highlighted:
+
+            if self.show:
+                self.show(True)
+                for p in points:
+                    p.highlight = False
+
+        # At the very end of buildHull(), you should show the result after
+        # every merge, as below.  This does not pause.
+
+        if self.show:
+            self.show(False)
+
+        return result
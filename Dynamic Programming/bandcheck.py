@@ -0,0 +1,103 @@
+# Randomized check of the banded DP in banddp.py
+#
+# Usage: python bandcheck.py [-n count] [-seed n]
+#
+#   -n      number of random slice pairs for each cost and width (default 1000)
+#   -seed   seed for the random slices (default 1)
+#
+# Makes pairs of random star-shaped slices, with between 3 and 30
+# vertices each, and for each cost function in costs.py and band
+# widths 1 and 2, checks that the path banddp.bandPath() finds costs
+# no more than the min-area path of the full table from
+# mesher.fillTables().  Prints the pairs for which it costs more, and
+# exits with status 1 if there are any.
+
+
+import sys, math, random
+
+import mesher
+import banddp
+import costs
+
+
+# A random star-shaped slice of n vertices at height z, counterclockwise,
+# ending with its first vertex again as in mesher.triangulatePair()
+
+def randomSlice( n, z ):
+
+    angles = sorted( random.uniform( 0, 2 * math.pi ) for i in range(n) )
+    verts = []
+    for a in angles:
+        radius = random.uniform( 10, 100 )
+        verts.append( [ radius * math.cos(a), radius * math.sin(a), z ] )
+
+    return verts + [ verts[0] ]
+
+
+# The cost of 'path', as banddp.bandPath() returns it, summed from
+# [0][0] on as mesher.fillTables() sums it
+
+def pathCost( cost, path ):
+
+    r, c = 0, 0
+    total = 0.0
+    for fromRow in reversed(path):
+        if fromRow:
+            r += 1
+            total = total + cost.steps(r)[0][c]
+        else:
+            c += 1
+            total = total + cost.steps(r)[1][c]
+
+    return total
+
+
+def main():
+
+    count = 1000
+    seed = 1
+
+    args = sys.argv[1:]
+    while args:
+        if args[0] == '-n' and len(args) > 1:
+            count = int(args[1])
+            args = args[2:]
+        elif args[0] == '-seed' and len(args) > 1:
+            seed = int(args[1])
+            args = args[2:]
+        else:
+            print( 'Usage: %s [-n count] [-seed n]' % sys.argv[0] )
+            sys.exit(1)
+
+    random.seed( seed )
+
+    worse = 0
+    for costName in sorted( costs.costFunctions ):
+        settings = mesher.Settings( False, False, None, None, 'closest', costName )
+        costFunction = costs.costFunctions[costName]
+        for width in (1, 2):
+            widened = 0
+            for i in range(count):
+                verts0 = randomSlice( random.randint(3, 30), 0.0 )
+                verts1 = randomSlice( random.randint(3, 30), 10.0 )
+                cost = costFunction( verts0, verts1 )
+                minArea, minDir = mesher.fillTables( verts0, verts1, settings )
+                path, finalWidth = banddp.bandPath( cost, width )
+                best = minArea[-1][-1]
+                got = pathCost( cost, path )
+                if finalWidth > width:
+                    widened += 1
+                if got > best + 1e-9 * abs(best):
+                    worse += 1
+                    print( '%s, width %d: %dx%d pair costs %g, not %g (final width %d)'
+                           % (costName, width, len(verts1), len(verts0), got, best, finalWidth) )
+            print( '%-8s width %d: %d pairs, %d widened' % (costName, width, count, widened) )
+
+    print( '%d worse than the full DP' % worse )
+    if worse > 0:
+        sys.exit(1)
+
+
+
+if __name__ == '__main__':
+    main()
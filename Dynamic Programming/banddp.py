@@ -0,0 +1,215 @@
+# Banded version of the min-area DP in mesher.py
+#
+# Between two contours with about the same number of vertices, spaced
+# alike, the min-area path through the (n1 x n0) table stays near the
+# "diagonal" from [0][0] to [n1-1][n0-1], along which column c is
+# r (n0-1)/(n1-1) in row r.  bandedPath() fills in only the entries
+# within 'width' columns of the diagonal, and finds the min-area path
+# among those that stay in that band, in O((n0 + n1) width) time and
+# memory rather than O(n0 n1).  The step costs come from the cost
+# function's stepRange() (see costs.py), so only the band's are
+# computed.
+#
+# The band cuts off the steps out of it: from the last entry of a row
+# to the entry to its right, and from the entries of a row to the left
+# of the band in the row below.  The step costs are never negative, so
+# a lower bound on the cost of any path that leaves the band comes from
+# the band's own DP (see bandedPath()).  If the band's path costs no
+# more than that, it is a min-area path of the whole table.  If not,
+# bandPath() doubles the width and does the DP again, until it does or
+# the band is the whole table, which is the full DP and cuts off
+# nothing.  The bound adds some costs in another order than the full
+# DP, so it holds to within rounding.  bandcheck.py checks it against
+# mesher.fillTables() on random slices.
+#
+# Where it is given the same entries, the DP adds and compares exactly
+# as mesher.fillTables() does, so the path is the same as the full DP's
+# whenever that path lies in the band.
+
+
+import math
+
+
+# Columns cmin[r]..cmax[r] of each row r of the band of half-width
+# 'width' around the diagonal.  Both never decrease from one row to the
+# next, and each row's first column is at most the last column of the
+# row above, so that the band has a path through it.
+
+def bandBounds( n0, n1, width ):
+
+    slope = (n0 - 1) / (n1 - 1) if n1 > 1 else 0
+    width = max( width, math.ceil( slope ) + 1 )
+
+    cmin = []
+    cmax = []
+    for r in range(n1):
+        centre = r * slope
+        cmin.append( max( 0, math.floor( centre - width ) ) )
+        cmax.append( min( n0 - 1, math.ceil( centre + width ) ) )
+
+    return cmin, cmax
+
+
+# The min-area path in the band (cmin, cmax) of the table of 'cost', a
+# cost function made for the slice pair (see costs.py).  Returns the
+# path as a list of booleans from [n1-1][n0-1] back to [0][0], True for
+# a step from the previous row, as mesher.backtrack() does, its cost,
+# and a lower bound on the cost of any path that leaves the band
+# (infinity if the band is the whole table).
+#
+# A path that leaves the band has a first step out of it, after a part
+# in the band, and a last step back into it, before a part in the band,
+# which is in a row at or after the row the first step goes to.  The
+# step costs are never negative, so the path costs at least the least
+# cost in the band to the first step, plus the steps out and in, plus
+# the least cost in the band from the last step on.  The costs from
+# each entry to [n1-1][n0-1] come from the same DP run backwards.
+
+def bandedPath( cost, cmin, cmax ):
+
+    n0 = cost.geom.n0
+    n1 = len(cmin)
+
+    # The step costs of each row are kept, from the first column of the
+    # row above, for the steps out of the band into the row, to one
+    # column past the band, for the step out of it along the row.
+
+    starts = []     # per row, the column of its first step costs
+    stepCosts = []  # ... (rowCosts, colCosts) from there
+    costsTo = []    # ... the min cost in the band to each entry
+    fromRows = []   # ... 1 for each entry whose path steps from the previous row
+
+    for r in range(n1):
+
+        lo = cmin[r]
+        hi = cmax[r]
+        start = cmin[r - 1] if r > 0 else 0
+        rowCosts, colCosts = cost.stepRange( r, start, min( hi + 1, n0 - 1 ) )
+
+        row = [ 0.0 ] * (hi - lo + 1)
+        fromRow = bytearray( hi - lo + 1 )
+
+        if r == 0:
+
+            # Row 0 can only step along the row
+
+            for c in range(1, hi + 1):
+                row[c] = row[c - 1] + colCosts[c]
+
+        else:
+
+            # Columns lo..min(hi,prevHi) can step from the previous row,
+            # and the first of them can't step from the previous column
+
+            prev = costsTo[r - 1]
+            last = min( hi, cmax[r - 1] )
+            left = prev[lo - start] + rowCosts[lo - start]
+            row[0] = left
+            fromRow[0] = 1
+
+            for c in range(lo + 1, last + 1):
+                area_from_row = prev[c - start] + rowCosts[c - start]
+                area_from_col = left + colCosts[c - start]
+                if area_from_row < area_from_col:
+                    left = area_from_row
+                    fromRow[c - lo] = 1
+                else:
+                    left = area_from_col
+                row[c - lo] = left
+
+            # The rest can only step from the previous column
+
+            for c in range(last + 1, hi + 1):
+                left = left + colCosts[c - start]
+                row[c - lo] = left
+
+        starts.append( start )
+        stepCosts.append( (rowCosts, colCosts) )
+        costsTo.append( row )
+        fromRows.append( fromRow )
+
+    # Run the DP backwards for the min cost in the band from each entry,
+    # noting per row the least cost in the band to a step out of the
+    # band into the row, and from a step into the band out of the row
+
+    inf = float('inf')
+    outTo = [ inf ] * n1
+    inFrom = [ inf ] * n1
+
+    nextRow = None
+    for r in range(n1 - 1, -1, -1):
+
+        lo = cmin[r]
+        hi = cmax[r]
+        start = starts[r]
+        rowCosts, colCosts = stepCosts[r]
+
+        row = [ 0.0 ] * (hi - lo + 1)
+        for c in range(hi - 1, lo - 1, -1):
+            row[c - lo] = row[c + 1 - lo] + colCosts[c + 1 - start]
+        if nextRow is not None:
+            nextLo = cmin[r + 1]
+            nextStart = starts[r + 1]
+            nextRowCosts = stepCosts[r + 1][0]
+            area_from_row = nextRow[hi - nextLo] + nextRowCosts[hi - nextStart]
+            row[hi - lo] = area_from_row
+            for c in range(hi - 1, lo - 1, -1):
+                area_from_col = row[c + 1 - lo] + colCosts[c + 1 - start]
+                if c >= nextLo:
+                    area_from_row = nextRow[c - nextLo] + nextRowCosts[c - nextStart]
+                    row[c - lo] = min( area_from_row, area_from_col )
+                else:
+                    row[c - lo] = area_from_col
+
+        if hi < n0 - 1:
+            outTo[r] = min( outTo[r], costsTo[r][hi - lo] + colCosts[hi + 1 - start] )
+        if r > 0:
+            for c in range(start, lo):
+                outTo[r] = min( outTo[r], costsTo[r - 1][c - start] + rowCosts[c - start] )
+            for c in range(cmax[r - 1] + 1, hi + 1):
+                inFrom[r - 1] = min( inFrom[r - 1], rowCosts[c - start] + row[c - lo] )
+        if lo > 0:
+            inFrom[r] = min( inFrom[r], colCosts[lo - start] + row[0] )
+
+        nextRow = row
+
+    bound = inf
+    laterIn = inf
+    for r in range(n1 - 1, -1, -1):
+        laterIn = min( laterIn, inFrom[r] )
+        bound = min( bound, outTo[r] + laterIn )
+
+    # Walk back
+
+    path = []
+    r, c = n1 - 1, cmax[n1 - 1]
+    while r > 0 or c > 0:
+        if fromRows[r][c - cmin[r]]:
+            path.append( True )
+            r -= 1
+        else:
+            path.append( False )
+            c -= 1
+
+    return path, costsTo[-1][-1], bound
+
+
+# The min-area path for 'cost', as bandedPath() returns it, starting
+# with a band of half-width 'width' (at least 1) and doubling it until
+# no path that leaves the band can cost less than the band's path.
+# Also returns the final width.
+
+def bandPath( cost, width ):
+
+    if width < 1:
+        raise ValueError( 'band width must be at least 1, not %d' % width )
+
+    n0 = cost.geom.n0
+    n1 = cost.geom.n1
+
+    while True:
+        cmin, cmax = bandBounds( n0, n1, width )
+        path, pathCost, bound = bandedPath( cost, cmin, cmax )
+        if pathCost <= bound:
+            return path, width
+        width *= 2
@@ -0,0 +1,237 @@
+# Cache of slice-pair triangulations
+#
+# Meshing the same slices again with the same settings gives the same
+# triangles, so they are kept under a key that is a hash of everything
+# that determines them (see mesher.pairKey()): the coordinates of the
+# two slices and the cost settings.  A pair whose slices haven't
+# changed is then looked up rather than meshed, and only pairs with an
+# edited slice are meshed again.
+#
+# A PairCache keeps the triangles in memory, the most recently used
+# 'maxEntries' of them, and, if it is given a directory, also on disk,
+# one file per pair, so that they are kept from one run to the next.
+# When the files take more than 'maxBytes', the least recently used
+# are removed.
+#
+# Triangles are stored as flat arrays of ints, as the worker processes
+# in mesher.py return them.  On disk each array follows a header of its
+# number of ints and a hash of its bytes, so that a file cut short or
+# written in part is found out when it is read.  It is then taken as a
+# miss and removed.
+#
+# Files are written under a temporary name first.  One left behind by
+# a process that was killed while writing is removed by the next
+# PairCache on the directory, once it is 'staleSeconds' old.
+#
+# A PairCache can be shared by meshing jobs in several threads (see
+# meshing.MeshJob).  Its in-memory entries and counts are changed only
+# while holding its lock.
+
+
+import os, time, array, hashlib, tempfile, threading, collections
+
+
+# A key from a list of byte strings.  Each is hashed with its length,
+# so that different lists never run together into the same bytes.
+
+def digest( parts ):
+
+    h = hashlib.blake2b( digest_size=20 )
+
+    for part in parts:
+        h.update( len(part).to_bytes( 8, 'little' ) )
+        h.update( part )
+
+    return h.hexdigest()
+
+
+class PairCache:
+
+    suffix = '.tri'
+    tempSuffix = '.part'
+    staleSeconds = 3600
+
+    def __init__( self, directory=None, maxEntries=1024, maxBytes=256*1024*1024 ):
+
+        self.memory = collections.OrderedDict()  # key -> array of ints, least recently used first
+        self.maxEntries = maxEntries
+
+        self.directory = directory
+        self.maxBytes = maxBytes
+        self.diskBytes = 0
+
+        self.hits = 0
+        self.misses = 0
+
+        self.lock = threading.RLock()
+
+        if directory is not None:
+            os.makedirs( directory, exist_ok=True )
+            self.removeStale()
+            self.diskBytes = sum( size for path, mtime, size in self.files() )
+
+    def __repr__( self ):
+
+        return 'PairCache(%d in memory, %s, %d hits, %d misses)' % (len(self.memory), self.directory, self.hits, self.misses)
+
+    # The array stored under 'key', or None
+
+    def get( self, key ):
+
+        with self.lock:
+
+            tris = self.memory.get( key )
+
+            if tris is not None:
+                self.memory.move_to_end( key )
+
+            elif self.directory is not None:
+                path = self.path( key )
+                try:
+                    with open( path, 'rb' ) as f:
+                        tris = self.decode( f.read() )
+                    if tris is None:
+                        self.remove( path )
+                    else:
+                        os.utime( path )  # recently used
+                except OSError:
+                    tris = None
+                if tris is not None:
+                    self.remember( key, tris )
+
+            if tris is None:
+                self.misses += 1
+            else:
+                self.hits += 1
+
+            return tris
+
+    def put( self, key, tris ):
+
+        self.remember( key, tris )
+
+        if self.directory is None:
+            return
+
+        # Write to a temporary file and rename it, so that a
+        # half-written file is never read
+
+        data = self.encode( tris )
+        fd, temp = tempfile.mkstemp( suffix=self.tempSuffix, dir=self.directory )
+        try:
+            with os.fdopen( fd, 'wb' ) as f:
+                f.write( data )
+        except BaseException:
+            os.remove( temp )
+            raise
+
+        with self.lock:
+            path = self.path( key )
+            try:
+                self.diskBytes -= os.path.getsize( path )  # replaced
+            except OSError:
+                pass
+            os.replace( temp, path )
+
+            self.diskBytes += len(data)
+            if self.diskBytes > self.maxBytes:
+                self.evict()
+
+    # The bytes of a file: the header, then the array
+
+    def encode( self, tris ):
+
+        data = tris.tobytes()
+        check = hashlib.blake2b( data, digest_size=16 ).digest()
+
+        return len(tris).to_bytes( 8, 'little' ) + check + data
+
+    # The array in the bytes of a file, or None if they don't hold one
+
+    def decode( self, data ):
+
+        if len(data) < 24:
+            return None
+
+        count = int.from_bytes( data[:8], 'little' )
+        check = data[8:24]
+        data = data[24:]
+
+        tris = array.array( 'i' )
+        if len(data) != count * tris.itemsize or hashlib.blake2b( data, digest_size=16 ).digest() != check:
+            return None
+        tris.frombytes( data )
+
+        return tris
+
+    def remember( self, key, tris ):
+
+        with self.lock:
+
+            self.memory[key] = tris
+            self.memory.move_to_end( key )
+
+            while len(self.memory) > self.maxEntries:
+                self.memory.popitem( last=False )
+
+    def path( self, key ):
+
+        return os.path.join( self.directory, key + self.suffix )
+
+    def remove( self, path ):
+
+        try:
+            size = os.path.getsize( path )
+            os.remove( path )
+        except OSError:
+            return
+        self.diskBytes -= size
+
+    # Remove temporary files that no put() is still writing
+
+    def removeStale( self ):
+
+        before = time.time() - self.staleSeconds
+
+        for name in os.listdir( self.directory ):
+            if name.endswith( self.tempSuffix ):
+                path = os.path.join( self.directory, name )
+                try:
+                    if os.path.getmtime( path ) < before:
+                        os.remove( path )
+                except OSError:
+                    pass
+
+    # (path, mtime, size) of each file in the directory
+
+    def files( self ):
+
+        found = []
+        for name in os.listdir( self.directory ):
+            if name.endswith( self.suffix ):
+                path = os.path.join( self.directory, name )
+                try:
+                    st = os.stat( path )
+                except OSError:
+                    continue
+                found.append( (path, st.st_mtime, st.st_size) )
+        return found
+
+    # Remove the least recently used files until the rest take at most
+    # 3/4 of 'maxBytes', so that this isn't done on every put()
+
+    def evict( self ):
+
+        files = sorted( self.files(), key=lambda f: f[1] )
+        total = sum( size for path, mtime, size in files )
+
+        for path, mtime, size in files:
+            if total <= self.maxBytes * 3 // 4:
+                break
+            try:
+                os.remove( path )
+            except OSError:
+                pass
+            total -= size
+
+        self.diskBytes = total
@@ -0,0 +1,165 @@
+# Slices with several contours
+#
+# Where a bone branches, a slice has more than one closed contour.
+# Between two slices, each contour of one is joined to the contours of
+# the other that it overlaps, as seen along the y axis (the slices are
+# roughly perpendicular to it):
+#
+#   matchContours()     finds the pairs of contours whose bounding
+#                       boxes overlap in x and z, by sweeping over the
+#                       boxes in order of x, so that the time is about
+#                       linear in the number of contours unless many
+#                       boxes overlap.  The pairs are then grouped
+#                       into connected sets: one contour to one (the
+#                       usual case), one to several (a branch), several
+#                       to one (a merge) or several to several.
+#
+#   compositeContour()  joins several contours into one, for a branch
+#                       or merge (Christiansen and Sederberg).  Each
+#                       contour is cut open at its vertex closest to
+#                       the contours joined so far and spliced in with
+#                       a "bridge" there, which is walked once in each
+#                       direction.  The composite goes around all of
+#                       them in the same direction as they go.
+#
+# The one-to-one DP in mesher.triangulatePair() then tiles each group,
+# with the composite contour on the side that has several.  The bridge
+# vertices appear twice in the composite, but they are the same
+# vertices, so the tiling is closed across the bridge.
+#
+# A contour that overlaps no contour of the other slice is left open,
+# as are the top and bottom slices.  If each slice has just one contour,
+# the two are always joined, whether or not they overlap.
+
+
+from vectors import length3
+
+
+# Bounding box (xmin, xmax, zmin, zmax) of a contour, in the plane of
+# the slice
+
+def boundingBox( coords ):
+
+    xs = [ v[0] for v in coords ]
+    zs = [ v[2] for v in coords ]
+
+    return ( min(xs), max(xs), min(zs), max(zs) )
+
+
+# Pairs (i, j) such that boxes0[i] and boxes1[j] overlap
+#
+# The boxes of both lists are swept in order of xmin.  A box is
+# compared only with the boxes of the other list that are still
+# "active" (that started before it and whose xmax is at least its
+# xmin), and of those, only the ones that overlap in z are kept.
+
+def overlappingBoxes( boxes0, boxes1 ):
+
+    events = sorted( [ (b[0], 0, i) for i, b in enumerate(boxes0) ] +
+                     [ (b[0], 1, j) for j, b in enumerate(boxes1) ] )
+
+    boxes = ( boxes0, boxes1 )
+    active = ( [], [] )
+    pairs = []
+
+    for xmin, side, i in events:
+
+        box = boxes[side][i]
+        other = 1 - side
+
+        active[other][:] = [ k for k in active[other] if boxes[other][k][1] >= xmin ]
+
+        for k in active[other]:
+            b = boxes[other][k]
+            if b[2] <= box[3] and box[2] <= b[3]:
+                pairs.append( (i, k) if side == 0 else (k, i) )
+
+        active[side].append( i )
+
+    return sorted( pairs )
+
+
+# Groups of contours to be tiled together between two slices, as a
+# list of (top, bottom) where 'top' and 'bottom' are lists of indices
+# into 'contours0' and 'contours1'.  Both lists of a group are
+# non-empty and in order.  Groups are in order of their first top
+# contour.
+
+def matchContours( contours0, contours1 ):
+
+    if len(contours0) == 1 and len(contours1) == 1:
+        return [ ([0], [0]) ]
+
+    pairs = overlappingBoxes( [ boundingBox(c) for c in contours0 ],
+                              [ boundingBox(c) for c in contours1 ] )
+
+    # Connected sets, with top contour i as node i and bottom contour j
+    # as node n0+j, by union-find
+
+    n0 = len(contours0)
+    parent = list( range( n0 + len(contours1) ) )
+
+    def find( a ):
+        while parent[a] != a:
+            parent[a] = parent[parent[a]]
+            a = parent[a]
+        return a
+
+    for i, j in pairs:
+        parent[find(i)] = find(n0 + j)
+
+    groups = {}
+    for i, j in pairs:
+        top, bottom = groups.setdefault( find(i), (set(), set()) )
+        top.add( i )
+        bottom.add( j )
+
+    return sorted( (sorted(top), sorted(bottom)) for top, bottom in groups.values() )
+
+
+# Join 'contours' (lists of [x,y,z]) into one.  Returns its vertices
+# and, for each, its index in the concatenation of 'contours'.
+#
+# 'closestPair( coords0, coords1 )' returns the indices of the closest
+# pair of vertices of two contours (it is mesher.closestPair(), which
+# isn't imported here since mesher imports this module).
+
+def compositeContour( contours, closestPair ):
+
+    offsets = [0]
+    for c in contours:
+        offsets.append( offsets[-1] + len(c) )
+
+    # Start with the contour with the most vertices, then repeatedly
+    # splice in the contour that is closest to those joined so far
+
+    first = max( range(len(contours)), key=lambda k: len(contours[k]) )
+    ids = list( range( offsets[first], offsets[first+1] ) )
+    coords = list( contours[first] )
+    left = [ k for k in range(len(contours)) if k != first ]
+
+    while left:
+
+        best = None
+        for k in left:
+            i, j = closestPair( coords, contours[k] )
+            a = coords[i]
+            b = contours[k][j]
+            dist = length3( a[0]-b[0], a[1]-b[1], a[2]-b[2] )
+            if best is None or dist < best[0]:
+                best = ( dist, k, i, j )
+
+        dist, k, i, j = best
+        left.remove( k )
+
+        # After vertex i, go over the bridge to vertex j of contour k,
+        # around contour k back to vertex j, and back over the bridge
+        # to vertex i
+
+        m = len(contours[k])
+        loop = [ (j + t) % m for t in range(m + 1) ]
+
+        ids = ids[:i+1] + [ offsets[k] + t for t in loop ] + ids[i:]
+        coords = coords[:i+1] + [ contours[k][t] for t in loop ] + coords[i:]
+
+    return coords, ids
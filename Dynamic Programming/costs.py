@@ -0,0 +1,256 @@
+# Step costs for the DP in mesher.py
+#
+# Each step of the DP adds one triangle.  A step into entry [r][c]
+# adds
+#
+#   from [r-1][c] (PREV_ROW):  triangle [ verts0[c], verts1[r-1], verts1[r] ]
+#   from [r][c-1] (PREV_COL):  triangle [ verts1[r], verts0[c-1], verts0[c] ]
+#
+# and the DP minimizes the sum of the costs of the triangles.  A cost
+# function is a class that is made for one slice pair,
+#
+#   cost = AreaCost( verts0, verts1 )
+#
+# and whose steps(r) returns two lists of costs for row r, indexed by
+# column: the cost of the step into each entry from the previous row,
+# and from the previous column.  (Costs of steps that don't exist, in
+# row 0 and column 0, are never used.)  Costs must not be negative.
+#
+# Both triangles of entry [r][c] have the edge from verts0[c] to
+# verts1[r] in common, and their other edges are the edges of the
+# neighbouring entries.  So every cost here is computed from the
+# "pair vectors" verts1[r] - verts0[c], which PairGeometry computes a
+# row at a time and keeps for the row after, rather than from the
+# vertices with a new list for every intermediate vector.  For
+# example, the PREV_ROW triangle has area 0.5 |p[r-1][c] x p[r][c]|,
+# which is exactly, bit for bit, what triangleArea() computes.
+#
+# 'costFunctions' maps names, as given to -cost, to the classes.  A
+# class may also have a 'stepMatrices' function to compute the costs
+# of all steps at once with NumPy, as npdp.stepAreas() does.  Without
+# one, the DP runs in pure Python for that cost.
+#
+# stepRange(r, lo, hi) returns the same costs as steps(r), but only for
+# columns lo..hi, so that a DP that looks at only part of each row (see
+# banddp.py) need not compute the rest.  The costs are computed with
+# the same operations, so they are exactly the same.
+
+
+import npdp
+from vectors import cross3, length3, crossProducts, lengths
+
+
+class PairGeometry:
+
+    def __init__( self, verts0, verts1 ):
+
+        self.verts0 = verts0
+        self.verts1 = verts1
+        self.n0 = len(verts0)
+        self.n1 = len(verts1)
+        self.rows = {}
+
+    # Pair vectors verts1[r] - verts0[c] of row r, as lists of their
+    # x, y and z components.  Rows r and r-1 are kept, since that's
+    # all that the DP needs as it goes down the rows.
+
+    def pairRow( self, r ):
+
+        row = self.rows.get( r )
+
+        if row is None:
+            x, y, z = self.verts1[r]
+            row = ( [ x - v[0] for v in self.verts0 ],
+                    [ y - v[1] for v in self.verts0 ],
+                    [ z - v[2] for v in self.verts0 ] )
+            prev = self.rows.get( r - 1 )
+            self.rows = { r: row } if prev is None else { r - 1: prev, r: row }
+
+        return row
+
+    # Pair vectors of columns lo..hi of row r, computed every time
+
+    def pairRange( self, r, lo, hi ):
+
+        x, y, z = self.verts1[r]
+        verts0 = self.verts0[lo:hi+1]
+
+        return ( [ x - v[0] for v in verts0 ],
+                 [ y - v[1] for v in verts0 ],
+                 [ z - v[2] for v in verts0 ] )
+
+
+# Cross products of the two triangles of each entry of row r (see
+# above), each with a leading 'None' where there is no triangle
+
+def rowCrosses( geom, r ):
+
+    px, py, pz = geom.pairRow( r )
+
+    if r == 0:
+        rowCross = None
+    else:
+        qx, qy, qz = geom.pairRow( r - 1 )
+        rowCross = crossProducts( qx, qy, qz, px, py, pz )
+
+    colCross = crossProducts( px, py, pz, px[1:], py[1:], pz[1:] )
+
+    return rowCross, colCross
+
+
+# The same for columns lo..hi of row r, without the leading 'None'.
+# Also returns the column of the first PREV_COL cross product, which
+# is lo, or 1 if lo is 0.
+
+def rangeCrosses( geom, r, lo, hi ):
+
+    first = max( lo - 1, 0 )
+    px, py, pz = geom.pairRange( r, first, hi )
+
+    if r == 0:
+        rowCross = None
+    else:
+        k = lo - first
+        qx, qy, qz = geom.pairRange( r - 1, lo, hi )
+        rowCross = crossProducts( qx, qy, qz, px[k:], py[k:], pz[k:] )
+
+    colCross = crossProducts( px, py, pz, px[1:], py[1:], pz[1:] )
+
+    return rowCross, colCross, first + 1
+
+
+# Triangle area: the original cost
+
+class AreaCost:
+
+    stepMatrices = staticmethod( npdp.stepAreas )
+
+    def __init__( self, verts0, verts1 ):
+
+        self.geom = PairGeometry( verts0, verts1 )
+
+    def steps( self, r ):
+
+        rowCross, colCross = rowCrosses( self.geom, r )
+
+        rowCosts = None if rowCross is None else [ 0.5 * l for l in lengths( *rowCross ) ]
+        colCosts = [ None ] + [ 0.5 * l for l in lengths( *colCross ) ]
+
+        return rowCosts, colCosts
+
+    def stepRange( self, r, lo, hi ):
+
+        rowCross, colCross, first = rangeCrosses( self.geom, r, lo, hi )
+
+        rowCosts = None if rowCross is None else [ 0.5 * l for l in lengths( *rowCross ) ]
+        colCosts = [ None ] * (first - lo) + [ 0.5 * l for l in lengths( *colCross ) ]
+
+        return rowCosts, colCosts
+
+
+# Length of the edge that the step adds between the slices.  Both
+# steps into an entry add the same edge, so this is the total length
+# of the edges between the slices, as short as possible.
+
+class LengthCost:
+
+    stepMatrices = None
+
+    def __init__( self, verts0, verts1 ):
+
+        self.geom = PairGeometry( verts0, verts1 )
+
+    def steps( self, r ):
+
+        costs = lengths( *self.geom.pairRow( r ) )
+
+        return costs, costs
+
+    def stepRange( self, r, lo, hi ):
+
+        costs = lengths( *self.geom.pairRange( r, lo, hi ) )
+
+        return costs, costs
+
+
+# Area weighted by how far the triangle's normal deviates from the
+# normal of a band perpendicular to the slices along the slice edge
+# it is on:
+#
+#   area * (1 + weight * (1 - |cos angle|))
+#
+# The band normal of a slice edge is the edge crossed with the
+# direction from the centre of slice 0 to the centre of slice 1.  This
+# keeps the band from twisting or folding flat between the slices.
+
+class NormalCost:
+
+    stepMatrices = None
+    weight = 1.0
+
+    def __init__( self, verts0, verts1 ):
+
+        self.geom = PairGeometry( verts0, verts1 )
+
+        n0 = len(verts0)
+        n1 = len(verts1)
+
+        # The centres are of the distinct vertices.  Each list ends with
+        # its first vertex again (see mesher.triangulatePair()), and
+        # counting it twice would make the axis, and so the costs,
+        # depend on which vertex the contour starts at.
+
+        axis = [ sum( v[i] for v in verts1[:-1] ) / (n1 - 1) - sum( v[i] for v in verts0[:-1] ) / (n0 - 1) for i in range(3) ]
+
+        self.bandNormals0 = [ None ] + [ self.bandNormal( verts0[c - 1], verts0[c], axis ) for c in range(1, n0) ]
+        self.bandNormals1 = [ None ] + [ self.bandNormal( verts1[r - 1], verts1[r], axis ) for r in range(1, n1) ]
+
+    def bandNormal( self, a, b, axis ):
+
+        x, y, z = cross3( b[0] - a[0], b[1] - a[1], b[2] - a[2], axis[0], axis[1], axis[2] )
+        d = length3( x, y, z )
+
+        return ( x/d, y/d, z/d ) if d > 0 else ( 0.0, 0.0, 0.0 )
+
+    # With the (unnormalized) cross product x of a triangle, its area is
+    # 0.5 |x| and the cosine is (x . n) / |x| for unit band normal n.
+
+    def deviations( self, cross, normals ):
+
+        xs, ys, zs = cross
+        w = self.weight
+        costs = []
+        for x, y, z, l, n in zip( xs, ys, zs, lengths( xs, ys, zs ), normals ):
+            costs.append( 0.5 * (l + w * (l - abs( x*n[0] + y*n[1] + z*n[2] ))) )
+        return costs
+
+    def steps( self, r ):
+
+        rowCross, colCross = rowCrosses( self.geom, r )
+
+        if rowCross is None:
+            rowCosts = None
+        else:
+            normal = self.bandNormals1[r]
+            rowCosts = self.deviations( rowCross, [ normal ] * self.geom.n0 )
+
+        colCosts = [ None ] + self.deviations( colCross, self.bandNormals0[1:] )
+
+        return rowCosts, colCosts
+
+    def stepRange( self, r, lo, hi ):
+
+        rowCross, colCross, first = rangeCrosses( self.geom, r, lo, hi )
+
+        if rowCross is None:
+            rowCosts = None
+        else:
+            normal = self.bandNormals1[r]
+            rowCosts = self.deviations( rowCross, [ normal ] * (hi - lo + 1) )
+
+        colCosts = [ None ] * (first - lo) + self.deviations( colCross, self.bandNormals0[first:hi+1] )
+
+        return rowCosts, colCosts
+
+
+costFunctions = { 'area': AreaCost, 'length': LengthCost, 'normal': NormalCost }
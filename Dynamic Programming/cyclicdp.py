@@ -0,0 +1,209 @@
+# Optimal starting edge for the min-area DP in mesher.py
+#
+# mesher.triangulatePair() normally starts the DP at the closest pair
+# of vertices, which need not give the minimum-area band.  Every
+# triangulation of the band has at least one edge from vertex 0 of the
+# top slice to some vertex j of the bottom slice, so the true minimum
+# is the best of the m1 DPs that start at (0, j), j = 0..m1-1.
+#
+# Doing all m1 DPs takes O(m0 m1^2) time.  optimalStart() uses the
+# divide-and-conquer method for cyclic DPs (Fuchs, Kedem and Uselton;
+# Maes): the min-area paths through the table for different start
+# rows j do not cross, so the path for j is confined between the paths
+# for any j' < j and j'' > j.  Solving for the middle start between two
+# known paths and recursing on both halves evaluates O(m0 m1) entries
+# per level of recursion, O(m0 m1 log m1) in total.
+#
+# A start is also rejected early if, partway through, every entry of a
+# row already costs at least as much as the best band found so far,
+# since areas are never negative.  A rejected start has no path to
+# bound its half-ranges with, though, so this is only done for starts
+# with no half-ranges left to solve: the last level of the recursion,
+# which holds about half of all starts.
+#
+# Table coordinates: row r runs over the bottom slice, repeated twice
+# (vertex r mod m1), and column c over the top slice (vertex c mod m0).
+# The DP for start j runs from [j][0] to [j+m1][m0].
+
+
+import npdp
+import costs
+
+
+inf = float('inf')
+
+
+# Costs of a step into [r][c], for r mod m1 and c = 0..m0:
+# 'rowArea' from [r-1][c] and 'colArea' from [r][c-1], using
+# 'costFunction' (see costs.py).  These are the costs of the DP for
+# the closed-up slices coords0 + coords0[:1] and coords1 + coords1[:1],
+# with rows and columns wrapped around.
+
+def stepAreas( coords0, coords1, costFunction=costs.AreaCost, useNumPy=True ):
+
+    m0 = len(coords0)
+    m1 = len(coords1)
+    verts0 = coords0 + coords0[:1]
+    verts1 = coords1 + coords1[:1]
+
+    if useNumPy and npdp.numpy is not None and costFunction.stepMatrices is not None:
+        rowArea, colArea = costFunction.stepMatrices( verts0, verts1 )
+        rowArea = rowArea[[ (r - 1) % m1 + 1 for r in range(m1) ]][:, :m0]
+        colArea = colArea[:m1][:, [ (c - 1) % m0 + 1 for c in range(m0) ]]
+        rowArea = rowArea.tolist()
+        colArea = colArea.tolist()
+    else:
+        cost = costFunction( verts0, verts1 )
+        steps = [ cost.steps( r ) for r in range(m1 + 1) ]
+        rowArea = [ steps[(r - 1) % m1 + 1][0][:m0] for r in range(m1) ]
+        colArea = [ steps[r][1][m0:] + steps[r][1][1:m0] for r in range(m1) ]
+
+    # Repeat column 0 at the end (see boundedDP())
+
+    return [ a + a[:1] for a in rowArea ], [ a + a[:1] for a in colArea ]
+
+
+# A path is stored as a dict from row to the (first, last) columns it
+# visits in that row.
+
+def shiftPath( path, dr ):
+
+    return { r + dr: cols for r, cols in path.items() }
+
+
+# Min-area DP for start row j, restricted to columns cmin[k]..cmax[k]
+# of row j+k.  The bounds never decrease from one row to the next.
+# Returns (cost, path), or (inf, None) if the start is rejected
+# because it can't beat 'best'.
+#
+# 'rowArea' and 'colArea' rows have m0+1 entries here, the last
+# repeating the first, so that columns need no "mod m0".
+
+def boundedDP( rowArea, colArea, m0, m1, j, cmin, cmax, best ):
+
+    fromRows = []  # per row, a list of booleans: True for PREV_ROW
+
+    # Row 0 starts at [j][0] and can only step along the row
+
+    hi = cmax[0]
+    ca = colArea[j % m1]
+    row = [ 0.0 ] * (hi + 1)
+    for c in range(1, hi + 1):
+        row[c] = row[c - 1] + ca[c]
+    fromRows.append( [ False ] * (hi + 1) )
+    prev, prevLo, prevHi = row, 0, hi
+
+    for k in range(1, m1 + 1):
+
+        lo = cmin[k]
+        hi = cmax[k]
+        ra = rowArea[(j + k) % m1]
+        ca = colArea[(j + k) % m1]
+
+        row = [ inf ] * (hi - lo + 1)
+        fromRow = [ False ] * (hi - lo + 1)
+
+        # Columns lo..min(hi,prevHi) can step from the previous row
+        # (lo >= prevLo, since the bounds never decrease).  The first
+        # of them can't step from the previous column.
+
+        last = min( hi, prevHi )
+        left = inf
+        for c in range(lo, last + 1):
+            area_from_row = prev[c - prevLo] + ra[c]
+            area_from_col = left + ca[c]
+            if area_from_row < area_from_col:
+                left = area_from_row
+                fromRow[c - lo] = True
+            else:
+                left = area_from_col
+            row[c - lo] = left
+
+        # The rest can only step from the previous column
+
+        for c in range(max( last + 1, lo ), hi + 1):
+            left = left + ca[c]
+            row[c - lo] = left
+
+        if min(row) >= best:
+            return inf, None
+
+        fromRows.append( fromRow )
+        prev, prevLo, prevHi = row, lo, hi
+
+    cost = prev[m0 - prevLo]
+
+    # Walk back to record the path
+
+    path = {}
+    k, c = m1, m0
+    last = c
+    while k > 0 or c > 0:
+        if fromRows[k][c - cmin[k]]:
+            path[j + k] = (c, last)
+            k -= 1
+            last = c
+        else:
+            c -= 1
+    path[j + k] = (c, last)
+
+    return cost, path
+
+
+# Column bounds for start row j between the paths for lower and
+# higher start rows
+
+def bounds( m0, m1, j, pathLo, pathHi ):
+
+    cmin = []
+    cmax = []
+    for k in range(m1 + 1):
+        r = j + k
+        hi = pathLo[r][1] if r in pathLo else m0
+        lo = pathHi[r][0] if r in pathHi else 0
+        cmin.append( min( lo, hi ) )
+        cmax.append( hi )
+    cmin[0] = 0
+    cmax[m1] = m0
+    return cmin, cmax
+
+
+# Returns (i0, i1, cost): the start vertices on the top and bottom
+# slices of the minimum-area band, and its area (or other cost, from
+# 'costFunction').
+
+def optimalStart( coords0, coords1, costFunction=costs.AreaCost, useNumPy=True ):
+
+    m0 = len(coords0)
+    m1 = len(coords1)
+
+    rowArea, colArea = stepAreas( coords0, coords1, costFunction, useNumPy )
+
+    cost0, path0 = boundedDP( rowArea, colArea, m0, m1, 0, [0] * (m1 + 1), [m0] * (m1 + 1), inf )
+
+    best = [ cost0, 0 ]
+
+    def solve( jl, pathLo, jh, pathHi ):
+
+        if jh - jl <= 1:
+            return
+
+        mid = (jl + jh) // 2
+        cmin, cmax = bounds( m0, m1, mid, pathLo, pathHi )
+
+        if jh - jl == 2:
+            cost, path = boundedDP( rowArea, colArea, m0, m1, mid, cmin, cmax, best[0] )
+        else:
+            cost, path = boundedDP( rowArea, colArea, m0, m1, mid, cmin, cmax, inf )
+
+        if cost < best[0]:
+            best[0] = cost
+            best[1] = mid
+
+        if path is not None:
+            solve( jl, pathLo, mid, path )
+            solve( mid, path, jh, pathHi )
+
+    solve( 0, path0, m1, shiftPath( path0, m1 ) )
+
+    return 0, best[1], best[0]
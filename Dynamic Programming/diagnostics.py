@@ -0,0 +1,93 @@
+# Diagnostic output for the slice mesher
+#
+# 'verbosity' controls what is written to stdout:
+#
+#   0  nothing
+#   1  progress messages (the default)
+#   2  also the minArea/minDir table of every slice pair
+#
+# Independently, if 'tableFile' is an open file, the table of every
+# slice pair is written to it in a compact form:
+#
+#   pair s3-s4 5x5
+#   0. 120- 579- 1055- 1175-
+#   120| 210- 300- 766- 1233-
+#   ...
+#
+# one line per row, each entry being the integer minArea followed by
+# '-' (PREV_COL), '|' (PREV_ROW) or '.' (the starting entry).
+#
+# Nothing is formatted unless it will be written, and each table is
+# built as one string and written in one call, so that the DP itself
+# never does any I/O.
+
+
+import sys
+
+
+verbosity = 1
+tableFile = None
+
+
+def message( level, text ):
+
+    if verbosity >= level:
+        sys.stdout.write( text + '\n' )
+
+
+def wantTables():
+
+    return verbosity >= 2 or tableFile is not None
+
+
+# Open a file for compact tables (appending, so that several runs
+# can be collected)
+
+def openTableFile( filename ):
+
+    global tableFile
+
+    closeTableFile()
+    tableFile = open( filename, 'a' )
+
+
+def closeTableFile():
+
+    global tableFile
+
+    if tableFile is not None:
+        tableFile.close()
+        tableFile = None
+
+
+def dirChar( d, prevRow, prevCol ):
+
+    if d == prevCol:
+        return '-'
+    elif d == prevRow:
+        return '|'
+    else:
+        return '.'
+
+
+# Write the tables for one slice pair wherever they are wanted.
+# 'label' identifies the pair.
+
+def dumpTables( label, minArea, minDir, prevRow, prevCol ):
+
+    n1 = len(minArea)
+    n0 = len(minArea[0])
+
+    if verbosity >= 2:
+        lines = [ '', '     ' + ''.join( '%7d' % c for c in range(n0) ) ]
+        for r in range(n1):
+            lines.append( '%5d' % r + ''.join( '%4d%-3s' % ( int(minArea[r][c]), '-' if minDir[r][c] == prevCol else '|' )
+                                               for c in range(n0) ) )
+        sys.stdout.write( '\n'.join( lines ) + '\n' )
+
+    if tableFile is not None:
+        lines = [ 'pair %s %dx%d' % ( label, n1, n0 ) ]
+        for r in range(n1):
+            lines.append( ' '.join( '%d%s' % ( int(minArea[r][c]), dirChar( minDir[r][c], prevRow, prevCol ) )
+                                    for c in range(n0) ) )
+        tableFile.write( '\n'.join( lines ) + '\n' )
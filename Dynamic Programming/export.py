@@ -0,0 +1,314 @@
+# Mesh export
+#
+# A mesh is given as a list of [x,y,z] vertex coordinates and a list of
+# (i,j,k) triangles of indices into it, counterclockwise as seen from
+# outside, as mesher.triangulateAll() returns them.  Each vertex is
+# written once and shared by all of its triangles.  Triangles with a
+# repeated vertex, which have no area, are left out (see
+# properTriangles()).
+#
+#   writeMesh( filename, coords, triangles )
+#
+# picks the format from the filename's extension, and returns the
+# number of triangles written:
+#
+#   .obj   Wavefront OBJ (text)
+#   .ply   binary little-endian PLY, with float vertices and int indices
+#   .stl   binary STL, which has no shared vertices, so each triangle
+#          gets its own three, and its unit normal
+#
+# The binary formats are written with array and struct in large chunks
+# rather than a value at a time.
+#
+# A mesh too big to hold can be written a slice at a time instead:
+#
+#   with openStream( filename ) as stream:
+#       stream.addVertices( coords )      # the next vertices, numbered on from those before
+#       stream.addTriangles( triangles )  # triangles of the vertices added so far
+#       ...
+#
+# Only the vertices of the last two addVertices() calls are kept, so
+# triangles may only use those, as between a pair of slices.  OBJ
+# vertices and faces are written as they come, interleaved.  PLY needs
+# all vertices before the faces, so the faces go to a temporary file
+# until the end.  The STL triangle count is filled in at the end.
+#
+# If the 'with' block raises, the stream isn't finished, and the file
+# is removed rather than left looking like a whole mesh.
+
+
+import sys, os, array, struct, shutil, tempfile
+
+from vectors import triangleNormals
+
+
+chunkSize = 4096  # triangles per struct.pack() call
+
+
+# The format of 'filename' ('.obj', '.ply' or '.stl'), or None
+
+def meshFormat( filename ):
+
+    ext = os.path.splitext( filename )[1].lower()
+
+    return ext if ext in formats else None
+
+
+# The triangles of 'triangles' without a repeated vertex, which are
+# those written.  This leaves out the one that closes each band between
+# slices.
+
+def properTriangles( triangles ):
+
+    return [ t for t in triangles if t[0] != t[1] and t[1] != t[2] and t[2] != t[0] ]
+
+
+def writeMesh( filename, coords, triangles ):
+
+    ext = meshFormat( filename )
+
+    if ext is None:
+        raise ValueError( 'unknown mesh format for "%s" (use %s)' % (filename, ', '.join( sorted( formats ) )) )
+
+    mode, writer = formats[ext]
+
+    triangles = properTriangles( triangles )
+
+    with open( filename, mode ) as f:
+        writer( f, coords, triangles )
+
+    return len(triangles)
+
+
+# Coordinates as little-endian 32-bit floats
+
+def floatBytes( values ):
+
+    a = array.array( 'f', values )
+    if sys.byteorder == 'big':
+        a.byteswap()
+    return a.tobytes()
+
+
+# Pack the records made by 'record(t)' for each triangle t, 'chunkSize'
+# triangles at a time.  'fmt' is the struct format of one record.
+
+def packRecords( f, triangles, fmt, record ):
+
+    packChunk = struct.Struct( '<' + fmt * chunkSize ).pack
+
+    for start in range(0, len(triangles), chunkSize):
+        chunk = triangles[start:start+chunkSize]
+        values = []
+        for t in chunk:
+            values.extend( record( t ) )
+        if len(chunk) == chunkSize:
+            f.write( packChunk( *values ) )
+        else:
+            f.write( struct.pack( '<' + fmt * len(chunk), *values ) )
+
+
+def writeOBJ( f, coords, triangles ):
+
+    lines = [ 'v %r %r %r' % (v[0], v[1], v[2]) for v in coords ]
+    lines.extend( 'f %d %d %d' % (i+1, j+1, k+1) for i, j, k in triangles )
+
+    f.write( '\n'.join( lines ) + '\n' )
+
+
+def plyHeader( numVertices, numFaces ):
+
+    header = [ 'ply',
+               'format binary_little_endian 1.0',
+               'element vertex %d' % numVertices,
+               'property float x',
+               'property float y',
+               'property float z',
+               'element face %d' % numFaces,
+               'property list uchar int vertex_indices',
+               'end_header' ]
+
+    return ('\n'.join( header ) + '\n').encode( 'ascii' )
+
+
+def writePLY( f, coords, triangles ):
+
+    f.write( plyHeader( len(coords), len(triangles) ) )
+    f.write( floatBytes( [ x for v in coords for x in v[:3] ] ) )
+
+    packRecords( f, triangles, 'B3i', lambda t: (3, t[0], t[1], t[2]) )
+
+
+def writeSTL( f, coords, triangles ):
+
+    f.write( b'binary STL'.ljust( 80, b' ' ) )
+    f.write( struct.pack( '<I', len(triangles) ) )
+
+    packSTL( f, [ v[0] for v in coords ], [ v[1] for v in coords ], [ v[2] for v in coords ], triangles )
+
+
+# STL records of 'triangles', indices into the coordinate lists 'xs',
+# 'ys' and 'zs'
+
+def packSTL( f, xs, ys, zs, triangles ):
+
+    normals = triangleNormals( xs, ys, zs, triangles )
+
+    def record( tn ):
+        (i, j, k), n = tn
+        return ( n[0], n[1], n[2],
+                 xs[i], ys[i], zs[i],
+                 xs[j], ys[j], zs[j],
+                 xs[k], ys[k], zs[k], 0 )
+
+    packRecords( f, list( zip( triangles, normals ) ), '12fH', record )
+
+
+# Streaming writers (see the top)
+
+class MeshStream:
+
+    def __init__( self, f ):
+
+        self.f = f
+        self.numVertices  = 0
+        self.numTriangles = 0
+        self.last   = []  # coordinates of the last addVertices() call
+        self.window = []  # ... and of the call before
+        self.windowStart = 0  # index of the first vertex in 'window'
+
+    def __enter__( self ):
+
+        return self
+
+    def __exit__( self, excType, excValue, traceback ):
+
+        if excType is None:
+            self.close()
+        else:
+            self.abort()
+
+    def addVertices( self, coords ):
+
+        coords = list( coords )
+        self.window = self.last + coords
+        self.windowStart = self.numVertices - len(self.last)
+        self.last = coords
+
+        self.writeVertices( coords )
+        self.numVertices += len(coords)
+
+    def addTriangles( self, triangles ):
+
+        triangles = properTriangles( triangles )
+
+        self.writeTriangles( triangles )
+        self.numTriangles += len(triangles)
+
+    def close( self ):
+
+        self.finish()
+        self.f.close()
+
+    def finish( self ):
+
+        pass
+
+    # Close and remove the file without finishing it
+
+    def abort( self ):
+
+        self.discard()
+        self.f.close()
+        try:
+            os.remove( self.f.name )
+        except OSError:
+            pass
+
+    def discard( self ):
+
+        pass
+
+
+class OBJStream( MeshStream ):
+
+    def writeVertices( self, coords ):
+
+        self.f.write( ''.join( 'v %r %r %r\n' % (v[0], v[1], v[2]) for v in coords ) )
+
+    def writeTriangles( self, triangles ):
+
+        self.f.write( ''.join( 'f %d %d %d\n' % (i+1, j+1, k+1) for i, j, k in triangles ) )
+
+
+class PLYStream( MeshStream ):
+
+    def __init__( self, f ):
+
+        MeshStream.__init__( self, f )
+        self.vertexFile = tempfile.TemporaryFile()
+        self.faceFile = tempfile.TemporaryFile()
+
+    def writeVertices( self, coords ):
+
+        self.vertexFile.write( floatBytes( [ x for v in coords for x in v[:3] ] ) )
+
+    def writeTriangles( self, triangles ):
+
+        packRecords( self.faceFile, triangles, 'B3i', lambda t: (3, t[0], t[1], t[2]) )
+
+    def finish( self ):
+
+        self.f.write( plyHeader( self.numVertices, self.numTriangles ) )
+        for temp in (self.vertexFile, self.faceFile):
+            temp.seek( 0 )
+            shutil.copyfileobj( temp, self.f )
+            temp.close()
+
+    def discard( self ):
+
+        self.vertexFile.close()
+        self.faceFile.close()
+
+
+class STLStream( MeshStream ):
+
+    def __init__( self, f ):
+
+        MeshStream.__init__( self, f )
+        f.write( b'binary STL'.ljust( 80, b' ' ) )
+        f.write( struct.pack( '<I', 0 ) )  # triangle count, filled in by finish()
+
+    def writeVertices( self, coords ):
+
+        pass
+
+    def writeTriangles( self, triangles ):
+
+        w = self.windowStart
+        packSTL( self.f, [ v[0] for v in self.window ], [ v[1] for v in self.window ], [ v[2] for v in self.window ],
+                 [ (i - w, j - w, k - w) for i, j, k in triangles ] )
+
+    def finish( self ):
+
+        self.f.seek( 80 )
+        self.f.write( struct.pack( '<I', self.numTriangles ) )
+
+
+def openStream( filename ):
+
+    ext = meshFormat( filename )
+
+    if ext is None:
+        raise ValueError( 'unknown mesh format for "%s" (use %s)' % (filename, ', '.join( sorted( formats ) )) )
+
+    mode, writer = formats[ext]
+
+    return streams[ext]( open( filename, mode ) )
+
+
+formats = { '.obj': ( 'w',  writeOBJ ),  # extension -> (file mode, writer)
+            '.ply': ( 'wb', writePLY ),
+            '.stl': ( 'wb', writeSTL ) }
+
+streams = { '.obj': OBJStream, '.ply': PLYStream, '.stl': STLStream }
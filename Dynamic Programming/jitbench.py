@@ -0,0 +1,130 @@
+# Benchmark of the engines for the min-area DP in mesher.py
+#
+# Usage: python jitbench.py [-n count] [-repeat n] [-skip engines] [file of slices]
+#
+#   -n        number of vertices of each synthetic contour (default 5000)
+#   -repeat   number of timed runs on the slice file; the fastest is kept (default 3)
+#   -skip     engines, separated by commas, not to run on the synthetic contours.
+#             The full tables of the python and numpy engines for two
+#             5000-vertex contours take a few GB.
+#
+# Times mesher.triangulatePair() with the 'area' cost, as each engine
+# finds the path:
+#
+#   python   the pure-Python loops of mesher.fillTables()
+#   numpy    npdp.fillTables(), if NumPy is installed
+#   jit      jitdp.areaPath() compiled by numba, if it is installed.
+#            It is compiled (or loaded from numba's cache) before it is
+#            timed, and the time that took is reported separately.
+#
+# on every slice pair of the file (default femurSlices.dat) and on two
+# synthetic contours of 'count' vertices each.  Speedups are over the
+# first engine run (python, unless it is skipped), and every engine is
+# checked to give exactly the same triangles as that one.
+
+
+import sys, os, time, math, random
+
+import mesher
+import jitdp
+
+
+def useEngine( engine ):
+
+    mesher.useNumPy = engine == 'numpy'
+    mesher.useJIT = engine == 'jit'
+
+
+def meshPairs( pairs ):
+
+    return [ mesher.triangulatePair( coords0, coords1 ) for coords0, coords1 in pairs ]
+
+
+def best( f, repeat, *args ):
+
+    fastest = None
+    for i in range(repeat):
+        start = time.perf_counter()
+        result = f( *args )
+        elapsed = time.perf_counter() - start
+        if fastest is None or elapsed < fastest:
+            fastest = elapsed
+    return fastest, result
+
+
+# A closed wavy contour of 'count' vertices around the y axis at height
+# 'y', clockwise as seen looking up the y axis (see
+# mesher.triangulatePair())
+
+def syntheticContour( count, y, phase ):
+
+    contour = []
+    for k in range(count):
+        t = -2 * math.pi * k / count
+        r = 40 + 6 * math.sin( 5*t + phase ) + 2 * math.sin( 17*t - phase ) + random.uniform( -0.2, 0.2 )
+        contour.append( [ r * math.cos(t), y, 0.6 * r * math.sin(t) ] )
+    return contour
+
+
+def main():
+
+    count = 5000
+    repeat = 3
+    skip = []
+
+    args = sys.argv[1:]
+    while len(args) > 1:
+        if args[0] == '-n':
+            count = int(args[1])
+        elif args[0] == '-repeat':
+            repeat = int(args[1])
+        elif args[0] == '-skip':
+            skip = args[1].split( ',' )
+        else:
+            break
+        args = args[2:]
+
+    if len(args) > 1 or (args and args[0].startswith( '-' )):
+        print( 'Usage: %s [-n count] [-repeat n] [-skip engines] [file of slices]' % sys.argv[0] )
+        sys.exit(1)
+
+    filename = args[0] if args else os.path.join( os.path.dirname( os.path.abspath( __file__ ) ), 'femurSlices.dat' )
+
+    engines = [ 'python' ]
+    if jitdp.numpy is not None:
+        engines.append( 'numpy' )
+    if jitdp.haveNumba:
+        engines.append( 'jit' )
+        start = time.perf_counter()
+        jitdp.minAreaPath( [ [0,0,0], [1,0,0], [0,0,1] ], [ [0,1,0], [1,1,0] ] )
+        print( 'jit kernel compiled or loaded in %.3f seconds' % (time.perf_counter() - start) )
+    else:
+        print( 'numba is not installed, so there is no jit engine' )
+
+    with open( filename, 'rb' ) as f:
+        slices = mesher.readSliceContours( f )
+    slices.reverse()
+    filePairs = [ (slices[i][0], slices[i+1][0]) for i in range(len(slices) - 1) if len(slices[i]) == 1 and len(slices[i+1]) == 1 ]
+
+    random.seed( 0 )
+    synthetic = [ (syntheticContour( count, 1.0, 0.0 ), syntheticContour( count, 0.0, 0.3 )) ]
+
+    print( '%-26s %-8s %10s %8s  %s' % ('slices', 'engine', 'seconds', 'speedup', 'same') )
+
+    for name, pairs, runs, skipped in ( ('%s (%d pairs)' % (os.path.basename( filename ), len(filePairs)), filePairs, repeat, []),
+                                        ('%d x %d synthetic' % (count, count), synthetic, 1, skip) ):
+        reference = None
+        for engine in engines:
+            if engine in skipped:
+                continue
+            useEngine( engine )
+            elapsed, result = best( meshPairs, runs, pairs )
+            if reference is None:
+                reference = ( elapsed, result )
+            baseTime, baseResult = reference
+            print( '%-26s %-8s %10.4f %7.2fx  %s' % (name, engine, elapsed, baseTime / elapsed, result == baseResult) )
+
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,139 @@
+# Compiled kernel for the min-area DP in mesher.py
+#
+# numba is optional.  If it is installed, areaPath() below is compiled
+# to machine code the first time it is called, and
+# mesher.triangulatePair() uses it for the 'area' cost rather than
+# filling the DP tables with NumPy or with Python loops.  If it is not
+# installed, 'haveNumba' is False here and mesher.py uses that code as
+# before.  numba takes a few tenths of a second to import, so it is
+# only looked for here, and imported when the kernel is first used.
+#
+# Each entry of the table depends on the one to its left, so the DP is
+# sequential along the rows, and NumPy can only work along the
+# anti-diagonals (see npdp.py), through big skewed tables.  Compiled,
+# the plain loop over the rows is fast as it is, and needs no tables of
+# Python objects:
+#
+#   - The vertices come in as flat arrays of doubles, x, y, z for each
+#     vertex in turn.
+#
+#   - The area of each step's triangle is computed where it is needed,
+#     with the same floating-point operations, in the same order, as
+#     npdp.triangleAreas(), so there are no tables of step areas.
+#
+#   - Only the previous and current rows of 'minArea' are kept, and
+#     'minDir' is one byte per entry: 1 for PREV_ROW, 0 for PREV_COL.
+#
+# The additions and comparisons are those of mesher.fillTables(), and
+# the path is walked back as mesher.backtrack() does it, so the path,
+# including how ties are broken, is exactly the same.
+
+
+import importlib.util
+
+from npdp import numpy  # None if NumPy is not installed, and then numba can't be used
+
+haveNumba = numpy is not None and importlib.util.find_spec( 'numba' ) is not None
+
+
+# The min-area path between the vertices 'flat0' (top slice, columns)
+# and 'flat1' (bottom slice, rows), as an array of n0+n1-2 bytes from
+# the last entry [n1-1][n0-1] back to [0][0]: 1 for a step from the
+# previous row, 0 for a step from the previous column.
+#
+# This is the function that numba compiles, so it uses only loops,
+# floats and NumPy arrays.  It also runs, very slowly, as Python.
+
+def areaPath( flat0, flat1 ):
+
+    n0 = len(flat0) // 3
+    n1 = len(flat1) // 3
+
+    fromRow = numpy.zeros( n0 * n1, numpy.uint8 )
+    prev = numpy.zeros( n0 )
+    row = numpy.zeros( n0 )
+
+    qx = qy = qz = 0.0  # vertex r-1 of the bottom slice
+    areaFromRow = areaFromCol = 0.0
+
+    for r in range(n1):
+
+        rx = flat1[3*r]; ry = flat1[3*r+1]; rz = flat1[3*r+2]
+
+        if r > 0:
+            qx = flat1[3*r-3]; qy = flat1[3*r-2]; qz = flat1[3*r-1]
+
+        for c in range(n0):
+
+            cx = flat0[3*c]; cy = flat0[3*c+1]; cz = flat0[3*c+2]
+
+            # Step from [r-1][c]: triangle [ verts0[c], verts1[r-1], verts1[r] ]
+
+            if r > 0:
+                ux = qx - cx; uy = qy - cy; uz = qz - cz
+                vx = rx - cx; vy = ry - cy; vz = rz - cz
+                x = uy * vz - uz * vy
+                y = uz * vx - ux * vz
+                z = ux * vy - uy * vx
+                areaFromRow = prev[c] + 0.5 * numpy.sqrt( x * x + y * y + z * z )
+
+            # Step from [r][c-1]: triangle [ verts1[r], verts0[c-1], verts0[c] ]
+
+            if c > 0:
+                px = flat0[3*c-3]; py = flat0[3*c-2]; pz = flat0[3*c-1]
+                ux = px - rx; uy = py - ry; uz = pz - rz
+                vx = cx - rx; vy = cy - ry; vz = cz - rz
+                x = uy * vz - uz * vy
+                y = uz * vx - ux * vz
+                z = ux * vy - uy * vx
+                areaFromCol = row[c - 1] + 0.5 * numpy.sqrt( x * x + y * y + z * z )
+
+            if r == 0:
+                row[c] = areaFromCol if c > 0 else 0.0
+            elif c == 0 or areaFromRow < areaFromCol:
+                row[c] = areaFromRow
+                fromRow[r * n0 + c] = 1
+            else:
+                row[c] = areaFromCol
+
+        prev, row = row, prev
+
+    path = numpy.zeros( n0 + n1 - 2, numpy.uint8 )
+    k = 0
+    r = n1 - 1
+    c = n0 - 1
+    while r > 0 or c > 0:
+        if fromRow[r * n0 + c] == 1:
+            path[k] = 1
+            r -= 1
+        else:
+            c -= 1
+        k += 1
+
+    return path
+
+
+compiledAreaPath = None  # areaPath() compiled, once it is first used
+
+
+def compileAreaPath():
+
+    global compiledAreaPath
+
+    if compiledAreaPath is None:
+        import numba
+        compiledAreaPath = numba.njit( cache=True )( areaPath )
+
+    return compiledAreaPath
+
+
+# The min-area path between the vertices 'verts0' and 'verts1' (lists
+# of [x,y,z], as mesher.fillTables() takes them), as a list of
+# booleans, as mesher.backtrack() returns it.  Needs numba.
+
+def minAreaPath( verts0, verts1 ):
+
+    flat0 = numpy.array( verts0, dtype=numpy.float64 ).reshape( -1 )
+    flat1 = numpy.array( verts1, dtype=numpy.float64 ).reshape( -1 )
+
+    return compileAreaPath()( flat0, flat1 ).astype( bool ).tolist()
@@ -0,0 +1,150 @@
+# Memory-efficient versions of the min-area DP in mesher.py
+#
+# The full 'minArea' and 'minDir' tables of a slice pair take
+# (n1 x n0) Python objects each, which is hundreds of MB for contours
+# with thousands of vertices.  The DP only ever needs the previous row
+# of 'minArea', though, so both functions here keep just one or two
+# rows of it:
+#
+#   packedPath()   keeps 'minDir' as one bit per entry (1 for
+#                  PREV_ROW) in a bytearray: n0*n1/8 bytes.
+#
+#   linearPath()   keeps no 'minDir' table at all.  The path is
+#                  recovered by divide and conquer over the rows, as in
+#                  Hirschberg's algorithm: to find the path through
+#                  rows a..b, the rows down to the middle row are
+#                  recomputed from row a, the path through the lower
+#                  half is found first (giving the column where it
+#                  enters the middle row), and then the upper half.
+#                  Only one saved row per level of recursion is live
+#                  at a time, so memory is O(n0 log n1) floats, and
+#                  the time is O(n0 n1 log n1).
+#
+# Unlike textbook Hirschberg, which meets a forward and a backward
+# pass in the middle, every row here is computed forward from the row
+# above it with exactly the arithmetic of mesher.fillTables().  So the
+# path, including how ties are broken, is exactly the one found from
+# the full tables.
+#
+# Both functions take a cost function made for the slice pair (see
+# costs.py), and return the path as a list of booleans from the last
+# entry [n1-1][n0-1] back to [0][0]: True for a step from the previous
+# row, False for a step from the previous column.
+
+
+# Compute row 'r' of 'minArea' from row r-1 ('prev'), with the step
+# costs of 'cost' (see costs.py).  If 'bits' is given, set bit
+# 'offset'+c of it for each entry c that comes from the previous row.
+
+def fillRow( cost, r, prev, bits=None, offset=0 ):
+
+    rowCosts, colCosts = cost.steps( r )
+
+    n0 = len(colCosts)
+    row = [ 0.0 ] * n0
+
+    if r == 0:
+        for c in range(1, n0):
+            row[c] = row[c - 1] + colCosts[c]
+        return row
+
+    row[0] = prev[0] + rowCosts[0]
+    if bits is not None:
+        bits[offset >> 3] |= 1 << (offset & 7)
+
+    for c in range(1, n0):
+        area_from_row = prev[c] + rowCosts[c]
+        area_from_col = row[c - 1] + colCosts[c]
+        if area_from_row < area_from_col:
+            row[c] = area_from_row
+            if bits is not None:
+                k = offset + c
+                bits[k >> 3] |= 1 << (k & 7)
+        else:
+            row[c] = area_from_col
+
+    return row
+
+
+def testBit( bits, k ):
+
+    return (bits[k >> 3] >> (k & 7)) & 1
+
+
+def packedPath( cost ):
+
+    n0 = cost.geom.n0
+    n1 = cost.geom.n1
+
+    bits = bytearray( (n0 * n1 + 7) // 8 )
+    row = None
+    for r in range(n1):
+        row = fillRow( cost, r, row, bits, r * n0 )
+
+    path = []
+    r, c = n1 - 1, n0 - 1
+    while r > 0 or c > 0:
+        if testBit( bits, r * n0 + c ):
+            path.append( True )
+            r -= 1
+        else:
+            path.append( False )
+            c -= 1
+
+    return path
+
+
+# 'blockCells' is the size of the bit table below which a range of
+# rows is solved directly rather than split further.
+
+def linearPath( cost, blockCells=1 << 16 ):
+
+    n0 = cost.geom.n0
+    n1 = cost.geom.n1
+    blockRows = max( 1, blockCells // n0 )
+
+    path = []
+    c = walkBack( cost, 0, fillRow( cost, 0, None ), n1 - 1, n0 - 1, path, blockRows )
+    path.extend( [ False ] * c )  # along row 0 to [0][0]
+
+    return path
+
+
+# Append to 'path' the steps from entry [b][cb] back to the first entry
+# reached in row 'a', given row 'a' of 'minArea' as 'rowA'.  Returns
+# the column of that entry.
+
+def walkBack( cost, a, rowA, b, cb, path, blockRows ):
+
+    if b == a:
+        return cb
+
+    n0 = cost.geom.n0
+
+    if b - a <= blockRows:
+
+        bits = bytearray( ((b - a) * n0 + 7) // 8 )
+        row = rowA
+        for r in range(a + 1, b + 1):
+            row = fillRow( cost, r, row, bits, (r - a - 1) * n0 )
+
+        r, c = b, cb
+        while r > a:
+            if testBit( bits, (r - a - 1) * n0 + c ):
+                path.append( True )
+                r -= 1
+            else:
+                path.append( False )
+                c -= 1
+        return c
+
+    mid = (a + b) // 2
+
+    row = rowA
+    for r in range(a + 1, mid + 1):
+        row = fillRow( cost, r, row )
+
+    c = walkBack( cost, mid, row, b, cb, path, blockRows )
+    row = None
+
+    return walkBack( cost, a, rowA, mid, c, path, blockRows )
@@ -0,0 +1,255 @@
+# Level-of-detail mesh pyramid
+#
+# Usage: python lod.py [-levels n] [-p processes] <file of slices> <lod file>
+#
+#   -levels   number of levels (default 4)
+#   -p        number of processes to mesh each level with (default: one per CPU)
+#
+# Level k of the pyramid is meshed from every (2^k)th slice, top and
+# bottom slices included, with every (2^k)th vertex of each contour (at
+# least three), so each level has about 1/4 of the triangles of the one
+# before.  Each level is meshed with the DP of mesher.triangulateAll(),
+# just as slices.py meshes all slices.
+#
+# The levels are written together to one binary file, so that a viewer
+# can read just the levels it needs, coarsest first:
+#
+#   'SLOD', version, number of levels                 (4s I I)
+#   for each level:
+#     step, detail, offset, numSlices, numContours,
+#     numVertices, numTriangles                       (I d Q I I I I)
+#   then, at each level's offset, its SliceStack arrays (see stack.py)
+#   and its triangles:
+#     sliceStarts    numSlices+1 ints
+#     contourStarts  numContours+1 ints
+#     coords         3*numVertices doubles
+#     triangles      3*numTriangles ints
+#
+# all little-endian.  'detail' is the size of a typical triangle of the
+# level: the larger of the mean edge length of its contours and the
+# mean distance between its adjacent slices.  levelFor() picks the
+# coarsest level whose triangles are at most 'maxPixels' across on the
+# screen.
+#
+# slices.py shows a pyramid when it is given a .lod file (see there).
+
+
+import sys, math, array, struct
+
+import mesher
+from stack import SliceStack
+
+
+magic = b'SLOD'
+version = 1
+headerFormat = struct.Struct( '<4sII' )
+levelFormat = struct.Struct( '<IdQIIII' )
+
+
+class Level(object):
+
+    def __init__( self, step, detail, stack, triangles ):
+
+        self.step = step            # every 'step'th slice and vertex
+        self.detail = detail        # typical triangle size (see the top)
+        self.stack = stack          # SliceStack of the subsampled slices
+        self.triangles = triangles  # index triples into 'stack'
+
+    def __repr__( self ):
+
+        return 'Level(step %d, detail %.3g, %d triangles)' % (self.step, self.detail, len(self.triangles))
+
+
+# Every 'step'th slice of 'stack', always including the last, with
+# every 'step'th vertex of each contour, or fewer if that would leave
+# fewer than 3
+
+def subsample( stack, step ):
+
+    numSlices = len(stack)
+    keep = list( range( 0, numSlices, step ) )
+    if keep[-1] != numSlices - 1:
+        keep.append( numSlices - 1 )
+
+    sub = SliceStack()
+    for s in keep:
+        contours = []
+        for contour in stack.contours( s ):
+            k = max( 1, min( step, len(contour) // 3 ) )
+            contours.append( contour[::k] )
+        sub.append( contours )
+
+    return sub
+
+
+# Typical triangle size of the mesh of 'stack' (see the top)
+
+def meshDetail( stack ):
+
+    edges = 0.0
+    numEdges = 0
+    centres = []
+
+    for s in range(len(stack)):
+        sx = sy = sz = 0.0
+        first, last = stack.vertexRange( s )
+        for i in range(first, last):
+            a = stack.point( i )
+            b = stack.point( stack.nextVertex( i ) )
+            edges += math.sqrt( (b[0]-a[0])**2 + (b[1]-a[1])**2 + (b[2]-a[2])**2 )
+            sx += a[0]; sy += a[1]; sz += a[2]
+        numEdges += last - first
+        n = max( 1, last - first )
+        centres.append( (sx/n, sy/n, sz/n) )
+
+    gaps = [ math.sqrt( (b[0]-a[0])**2 + (b[1]-a[1])**2 + (b[2]-a[2])**2 ) for a, b in zip( centres, centres[1:] ) ]
+
+    return max( edges / max( 1, numEdges ), sum(gaps) / max( 1, len(gaps) ) )
+
+
+# Mesh 'numLevels' levels of 'stack' (fewer if the slices run out).
+# 'progress', if given, is called with each level as it is done.
+
+def buildLevels( stack, numLevels=4, processes=None, progress=None ):
+
+    levels = []
+
+    for k in range(numLevels):
+
+        step = 2 ** k
+        sub = stack if step == 1 else subsample( stack, step )
+        if len(sub) < 2 or (levels and len(sub) == len(levels[-1].stack) and sub.numVertices() == levels[-1].stack.numVertices()):
+            break
+
+        level = Level( step, meshDetail( sub ), sub, mesher.triangulateAll( sub, processes ) )
+        levels.append( level )
+
+        if progress:
+            progress( level )
+
+    return levels
+
+
+def littleEndian( a ):
+
+    if sys.byteorder == 'big':
+        a = array.array( a.typecode, a )
+        a.byteswap()
+    return a
+
+
+def writeLevels( filename, levels ):
+
+    with open( filename, 'wb' ) as f:
+
+        f.write( headerFormat.pack( magic, version, len(levels) ) )
+
+        offset = headerFormat.size + levelFormat.size * len(levels)
+        for level in levels:
+            s = level.stack
+            f.write( levelFormat.pack( level.step, level.detail, offset, len(s), len(s.contourStarts) - 1, s.numVertices(), len(level.triangles) ) )
+            offset += 4 * (len(s.sliceStarts) + len(s.contourStarts) + 3 * len(level.triangles)) + 8 * len(s.coords)
+
+        for level in levels:
+            s = level.stack
+            triangles = array.array( 'i' )
+            for t in level.triangles:
+                triangles.extend( t )
+            for a in (s.sliceStarts, s.contourStarts, s.coords, triangles):
+                littleEndian( a ).tofile( f )
+
+
+# A pyramid in a file, from which levels are read as they are wanted
+
+class LODFile(object):
+
+    def __init__( self, filename ):
+
+        self.f = open( filename, 'rb' )
+
+        tag, fileVersion, numLevels = headerFormat.unpack( self.f.read( headerFormat.size ) )
+        if tag != magic or fileVersion != version:
+            raise ValueError( '"%s" is not a level-of-detail file (see lod.py)' % filename )
+
+        self.entries = [ levelFormat.unpack( self.f.read( levelFormat.size ) ) for k in range(numLevels) ]
+        self.levels = [ None ] * numLevels
+
+    def __len__( self ):
+
+        return len(self.entries)
+
+    def close( self ):
+
+        self.f.close()
+
+    def isLoaded( self, k ):
+
+        return self.levels[k] is not None
+
+    def level( self, k ):
+
+        if self.levels[k] is None:
+
+            step, detail, offset, numSlices, numContours, numVertices, numTriangles = self.entries[k]
+            self.f.seek( offset )
+
+            arrays = []
+            for typecode, count in (('i', numSlices + 1), ('i', numContours + 1), ('d', 3 * numVertices), ('i', 3 * numTriangles)):
+                a = array.array( typecode )
+                a.fromfile( self.f, count )
+                arrays.append( littleEndian( a ) )
+
+            sliceStarts, contourStarts, coords, triangles = arrays
+            stack = SliceStack.fromArrays( coords, contourStarts, sliceStarts )
+            self.levels[k] = Level( step, detail, stack, list( zip( triangles[0::3], triangles[1::3], triangles[2::3] ) ) )
+
+        return self.levels[k]
+
+    # The coarsest level whose triangles are at most 'maxPixels'
+    # across, when one unit is 'pixelsPerUnit' pixels on the screen
+
+    def levelFor( self, pixelsPerUnit, maxPixels ):
+
+        for k in reversed(range(len(self.entries))):
+            if self.entries[k][1] * pixelsPerUnit <= maxPixels:
+                return k
+
+        return 0
+
+
+
+def main():
+
+    numLevels = 4
+    processes = None
+
+    args = sys.argv[1:]
+    while len(args) > 2:
+        if args[0] == '-levels':
+            numLevels = int(args[1])
+            args = args[1:]
+        elif args[0] == '-p':
+            processes = int(args[1])
+            args = args[1:]
+        args = args[1:]
+
+    if len(args) != 2 or numLevels < 1:
+        print( 'Usage: %s [-levels n] [-p processes] <file of slices> <lod file>' % sys.argv[0] )
+        sys.exit(1)
+
+    with open( args[0], 'rb' ) as f:
+        stack = SliceStack.fromContours( mesher.iterSliceContours( f, reverse=True ) )  # first slice on top
+
+    def progress( level ):
+        print( 'step %d: %d slices, %d vertices, %d triangles, detail %.3g' %
+               (level.step, len(level.stack), level.stack.numVertices(), len(level.triangles), level.detail) )
+
+    levels = buildLevels( stack, numLevels, processes, progress )
+    writeLevels( args[1], levels )
+
+    print( 'wrote %d levels to %s' % (len(levels), args[1]) )
+
+
+
+if __name__ == '__main__':
+    main()
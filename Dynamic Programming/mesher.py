@@ -0,0 +1,939 @@
+# Min-area meshing between slices
+#
+# Usage: python mesher.py [-p processes] [-python] [-memory packed|linear] [-band width] [-optimal] [-cost area|length|normal]
+#                         [-simplify tolerance] [-resample count] [-cache dir] [-strips] [-o meshfile [-stream]] <file of slices>
+#
+# This module does the computation for slices.py without any OpenGL,
+# so that it can be used headlessly and from worker processes.  It
+# works on plain coordinates: a contour is a list of [x,y,z] vertices,
+# a slice is a list of one or more contours, and a triangle between
+# slices 0 and 1 is a triple of indices in which 0..n0-1 are vertices
+# of slice 0 and n0..n0+n1-1 are vertices of slice 1, in
+# counterclockwise order as seen from outside.  The vertices of a
+# slice are numbered through its contours in order.
+#
+# The triangles between two contours can also be given as a triangle
+# strip: a list of indices in which each index after the first two
+# makes a triangle with the two before it, with every second triangle
+# reversed (as GL_TRIANGLE_STRIP draws them) so that all are
+# counterclockwise.  See pathStrip().
+#
+# Run as a script, it triangulates all slice pairs of a file in
+# parallel and reports the time taken.  With -o, it also writes the
+# mesh to an .obj, .ply or .stl file (see export.py).  With -stream as
+# well, the slices are read, meshed and written a pair at a time in
+# this process (see streamSlices()), so that stacks of any height fit
+# in memory.  With -cache, the triangles of each slice pair are kept in
+# the directory 'dir', so that running again on the same or an edited
+# file meshes only the pairs that changed (see cache.py).  With
+# -strips, the mesh is made as triangle strips (see pathStrip()), and
+# their number and length are reported.
+#
+# The settings below are those of the command line.  Each meshing run
+# takes a copy of them, a Settings object, when it starts (see
+# currentSettings()), and passes it down to the DP, so that runs in
+# several threads can each have their own.
+
+
+import sys, os, time, enum, array, bisect, multiprocessing
+
+import npdp
+import jitdp
+import banddp
+import lineardp
+import cyclicdp
+import costs
+import contours
+import export
+import cache
+import simplify
+import diagnostics
+from stack import SliceStack
+from vectors import length3
+
+
+useNumPy = npdp.numpy is not None  # fill DP tables with npdp.fillTables()
+
+useJIT = jitdp.haveNumba  # find the 'area' path with the compiled kernel in jitdp.py
+
+memoryMode = None  # None for full DP tables, or 'packed' or 'linear' (see lineardp.py)
+
+bandWidth = None  # if set, fill in only a band this wide on each side of the table's diagonal, widened as needed (see banddp.py)
+
+startMode = 'closest'  # start the DP at the 'closest' pair of vertices, or search for the 'optimal' start (see cyclicdp.py)
+
+costName = 'area'  # cost of each triangle that the DP minimizes (see costs.py)
+
+simplifyTolerance = None  # if set, simplify each slice to within this distance before meshing (see simplify.py)
+resampleCount = None      # if set, then resample each slice to this many vertices
+
+pairCache = None  # if set, a cache.PairCache of the triangles of slice pairs already meshed
+
+
+class Dir(enum.IntEnum): # for storing directions of min-area
+                         # triangulations in 'minDir' below.  An
+                         # IntEnum, so that NumPy tables of 1s and 2s
+                         # compare equal to it.
+    PREV_ROW = 1
+    PREV_COL = 2
+
+
+
+# Read slices from a file
+#
+# Format:   numSlices
+#           numPointsInSlice0
+#           point0-0
+#           point0-1
+#           point0-2
+#           ...
+#           numPointsInSlice1
+#           point1-0
+#           point1-1
+#           point1-2
+#           ...
+#
+# Each 'pointA-B' above is 'x y z' separated by spaces.
+#
+# A slice with several contours has the number of points of each on
+# its 'numPointsInSlice' line, e.g. '52 30', followed by the points of
+# the first contour, then of the second, and so on.  Contours with no
+# points are skipped.
+#
+# Returns a list of slices, each a list of contours, each a list of
+# [x,y,z], in file order.  The file lists slices from the bottom up.
+
+def readSliceContours( f ):
+
+    return list( iterSliceContours( f ) )
+
+
+# Yield the slices of file 'f' one at a time, as readSliceContours()
+# returns them, so that only one slice is held at a time.  With
+# 'reverse', they come from the last in the file (the top) to the
+# first: a first pass over the file finds where each slice starts,
+# and each is then read from there, so 'f' must be seekable.
+
+def iterSliceContours( f, reverse=False ):
+
+    numSlices = int( f.readline() )
+
+    if not reverse:
+        for i in range(numSlices):
+            yield readSlice( f )
+        return
+
+    starts = array.array( 'q' )
+    for i in range(numSlices):
+        starts.append( f.tell() )
+        for k in range( sum( int(n) for n in f.readline().split() ) ):
+            f.readline()
+
+    for start in reversed(starts):
+        f.seek( start )
+        yield readSlice( f )
+
+
+# Read one slice, starting at its 'numPointsInSlice' line
+
+def readSlice( f ):
+
+    slice = []
+
+    for numPoints in [ int(n) for n in f.readline().split() ]:
+        contour = [ [ float(n) for n in f.readline().split() ] for k in range(numPoints) ]
+        if contour:
+            slice.append( contour )
+
+    return slice
+
+
+
+# Simplify and resample the contours of slices as the settings above
+# ask, reporting what was done
+
+def prepareSlices( slices ):
+
+    if simplifyTolerance is None and resampleCount is None:
+        return slices
+
+    return list( prepareStream( slices ) )
+
+
+# The same for an iterable of slices, yielding each as it is done.
+# The report comes when the last has been taken.
+
+def prepareStream( slices ):
+
+    if simplifyTolerance is None and resampleCount is None:
+        yield from slices
+        return
+
+    before = 0
+    after = 0
+    error = 0.0
+
+    for slice in slices:
+        newSlice, e = simplify.prepareSlices( slice, simplifyTolerance, resampleCount )
+        before += sum( len(c) for c in slice )
+        after += sum( len(c) for c in newSlice )
+        error = max( error, e )
+        yield newSlice
+
+    diagnostics.message( 1, 'Slices reduced from %d to %d vertices, moving none by more than %.4g' % (before, after, error) )
+
+
+
+# Build the triangles between two slices
+#
+# Slice 0 is above (at a higher y) than slice 1.
+#
+# Within each slice, the vertices are ordered in the right-hand
+# direction with respect to the y axis.  That is, when looking from
+# the origin up the positive y axis, the vertices will appear in
+# CLOCKWISE order.
+#
+# 'coords0' and 'coords1' are the vertices of slices 0 and 1.  The
+# triangles are returned as index triples, as described at the top,
+# or with 'strips', as a list of one triangle strip.  'label'
+# identifies the pair in diagnostic output.  'settings' defaults to
+# the current settings (see currentSettings()).
+
+def triangulatePair( coords0, coords1, label='', strips=False, settings=None ):
+
+    if settings is None:
+        settings = currentSettings()
+
+    costFunction = costs.costFunctions[settings.costName]
+
+    # Find the pair of vertices (one from each slice) to start with.
+
+    if settings.startMode == 'optimal':
+        minI0, minI1, minCost = cyclicdp.optimalStart( coords0, coords1, costFunction, settings.useNumPy )
+    else:
+        minI0, minI1 = closestPair( coords0, coords1 )
+
+    # Make a cyclic permutation of the vertices of each slice,
+    # that starts at the vertex in each slice found above.
+    #
+    # ADD THE FIRST VERTEX TO THE END of the vertices, so that the
+    # triangulation ends up on the same edge as it started.
+    #
+    # 'ids0' and 'ids1' hold the index of each of these vertices.
+
+    m0 = len(coords0)
+    m1 = len(coords1)
+    ids0 = [ (minI0 + k) % m0      for k in range(m0 + 1) ]  # top slice
+    ids1 = [ m0 + (minI1 + k) % m1 for k in range(m1 + 1) ]  # bottom slice
+    verts0 = [ coords0[i] for i in ids0 ]
+    verts1 = [ coords1[i - m0] for i in ids1 ]
+
+    n0 = len(verts0)
+    n1 = len(verts1)
+
+    if settings.bandWidth is not None:
+        path, width = banddp.bandPath( costFunction( verts0, verts1 ), settings.bandWidth )
+        if width > settings.bandWidth:
+            diagnostics.message( 2, '%s: band widened to %d' % (label, width) )
+    elif settings.memoryMode == 'packed':
+        path = lineardp.packedPath( costFunction( verts0, verts1 ) )
+    elif settings.memoryMode == 'linear':
+        path = lineardp.linearPath( costFunction( verts0, verts1 ) )
+    elif settings.useJIT and settings.costName == 'area' and not diagnostics.wantTables():
+        path = jitdp.minAreaPath( verts0, verts1 )
+    else:
+        minArea, minDir = fillTables( verts0, verts1, settings )
+
+        # The table is only printed with -v, or written to a file with -t.
+
+        if diagnostics.wantTables():
+            diagnostics.dumpTables( label, minArea, minDir, Dir.PREV_ROW, Dir.PREV_COL )
+
+        path = backtrack( minDir )
+
+    if strips:
+        return [ pathStrip( path, ids0, ids1 ) ]
+
+    # Build the triangles along the path.  Each step adds the triangle
+    # between the entry stepped from and the entry stepped to, with its
+    # vertices counterclockwise as seen from outside.
+
+    triangles = []
+    r, c = n1 - 1, n0 - 1
+    for fromRow in path:
+        if fromRow:
+            triangles.append((ids0[c], ids1[r - 1], ids1[r]))
+            r -= 1
+        else:
+            triangles.append((ids1[r], ids0[c], ids0[c - 1]))
+            c -= 1
+
+    triangles.append((ids0[0], ids1[0], ids0[n0 - 1]))
+
+    return triangles
+
+
+
+# Build the triangles between two slices of one or more contours each
+#
+# 'contours0' and 'contours1' are the contours of the top and bottom
+# slices.  Their contours are matched and joined as described in
+# contours.py, and each matched group is triangulated by
+# triangulatePair().  The triangles are returned as index triples, as
+# described at the top.
+#
+# With 'strips', a list of triangle strips is returned instead, one
+# for each group.
+#
+# With a 'pairCache' in 'settings', the triangles are looked up there
+# first, unless the DP tables are wanted (see diagnostics.py).
+
+def triangulateSlices( contours0, contours1, label='', strips=False, settings=None ):
+
+    if settings is None:
+        settings = currentSettings()
+
+    pairCache = settings.pairCache
+
+    if pairCache is None or diagnostics.wantTables():
+        return tileSlices( contours0, contours1, label, strips, settings )
+
+    key = pairKey( contours0, contours1, strips, settings )
+    flat = pairCache.get( key )
+
+    if flat is None:
+        flat = packIndices( tileSlices( contours0, contours1, label, strips, settings ), strips )
+        pairCache.put( key, flat )
+
+    return unpackIndices( flat, strips )
+
+
+# Triangles or strips as one flat array of ints, and back.  Triangles
+# are just their indices, three at a time, and each strip is ended by
+# -1.
+
+def packIndices( items, strips ):
+
+    flat = array.array( 'i' )
+    for t in items:
+        flat.extend( t )
+        if strips:
+            flat.append( -1 )
+    return flat
+
+
+def unpackIndices( flat, strips ):
+
+    if not strips:
+        return [ tuple( flat[k:k+3] ) for k in range(0, len(flat), 3) ]
+
+    items = []
+    start = 0
+    for k, i in enumerate(flat):
+        if i == -1:
+            items.append( flat[start:k].tolist() )
+            start = k + 1
+    return items
+
+
+# The key of a slice pair in 'pairCache': a hash of the coordinates of
+# the slices' contours and the settings that change the triangles.
+# 'useNumPy', 'useJIT' and 'memoryMode' give the same triangles, so
+# they are not part of it.  'bandWidth' is, since the band can find
+# another path of the same cost, to within rounding (see banddp.py).
+
+def pairKey( contours0, contours1, strips=False, settings=None ):
+
+    return packedPairKey( packSlice( contours0 ), packSlice( contours1 ), strips, settings )
+
+
+# The same for slices as packSlice() packs them
+
+def packedPairKey( packed0, packed1, strips=False, settings=None ):
+
+    if settings is None:
+        settings = currentSettings()
+
+    parts = [ repr( (sys.byteorder, settings.costName, settings.startMode, costs.NormalCost.weight, strips) ).encode( 'ascii' ) ]
+    if settings.bandWidth is not None:
+        parts.append( repr( ('band', settings.bandWidth) ).encode( 'ascii' ) )
+
+    for flat, counts in (packed0, packed1):
+        parts.append( counts.tobytes() )
+        parts.append( flat.tobytes() )
+
+    return cache.digest( parts )
+
+
+def tileSlices( contours0, contours1, label, strips=False, settings=None ):
+
+    if len(contours0) == 1 and len(contours1) == 1:
+        return triangulatePair( contours0[0], contours1[0], label, strips, settings )
+
+    n0 = sum( len(c) for c in contours0 )
+
+    offsets0 = [0]
+    for c in contours0:
+        offsets0.append( offsets0[-1] + len(c) )
+    offsets1 = [n0]
+    for c in contours1:
+        offsets1.append( offsets1[-1] + len(c) )
+
+    triangles = []
+
+    for top, bottom in contours.matchContours( contours0, contours1 ):
+
+        # Each side of the group as one contour, and the slice index of
+        # each of its vertices
+
+        sides = []
+        for group, slice, offsets in ((top, contours0, offsets0), (bottom, contours1, offsets1)):
+            sliceIDs = [ i for k in group for i in range( offsets[k], offsets[k+1] ) ]
+            if len(group) == 1:
+                sides.append( (slice[group[0]], sliceIDs) )
+            else:
+                coords, groupIDs = contours.compositeContour( [ slice[k] for k in group ], closestPair )
+                sides.append( (coords, [ sliceIDs[i] for i in groupIDs ]) )
+
+        (coords0, ids0), (coords1, ids1) = sides
+        ids = ids0 + ids1
+
+        groupLabel = '%s[%s-%s]' % (label, '+'.join( map( str, top ) ), '+'.join( map( str, bottom ) ))
+
+        for t in triangulatePair( coords0, coords1, groupLabel, strips, settings ):
+            if strips:
+                triangles.append( [ ids[i] for i in t ] )
+            else:
+                triangles.append( (ids[t[0]], ids[t[1]], ids[t[2]]) )
+
+    return triangles
+
+
+
+# The triangle strip along 'path' (as backtrack() returns it) through
+# the table of vertices 'ids0' (columns) and 'ids1' (rows)
+#
+# Going forward from [0][0], each step adds one vertex: the next one on
+# the bottom slice for a PREV_ROW step, or on the top slice for a
+# PREV_COL step.  Its triangle is the new vertex with the edge of the
+# entry stepped from, whose other vertex stays for the next step.
+# Steps that alternate continue the strip as it is.  Two steps in the
+# same direction make a fan around the vertex that stays, which a
+# strip can't do directly, so it "swaps": it repeats the vertex that
+# stays, adding a triangle with no area, and goes on from there.  So
+# the strip has 2 + (number of steps) + (number of swaps) indices.
+#
+# The closing triangle (see triangulatePair()), which has no area,
+# is left out.
+
+def pathStrip( path, ids0, ids1 ):
+
+    strip = [ ids0[0], ids1[0] ]  # as if after a PREV_ROW step
+    r, c = 0, 0
+    prevFromRow = True
+
+    for fromRow in reversed(path):
+
+        if fromRow:
+            stay = ids0[c]
+            r += 1
+            new = ids1[r]
+        else:
+            stay = ids1[r]
+            c += 1
+            new = ids0[c]
+
+        if fromRow == prevFromRow:
+            strip.append( stay )  # swap
+
+        strip.append( new )
+        prevFromRow = fromRow
+
+    return strip
+
+
+# The triangles of a strip, leaving out those with no area (a repeated
+# index)
+
+def stripTriangles( strip ):
+
+    triangles = []
+    for k in range(len(strip) - 2):
+        if k % 2 == 0:
+            t = ( strip[k], strip[k+1], strip[k+2] )
+        else:
+            t = ( strip[k+1], strip[k], strip[k+2] )
+        if t[0] != t[1] and t[1] != t[2] and t[2] != t[0]:
+            triangles.append( t )
+    return triangles
+
+
+
+# Find the closest pair of vertices, one from each slice, returning
+# their indices.
+#
+# This sweeps over the vertices of slice 1 sorted by x: for each vertex
+# of slice 0, only the vertices of slice 1 whose x is within the
+# closest distance so far need to be checked.  Distances are computed
+# as length(subtract(v0,v1)) would, and ties are broken exactly as in a brute
+# force loop over all (i0,i1) in order, so the pair is the same.
+
+def closestPair( coords0, coords1 ):
+
+    order = sorted( range(len(coords1)), key=lambda i: coords1[i][0] )
+    xs = [ coords1[i][0] for i in order ]
+
+    minI0 = None     # closest vertex on top slice
+    minI1 = None     # closest vertex on bottom slice
+    min_distance = float('inf') # distance of closest vertex
+
+    for i0, v0 in enumerate(coords0):
+
+        x, y, z = v0
+        k = bisect.bisect_left( xs, x )
+        bestDist = min_distance  # closest to v0 so far, if below min_distance
+        bestI1 = None
+
+        for kk, step in ((k, 1), (k-1, -1)):  # scan right, then left
+            while 0 <= kk < len(xs) and abs(xs[kk] - x) <= bestDist:
+                i1 = order[kk]
+                v1 = coords1[i1]
+                dist = length3( x - v1[0], y - v1[1], z - v1[2] )
+                if dist < bestDist or (dist == bestDist and bestI1 is not None and i1 < bestI1):
+                    bestDist = dist
+                    bestI1 = i1
+                kk += step
+
+        if bestI1 is not None:
+            min_distance = bestDist
+            minI0 = i0
+            minI1 = bestI1
+
+    return minI0, minI1
+
+
+
+# Walk backward through the 'minDir' array to find the min-area path.
+#
+# Start at the maximum r,c indices and go backward, depending
+# on whether minDir[r][c] is Dir.PREV_ROW or Dir.PREV_COL.
+#
+# Continue going backward through the array until reaching [0][0].
+#
+# Returns the steps as a list of booleans, True for PREV_ROW.
+
+def backtrack( minDir ):
+
+    path = []
+    r, c = len(minDir) - 1, len(minDir[0]) - 1
+    while r > 0 or c > 0:
+        if minDir[r][c] == Dir.PREV_ROW:
+            path.append(True)
+            r -= 1
+        else:
+            path.append(False)
+            c -= 1
+
+    return path
+
+
+
+# Fill in the 'minArea' and 'minDir' arrays for the cyclically
+# permuted vertices 'verts0' (top) and 'verts1' (bottom).
+#
+# The first dimension (rows) of the arrays corresponds to vertices in
+# slice1.  The second dimension (cols) corresponds to vertices in
+# slice0.
+#
+# 'minDir' stores Dir.PREV_ROW or Dir.PREV_COL in each entry [r][c],
+# depending on whether the min-area triangulation ending at [r][c]
+# came from the previous row or previous column.
+#
+# The "area" is the total cost of the triangles, as given by the cost
+# function named by the 'costName' of 'settings'.  It is the true area
+# unless another cost was chosen.
+
+def fillTables( verts0, verts1, settings=None ):
+
+    if settings is None:
+        settings = currentSettings()
+
+    n0 = len(verts0)
+    n1 = len(verts1)
+
+    costFunction = costs.costFunctions[settings.costName]
+
+    if settings.useNumPy and costFunction.stepMatrices is not None:
+
+        minArea, minDir = npdp.fillTables( verts0, verts1, Dir.PREV_ROW, Dir.PREV_COL, costFunction.stepMatrices )
+
+        # Lists are much faster than arrays to index one entry at a time
+
+        return minArea.tolist(), minDir.tolist()
+
+    cost = costFunction( verts0, verts1 )
+
+    # Initialize DP tables
+    minArea = [[float('inf') for i in range(n0)] for j in range(n1)]
+    minDir  = [[None for i in range(n0)] for j in range(n1)]
+
+
+    # Fill in the minArea array
+
+    minArea[0][0] = 0 # Starting edge has zero area
+
+    # Fill in row 0 of minArea and minDir, since it's a special case
+    # as there's no row -1 so only one condition is checked.
+    rowCosts, colCosts = cost.steps(0)
+    for c in range(1, n0):
+        minArea[0][c] = minArea[0][c - 1] + colCosts[c]
+        minDir[0][c] = Dir.PREV_COL
+
+
+    # Fill in the remaining rows.  Col 0 is a special case as there's
+    # no col -1 so only one condition is checked.  The other entries
+    # are more general because both conditions are checked.
+    for r in range(1, n1):
+
+        rowCosts, colCosts = cost.steps(r)
+
+        minArea[r][0] = minArea[r - 1][0] + rowCosts[0]
+        minDir[r][0] = Dir.PREV_ROW
+
+        for c in range(1, n0):
+            # for each component, compute the variables area_from_row and area_from_col
+            area_from_row = minArea[r - 1][c] + rowCosts[c]
+            area_from_col = minArea[r][c - 1] + colCosts[c]
+            # compare which is smaller
+            if area_from_row < area_from_col:
+                minArea[r][c] = area_from_row
+                minDir[r][c] = Dir.PREV_ROW
+            else:
+                minArea[r][c] = area_from_col
+                minDir[r][c] = Dir.PREV_COL
+
+    return minArea, minDir
+
+
+
+# Parallel meshing of all slice pairs
+#
+# The slices are a SliceStack (see stack.py), which is given to each
+# worker process once, when it starts, as three arrays of numbers.  A
+# job is then just the number of a slice pair, and the triangles come
+# back as a flat array of vertex indices, so that nothing but raw
+# numbers is pickled.  Results are merged in slice order.
+#
+# packSlice() and unpackSlice() give a slice of contours in the same
+# flat form, one at a time.
+
+
+def packCoords( coords ):
+
+    flat = array.array( 'd' )
+    for v in coords:
+        flat.extend( v )
+    return flat
+
+
+def unpackCoords( flat ):
+
+    return [ list(flat[i:i+3]) for i in range(0, len(flat), 3) ]
+
+
+def packSlice( slice ):
+
+    return packCoords( [ v for c in slice for v in c ] ), array.array( 'i', [ len(c) for c in slice ] )
+
+
+def unpackSlice( flat, counts ):
+
+    coords = unpackCoords( flat )
+    slice = []
+    k = 0
+    for n in counts:
+        slice.append( coords[k:k+n] )
+        k += n
+    return slice
+
+
+# The settings of one meshing run, as they are at the top of this file
+# when it starts (see currentSettings())
+
+class Settings(object):
+
+    def __init__( self, useNumPy, useJIT, memoryMode, bandWidth, startMode, costName, pairCache=None ):
+
+        self.useNumPy   = useNumPy
+        self.useJIT     = useJIT
+        self.memoryMode = memoryMode
+        self.bandWidth  = bandWidth
+        self.startMode  = startMode
+        self.costName   = costName
+        self.pairCache  = pairCache
+
+    # The same settings for worker processes, without the cache, since
+    # the main process looks up and stores triangles
+
+    def forWorkers( self ):
+
+        return Settings( self.useNumPy, self.useJIT, self.memoryMode, self.bandWidth, self.startMode, self.costName )
+
+
+def currentSettings():
+
+    return Settings( useNumPy, useJIT, memoryMode, bandWidth, startMode, costName, pairCache )
+
+
+workerSlices = None    # in a worker process, the SliceStack being meshed
+workerSettings = None  # ... and the Settings to mesh it with
+
+
+def workerInit( settings, slices ):
+
+    global workerSlices, workerSettings
+
+    workerSlices = slices
+    workerSettings = settings
+    diagnostics.verbosity = 0      # workers would interleave their output
+    diagnostics.tableFile = None
+
+
+def triangulateStacked( job ):
+
+    i, label, strips = job
+
+    return packIndices( tileSlices( workerSlices.contours( i ), workerSlices.contours( i+1 ), label, strips, workerSettings ), strips )
+
+
+# Triangulate every pair of adjacent slices in 'slices', a SliceStack
+# or a list of slices as lists of contours, top first.  Returns a list
+# of index triples into all the slices' vertices, numbered as in the
+# SliceStack, or with 'strips', a list of triangle strips of such
+# indices.
+#
+# 'processes' is the number of worker processes (default: one per
+# CPU).  With one process, or when tables are being dumped, the pairs
+# are done in this process.  'progress', if given, is called with the
+# number of pairs left after each pair is done.  'settings' defaults to
+# the current settings (see currentSettings()).
+
+def triangulateAll( slices, processes=None, progress=None, strips=False, settings=None ):
+
+    numPairs = len(slices) - 1
+    triangles = []
+
+    if settings is None:
+        settings = currentSettings()
+
+    for i, items in iterTriangulateAll( slices, processes, strips, settings ):
+        triangles.extend( items )
+        if progress:
+            progress( numPairs-1-i )
+
+    return triangles
+
+
+# The same, yielding (i, items) for each pair i of slices i and i+1 as
+# it is done, in order, with 'items' its triangles (or strips) as
+# indices into all the vertices.  Closing the generator early stops
+# the worker processes.  Without 'settings', those current when the
+# first pair is asked for are used.
+
+def iterTriangulateAll( slices, processes=None, strips=False, settings=None ):
+
+    if settings is None:
+        settings = currentSettings()
+
+    pairCache = settings.pairCache
+
+    if processes is None:
+        processes = os.cpu_count() or 1
+
+    if not isinstance( slices, SliceStack ):
+        slices = SliceStack.fromContours( slices )
+
+    offsets = [ slices.vertexRange( i )[0] for i in range(len(slices)) ]
+
+    numPairs = len(slices) - 1
+
+    def shift( items, o ):
+        if strips:
+            return [ [ i + o for i in t ] for t in items ]
+        return [ (t[0] + o, t[1] + o, t[2] + o) for t in items ]
+
+    if processes <= 1 or numPairs <= 1 or diagnostics.wantTables():
+
+        for i in range(numPairs):
+            yield i, shift( triangulateSlices( slices.contours( i ), slices.contours( i+1 ), 's%d-s%d' % (i, i+1), strips, settings ), offsets[i] )
+
+        return
+
+    # Only pairs that aren't in the cache go to the workers
+
+    if pairCache is None:
+        keys = [ None ] * numPairs
+        cached = [ None ] * numPairs
+    else:
+        keys = [ packedPairKey( slices.packSlice( i ), slices.packSlice( i+1 ), strips, settings ) for i in range(numPairs) ]
+        cached = [ pairCache.get( key ) for key in keys ]
+
+    jobs = [ ( i, 's%d-s%d' % (i, i+1), strips ) for i in range(numPairs) if cached[i] is None ]
+
+    with multiprocessing.Pool( max( 1, min(processes, len(jobs)) ), initializer=workerInit, initargs=(settings.forWorkers(), slices) ) as pool:
+        computed = pool.imap( triangulateStacked, jobs )
+        for i in range(numPairs):
+            flat = cached[i]
+            if flat is None:
+                flat = next( computed )
+                if keys[i] is not None:
+                    pairCache.put( keys[i], flat )
+            yield i, shift( unpackIndices( flat, strips ), offsets[i] )
+
+
+
+# Mesh the slices of the iterable 'slices' (each a list of contours)
+# as they come and send the mesh to 'stream' (see export.openStream()),
+# holding only the current pair of slices.  The slices come top first
+# or, if not 'topFirst', bottom first; the vertices are numbered in the
+# order they come.  This is done in this process.  Returns the number
+# of slices.
+
+def streamSlices( slices, stream, topFirst=True, progress=None, settings=None ):
+
+    if settings is None:
+        settings = currentSettings()
+
+    prev = None
+    prevStart = 0
+    numSlices = 0
+
+    for slice in slices:
+
+        start = stream.numVertices
+        stream.addVertices( [ v for c in slice for v in c ] )
+
+        if prev is not None:
+
+            if topFirst:
+                top, bottom, topStart, bottomStart = prev, slice, prevStart, start
+            else:
+                top, bottom, topStart, bottomStart = slice, prev, start, prevStart
+
+            n0 = sum( len(c) for c in top )
+            o0 = topStart
+            o1 = bottomStart - n0
+
+            triangles = []
+            for t in triangulateSlices( top, bottom, 's%d-s%d' % (numSlices-1, numSlices), False, settings ):
+                triangles.append( tuple( i + o0 if i < n0 else i + o1 for i in t ) )
+            stream.addTriangles( triangles )
+
+            if progress:
+                progress( numSlices )
+
+        prev, prevStart = slice, start
+        numSlices += 1
+
+    return numSlices
+
+
+
+def main():
+
+    global useNumPy, useJIT, memoryMode, bandWidth, startMode, costName, simplifyTolerance, resampleCount, pairCache
+
+    processes = None
+    meshFile = None
+    stream = False
+    cacheDir = None
+    strips = False
+
+    args = sys.argv[1:]
+    while len(args) > 1:
+        if args[0] == '-p' and len(args) > 2:
+            processes = int(args[1])
+            args = args[1:]
+        elif args[0] == '-python':
+            useNumPy = False
+            useJIT = False
+        elif args[0] == '-memory' and len(args) > 2:
+            memoryMode = args[1]
+            args = args[1:]
+        elif args[0] == '-band' and len(args) > 2:
+            bandWidth = int(args[1])
+            args = args[1:]
+        elif args[0] == '-optimal':
+            startMode = 'optimal'
+        elif args[0] == '-cost' and len(args) > 2:
+            costName = args[1]
+            args = args[1:]
+        elif args[0] == '-o' and len(args) > 2:
+            meshFile = args[1]
+            args = args[1:]
+        elif args[0] == '-stream':
+            stream = True
+        elif args[0] == '-strips':
+            strips = True
+        elif args[0] == '-cache' and len(args) > 2:
+            cacheDir = args[1]
+            args = args[1:]
+        elif args[0] == '-simplify' and len(args) > 2:
+            simplifyTolerance = float(args[1])
+            args = args[1:]
+        elif args[0] == '-resample' and len(args) > 2:
+            resampleCount = int(args[1])
+            args = args[1:]
+        args = args[1:]
+
+    if len(args) < 1 or memoryMode not in (None, 'packed', 'linear') or costName not in costs.costFunctions or \
+       (bandWidth is not None and bandWidth < 1) or \
+       (meshFile is not None and export.meshFormat( meshFile ) is None) or (stream and meshFile is None):
+        print( 'Usage: %s [-p processes] [-python] [-memory packed|linear] [-band width] [-optimal] [-cost %s] [-simplify tolerance] [-resample count] [-cache dir] [-strips] [-o meshfile [-stream]] filename' % (sys.argv[0], '|'.join( costs.costFunctions )) )
+        sys.exit(1)
+
+    if cacheDir is not None:
+        pairCache = cache.PairCache( cacheDir )
+
+    if stream:
+        start = time.perf_counter()
+        with open( args[0], 'rb' ) as f, export.openStream( meshFile ) as out:
+            numSlices = streamSlices( prepareStream( iterSliceContours( f, reverse=True ) ), out )
+        elapsed = time.perf_counter() - start
+        print( '%d slices, %d triangles streamed to %s in %.3f seconds' % (numSlices, out.numTriangles, meshFile, elapsed) )
+        if pairCache is not None:
+            print( '%d pairs from the cache, %d meshed' % (pairCache.hits, pairCache.misses) )
+        return
+
+    with open( args[0], 'rb' ) as f:
+        slices = SliceStack.fromContours( prepareStream( iterSliceContours( f, reverse=True ) ) )  # first slice on top
+
+    start = time.perf_counter()
+    triangles = triangulateAll( slices, processes, strips=strips )
+    elapsed = time.perf_counter() - start
+
+    # The triangles counted are those written, as with -stream, without
+    # the one that closes each band (see export.properTriangles())
+
+    if strips:
+        numStrips = len(triangles)
+        numIndices = sum( len(strip) for strip in triangles )
+        triangles = [ t for strip in triangles for t in stripTriangles( strip ) ]
+        print( '%d slices, %d triangles in %.3f seconds' % (len(slices), len( export.properTriangles( triangles ) ), elapsed) )
+        print( '%d strips of %d indices (%d swaps), %.2f indices per triangle' %
+               (numStrips, numIndices, numIndices - 2 * numStrips - len(triangles), numIndices / max( 1, len(triangles) )) )
+    else:
+        print( '%d slices, %d triangles in %.3f seconds' % (len(slices), len( export.properTriangles( triangles ) ), elapsed) )
+    if pairCache is not None:
+        print( '%d pairs from the cache, %d meshed' % (pairCache.hits, pairCache.misses) )
+
+    if meshFile is not None:
+        start = time.perf_counter()
+        numTriangles = export.writeMesh( meshFile, slices.points(), triangles )
+        elapsed = time.perf_counter() - start
+        print( 'wrote %d triangles to %s in %.3f seconds' % (numTriangles, meshFile, elapsed) )
+
+
+
+if __name__ == '__main__':
+    main()
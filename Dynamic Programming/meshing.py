@@ -0,0 +1,178 @@
+# Meshing a whole stack of slices
+#
+# These are the helpers that slices.py uses to read, mesh and write a
+# stack of slices.  Like mesher.py, which does the DP, this module
+# doesn't use OpenGL, so a batch job can import it without the GL stack:
+#
+#   with open( 'femurSlices.dat', 'rb' ) as f:
+#       slices = readSlices( f )
+#   writeTriangles( 'femur.obj', slices, buildAllTriangles( slices ) )
+#
+# The slices are kept in a SliceStack (see stack.py), top first, and a
+# vertex is its index there.  A triangle is a triple of such indices,
+# counterclockwise as seen from outside the object, and a triangle
+# strip is a list of them.
+
+
+import sys, time, queue, threading
+
+import mesher
+import export
+import diagnostics
+from stack import SliceStack
+
+
+# Read slices from a file (see mesher.readSliceContours() for the
+# format) into a SliceStack, top first.  The file lists them from the
+# bottom up, so it is read from the end.
+
+def readSlices( f ):
+
+    return SliceStack.fromContours( mesher.prepareStream( mesher.iterSliceContours( f, reverse=True ) ) )
+
+
+# Build the triangles between slices s and s+1 of 'slices'
+#
+# Slice s is above (at a higher y) than slice s+1.  The min-area DP
+# itself is mesher.triangulatePair(), which works on coordinates, and
+# mesher.triangulateSlices() matches up the contours of the slices.
+#
+# With 'strips', triangle strips are returned instead.  'settings', a
+# mesher.Settings, defaults to mesher's current settings.
+
+def buildTriangles( slices, s, strips=False, settings=None ):
+
+    o = slices.vertexRange( s )[0]
+    items = mesher.triangulateSlices( slices.contours( s ), slices.contours( s+1 ), 's%d-s%d' % (s, s+1), strips, settings )
+
+    if strips:
+        return [ [ i + o for i in strip ] for strip in items ]
+
+    return [ (t[0] + o, t[1] + o, t[2] + o) for t in items ]
+
+
+# The triangles of triangle strips
+
+def trianglesOfStrips( strips ):
+
+    return [ t for strip in strips for t in mesher.stripTriangles( strip ) ]
+
+
+# Build the triangles (or 'strips') between all pairs of adjacent
+# slices, using 'processes' worker processes (default: one per CPU)
+
+def buildAllTriangles( slices, strips=False, processes=None, settings=None ):
+
+    def progress( numLeft ):
+        if diagnostics.verbosity == 1:
+            sys.stdout.write( '\r%d left ' % numLeft )
+            sys.stdout.flush()
+
+    items = mesher.triangulateAll( slices, processes, progress, strips, settings )
+
+    if diagnostics.verbosity == 1:
+        sys.stdout.write( '\r          \n' )
+
+    return items
+
+
+
+# Meshing in the background
+#
+# A MeshJob meshes all slice pairs in a thread, which runs
+# mesher.iterTriangulateAll() (and so the worker processes), and puts
+# the triangles of each pair on a queue as it is done.  The main loop
+# takes them off with collect() and adds them to the mesh it shows (see
+# slices.py), so that the mesh is drawn as it grows and the window
+# keeps responding.  wake(), if given, is called from the thread after
+# each pair, to wake up the main loop.  cancel() stops the job after the
+# pair being done.  If the meshing fails, collect() raises its
+# exception once the pairs done before it have been collected.
+#
+# The job meshes with 'settings', a mesher.Settings, or with a copy of
+# mesher's settings as they are when it is made, so that changing them
+# doesn't change a job under way, and several jobs can run at once with
+# different settings.
+
+class MeshJob(object):
+
+    def __init__( self, slices, strips=False, processes=None, wake=None, settings=None ):
+
+        self.slices = slices
+        self.strips = strips
+        self.processes = processes
+        self.wake = wake
+        self.settings = settings if settings is not None else mesher.currentSettings()
+        self.numPairs = len(slices) - 1
+        self.numDone = 0
+        self.queue = queue.Queue()
+        self.cancelled = threading.Event()
+        self.done = False
+        self.error = None  # exception that stopped the thread, if any
+        self.startTime = time.perf_counter()
+
+        self.thread = threading.Thread( target=self.run, daemon=True )
+        self.thread.start()
+
+    def run( self ):
+
+        pairs = mesher.iterTriangulateAll( self.slices, self.processes, self.strips, self.settings )
+        try:
+            for i, items in pairs:
+                if self.cancelled.is_set():
+                    break
+                self.queue.put( items )
+                if self.wake is not None:
+                    self.wake()
+        except Exception as e:
+            self.error = e
+        finally:
+            pairs.close()  # stops the worker processes
+            self.queue.put( None )
+            if self.wake is not None:
+                self.wake()
+
+    def cancel( self ):
+
+        self.cancelled.set()
+        self.thread.join()
+
+    # Add the pairs done so far to 'triangles' (and 'strips').  Returns
+    # True if there were any.
+
+    def collect( self, triangles, strips ):
+
+        found = False
+
+        while True:
+            try:
+                items = self.queue.get_nowait()
+            except queue.Empty:
+                break
+
+            found = True
+
+            if items is None:
+                self.done = True
+                if self.error is not None:
+                    raise self.error
+                diagnostics.message( 1, '%s %d of %d pairs, %d triangles in %.2f seconds' %
+                                     ('Stopped after' if self.cancelled.is_set() else 'Meshed', self.numDone, self.numPairs,
+                                      len(triangles), time.perf_counter() - self.startTime) )
+            elif self.strips:
+                strips.extend( items )
+                triangles.extend( trianglesOfStrips( items ) )
+                self.numDone += 1
+            else:
+                triangles.extend( items )
+                self.numDone += 1
+
+        return found
+
+
+# Write 'triangles' of the vertices of 'slices' to a mesh file (see
+# export.py).  Returns the number of triangles written.
+
+def writeTriangles( filename, slices, triangles ):
+
+    return export.writeMesh( filename, slices.points(), triangles )
@@ -0,0 +1,123 @@
+# NumPy engine for the min-area DP in slices.py
+#
+# NumPy is optional.  If it is not installed, 'numpy' is None here and
+# slices.py uses its pure-Python loops instead.
+#
+# fillTables() computes the same 'minArea' and 'minDir' tables as the
+# loops in buildTriangles(), bit for bit, so that the triangulation is
+# identical:
+#
+#   1. The area of every triangle that a PREV_ROW step or a PREV_COL
+#      step can add is computed up front as two (n1 x n0) matrices,
+#      with the same floating-point operations, in the same order, as
+#      triangleArea().
+#
+#   2. Each entry [r][c] depends only on [r-1][c] and [r][c-1], which
+#      both lie on the previous anti-diagonal r+c-1.  The tables are
+#      stored "skewed", with one anti-diagonal per row, so that each
+#      anti-diagonal is computed from the one before it with a few
+#      vector operations on contiguous arrays.
+
+
+try:
+    import numpy
+except ImportError:
+    numpy = None
+
+
+# Areas of triangles (a[i], b[i], c[i]) for arrays of points of shape
+# (..., 3), computed exactly as triangleArea() does.
+
+def triangleAreas(a, b, c):
+    ux = b[..., 0] - a[..., 0]
+    uy = b[..., 1] - a[..., 1]
+    uz = b[..., 2] - a[..., 2]
+    vx = c[..., 0] - a[..., 0]
+    vy = c[..., 1] - a[..., 1]
+    vz = c[..., 2] - a[..., 2]
+
+    x = uy * vz - uz * vy
+    y = uz * vx - ux * vz
+    z = ux * vy - uy * vx
+
+    return 0.5 * numpy.sqrt(x * x + y * y + z * z)
+
+
+# Areas added by a step into each entry [r][c]: 'rowArea' from the
+# previous row, 'colArea' from the previous column.  Entries with no
+# previous row (or column) are infinite.
+
+def stepAreas(coords0, coords1):
+    v0 = numpy.asarray(coords0, dtype=numpy.float64)  # (n0, 3) top slice
+    v1 = numpy.asarray(coords1, dtype=numpy.float64)  # (n1, 3) bottom slice
+    n0 = len(v0)
+    n1 = len(v1)
+
+    rowArea = numpy.full((n1, n0), numpy.inf)
+    colArea = numpy.full((n1, n0), numpy.inf)
+
+    # triangle [ verts0[c], verts1[r-1], verts1[r] ]
+
+    rowArea[1:, :] = triangleAreas(v0[numpy.newaxis, :, :],
+                                   v1[:-1, numpy.newaxis, :],
+                                   v1[1:, numpy.newaxis, :])
+
+    # triangle [ verts1[r], verts0[c-1], verts0[c] ]
+
+    colArea[:, 1:] = triangleAreas(v1[:, numpy.newaxis, :],
+                                   v0[numpy.newaxis, :-1, :],
+                                   v0[numpy.newaxis, 1:, :])
+
+    return rowArea, colArea
+
+
+# Fill in 'minArea' and 'minDir' for the vertex coordinates of the top
+# slice (coords0, n0 entries) and bottom slice (coords1, n1 entries).
+# Both are (n1 x n0) arrays.  'minDir' holds 'prevRow' or 'prevCol'
+# for each entry, except [0][0], which is 0.
+#
+# 'stepCosts' computes the cost of each step as stepAreas() does; it
+# is the 'stepMatrices' of a cost function in costs.py.
+
+def fillTables(coords0, coords1, prevRow, prevCol, stepCosts=stepAreas):
+    rowArea, colArea = stepCosts(coords0, coords1)
+    n1, n0 = rowArea.shape
+    numDiags = n0 + n1 - 1
+
+    # Skewed index: entry [r][c] is stored at [r+c][r+1].  Column 0 of
+    # the skewed tables is padding for r = -1, and entries with c
+    # outside [0,n0) have infinite step areas, so they stay infinite.
+
+    r = numpy.arange(n1)
+    d = numpy.arange(numDiags)[:, numpy.newaxis]
+    c = d - r[numpy.newaxis, :]
+    valid = (c >= 0) & (c < n0)
+    cValid = numpy.where(valid, c, 0)
+
+    skewRowArea = numpy.full((numDiags, n1 + 1), numpy.inf)
+    skewColArea = numpy.full((numDiags, n1 + 1), numpy.inf)
+    skewRowArea[:, 1:] = numpy.where(valid, rowArea[r, cValid], numpy.inf)
+    skewColArea[:, 1:] = numpy.where(valid, colArea[r, cValid], numpy.inf)
+
+    skewArea = numpy.full((numDiags, n1 + 1), numpy.inf)
+    skewFromRow = numpy.zeros((numDiags, n1 + 1), dtype=bool)
+
+    skewArea[0, 1] = 0  # starting edge has zero area
+
+    for i in range(1, numDiags):
+        prev = skewArea[i - 1]
+        fromRow = prev[:-1] + skewRowArea[i, 1:]  # [r-1][c] + area
+        fromCol = prev[1:] + skewColArea[i, 1:]   # [r][c-1] + area
+        useRow = fromRow < fromCol
+        skewFromRow[i, 1:] = useRow
+        skewArea[i, 1:] = numpy.where(useRow, fromRow, fromCol)
+
+    # Unskew
+
+    rr = r[:, numpy.newaxis]
+    cc = numpy.arange(n0)[numpy.newaxis, :]
+    minArea = skewArea[rr + cc, rr + 1]
+    minDir = numpy.where(skewFromRow[rr + cc, rr + 1], numpy.uint8(prevRow), numpy.uint8(prevCol))
+    minDir[0, 0] = 0
+
+    return minArea, minDir
@@ -0,0 +1,162 @@
+# Contour simplification before meshing
+#
+# The DP in mesher.py takes O(n0 n1) time for each pair of slices, so
+# halving the vertices of every slice quarters the meshing time.  Scan
+# contours have many more vertices than they need along straight and
+# gently curved stretches, so they can be thinned a lot without moving
+# the surface by much:
+#
+#   simplifyContour()   removes vertices with the Douglas-Peucker
+#                       algorithm, so that every removed vertex is
+#                       within 'tolerance' of the simplified contour.
+#                       Vertices stay where they are and in order.
+#
+#   resampleContour()   replaces the vertices with 'count' vertices
+#                       evenly spaced along the contour, starting at
+#                       vertex 0, so that all slices can be given the
+#                       same number of vertices.
+#
+# Both return the new contour and a bound on the error: the largest
+# distance from a vertex of the old contour to the new one.  Contours
+# are closed: the last vertex joins the first.
+
+
+import math
+
+
+# Distance from point p to the segment from a to b
+
+def segmentDistance( p, a, b ):
+
+    ux = b[0]-a[0]; uy = b[1]-a[1]; uz = b[2]-a[2]
+    vx = p[0]-a[0]; vy = p[1]-a[1]; vz = p[2]-a[2]
+
+    uu = ux*ux + uy*uy + uz*uz
+    t = (ux*vx + uy*vy + uz*vz) / uu if uu > 0 else 0.0
+    t = min( 1.0, max( 0.0, t ) )
+
+    dx = vx - t*ux; dy = vy - t*uy; dz = vz - t*uz
+
+    return math.sqrt( dx*dx + dy*dy + dz*dz )
+
+
+def simplifyContour( coords, tolerance ):
+
+    n = len(coords)
+
+    if n <= 3:
+        return list(coords), 0.0
+
+    # Start with three vertices far apart: vertex 0, the vertex
+    # farthest from it, and the vertex farthest from the line through
+    # those two.  Each of the three stretches between them is then
+    # simplified as an open chain.
+
+    p0 = coords[0]
+    far = max( range(n), key=lambda i: segmentDistance( coords[i], p0, p0 ) )
+    third = max( range(n), key=lambda i: segmentDistance( coords[i], p0, coords[far] ) )
+
+    keep = [ False ] * n
+    anchors = sorted( { 0, far, third } )
+    for i in anchors:
+        keep[i] = True
+
+    stack = [ (a, b) for a, b in zip( anchors, anchors[1:] + [n] ) ]  # index n is vertex 0 again
+    error = 0.0
+
+    while stack:
+
+        a, b = stack.pop()
+        pa = coords[a]
+        pb = coords[b % n]
+
+        worst = None
+        worstDist = 0.0
+        for i in range(a + 1, b):
+            d = segmentDistance( coords[i], pa, pb )
+            if d > worstDist:
+                worst = i
+                worstDist = d
+
+        if worstDist > tolerance:
+            keep[worst] = True
+            stack.append( (a, worst) )
+            stack.append( (worst, b) )
+        else:
+            error = max( error, worstDist )
+
+    return [ c for c, k in zip( coords, keep ) if k ], error
+
+
+# Distance along the contour to each vertex, and the total length
+
+def arcLengths( coords ):
+
+    n = len(coords)
+    lengths = [ 0.0 ]
+    for i in range(1, n + 1):
+        a = coords[i - 1]
+        b = coords[i % n]
+        lengths.append( lengths[-1] + math.sqrt( (b[0]-a[0])**2 + (b[1]-a[1])**2 + (b[2]-a[2])**2 ) )
+
+    return lengths[:-1], lengths[-1]
+
+
+def resampleContour( coords, count ):
+
+    n = len(coords)
+    s, total = arcLengths( coords )
+
+    if n < 3 or count < 3 or total == 0:
+        return list(coords), 0.0
+
+    step = total / count
+    resampled = []
+    i = 0
+    for k in range(count):
+        target = k * step
+        while i + 1 < n and s[i + 1] <= target:
+            i += 1
+        end = s[i + 1] if i + 1 < n else total
+        t = (target - s[i]) / (end - s[i]) if end > s[i] else 0.0
+        a = coords[i]
+        b = coords[(i + 1) % n]
+        resampled.append( [ a[0] + t*(b[0]-a[0]), a[1] + t*(b[1]-a[1]), a[2] + t*(b[2]-a[2]) ] )
+
+    # Each old vertex lies between the new vertices on either side of
+    # it along the contour, so its distance to the segment between them
+    # bounds its distance to the new contour.
+
+    error = 0.0
+    for i in range(n):
+        k = min( int( s[i] / step ), count - 1 )
+        error = max( error, segmentDistance( coords[i], resampled[k], resampled[(k + 1) % count] ) )
+
+    return resampled, error
+
+
+# Simplify every slice to 'tolerance' (if not None), then resample each
+# to 'count' vertices (if not None).  Returns the new slices and the
+# largest error of any of them.
+
+def prepareSlices( slices, tolerance=None, count=None ):
+
+    newSlices = []
+    maxError = 0.0
+
+    for coords in slices:
+
+        error = 0.0
+
+        if tolerance is not None:
+            coords, e = simplifyContour( coords, tolerance )
+            error += e
+
+        if count is not None:
+            coords, e = resampleContour( coords, count )
+            error += e  # distances add, at worst
+
+        newSlices.append( coords )
+        maxError = max( maxError, error )
+
+    return newSlices, maxError
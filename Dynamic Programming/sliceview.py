@@ -0,0 +1,743 @@
+# Window showing the slices and mesh of slices.py
+#
+# Keys: c - compute min-area triangulation (again to stop computing it)
+#       x - stop computing it
+#       s - toggle current slice
+#       < - current slice moves up
+#       > - current slice moves down
+#       v - toggle vertex labels
+#       e - toggle edge labels
+#       t - toggle triangle labels
+#       n - toggle smooth shading
+#       / - list the keys
+#
+# Dragging with the left button rotates the view, and dragging up and
+# down with the right button zooms.
+#
+# slices.py imports this only to open its window, since it imports
+# PyOpenGL and GLFW, and sets the settings below from its arguments
+# first.  This doesn't import slices.py, which may be running as
+# __main__.
+
+
+haveGlutForFonts = False  # Set to True if you have installed OpenGL GLUT so that text can be
+                          # drawn on the screen.  It's sometimes very difficult to install GLUT.
+                          # This is NOT necessary for the assignment, but can help with debugging.
+
+
+import sys, os, math, array
+
+sys.path.insert( 0, os.path.join( os.path.dirname( os.path.abspath( __file__ ) ), '..' ) )  # for the shared viewer package
+
+from viewer.gl import *
+from viewer.window import Window
+
+import diagnostics
+import lod
+from meshing import readSlices, buildTriangles, trianglesOfStrips, MeshJob
+from stack import SliceStack
+from vectors import add3, scalarMult3, cross3, normalize3, rotateVector3, triangleNormal3, triangleNormals, vertexNormals
+
+GLUT = importGLUT() if haveGlutForFonts else None
+
+
+# Globals
+
+windowWidth  = 800
+windowHeight = 800
+window       = None  # viewer.window.Window
+
+# The slices are kept in a SliceStack (see stack.py), top first, and a
+# vertex is its index there.  A triangle is a triple of such indices,
+# counterclockwise as seen from outside the object, and a triangle
+# strip is a list of them (see meshing.py).
+
+allSlices    = SliceStack()
+allTriangles = []    # index triples into 'allSlices'
+allStrips    = None  # with 'useStrips', the mesh as triangle strips
+
+showCurrentSlice = False
+labelVerts       = False
+labelEdges       = False
+labelTris        = False
+currentSlice     = 0
+smoothShading    = False  # shade with vertex normals rather than triangle normals
+useStrips        = False  # build and draw the mesh as triangle strips
+processes        = None   # worker processes for meshing all slices (default: one per CPU)
+
+
+meshJob = None  # the MeshJob making 'allTriangles', if any
+
+
+# Level of detail
+#
+# Given a .lod file (see lod.py), the viewer shows one level of its
+# pyramid at a time, as 'allSlices' and 'allTriangles'.  It starts with
+# the coarsest level, which is read and drawn at once, and then steps a
+# level at a time, reading each as it is first wanted, to the level
+# whose triangles are at most 'lodPixels' across at the current zoom.
+# Zooming out steps back to the coarser levels, which are kept.
+
+lodFile   = None  # LODFile being shown, if any
+lodLevel  = None  # index of its level being shown
+lodPixels = 12    # most pixels across a typical triangle
+
+
+def showLevel( k ):
+
+    global allSlices, allTriangles, allStrips, lodLevel, currentSlice
+
+    level = lodFile.level( k )
+
+    allSlices = level.stack
+    allTriangles = level.triangles
+    allStrips = None
+    lodLevel = k
+    currentSlice = min( currentSlice, len(allSlices) - 2 )
+
+
+# Step one level towards the one wanted at the current zoom.  Returns
+# whether the level changed.
+
+def refineLevel():
+
+    wanted = lodFile.levelFor( pixelsPerUnit(), lodPixels )
+
+    if wanted == lodLevel:
+        return False
+
+    showLevel( lodLevel - 1 if wanted < lodLevel else lodLevel + 1 )
+    return True
+
+
+# Set up the display and draw the current image
+
+
+fovy  = 6     # field-of-view
+fNear = 10    # near plane
+fFar  = 10000 # far plane
+
+eye    = [100,100,1000]
+lookat = [0,0,0]
+updir  = [0,1,0]
+
+rotationAngle = None
+rotationAxis  = None
+fovyDelta     = None
+
+lightPosition = None  # in eye coordinates, found once by viewerLight()
+
+
+def zoomedFovy():
+
+    return fovy + fovyDelta if fovyDelta is not None else fovy
+
+
+# Pixels on the screen per unit of distance at 'lookat'
+
+def pixelsPerUnit():
+
+    distance = math.sqrt( (eye[0]-lookat[0])**2 + (eye[1]-lookat[1])**2 + (eye[2]-lookat[2])**2 )
+
+    return windowHeight / (2 * distance * math.tan( math.radians( zoomedFovy() ) / 2 ))
+
+
+# Vertex buffers
+#
+# The mesh and the slice outlines are each kept in a vertex buffer
+# object and drawn with one glDrawArrays() call, rather than sent
+# vertex by vertex every frame.  A buffer is uploaded again only when
+# the list it was made from ('allTriangles' or 'allSlices') is
+# replaced or, while it is being meshed, grows.  Each level of a
+# level-of-detail pyramid has its own mesh buffer, so that switching
+# levels uploads nothing.
+
+outlineBuffer = None
+outlineSlices = None  # slice list in it
+outlineStarts = []    # index of the first vertex of each slice in it
+
+
+def uploadBuffer( buffer, data ):
+
+    if buffer is None:
+        buffer = glGenBuffers( 1 )
+
+    glBindBuffer( GL_ARRAY_BUFFER, buffer )
+    glBufferData( GL_ARRAY_BUFFER, len(data) * data.itemsize, data.tobytes(), GL_STATIC_DRAW )
+    glBindBuffer( GL_ARRAY_BUFFER, 0 )
+
+    return buffer
+
+
+# Draw vertices first..first+count-1 of 'buffer', which has vertices
+# in the interleaved 'format' (e.g. GL_N3F_V3F).  If 'first' and
+# 'count' are lists, each of their ranges is drawn, in one call.
+
+def drawBuffer( buffer, format, mode, first, count ):
+
+    glPushClientAttrib( GL_CLIENT_VERTEX_ARRAY_BIT )
+    glBindBuffer( GL_ARRAY_BUFFER, buffer )
+    glInterleavedArrays( format, 0, None )
+    if isinstance( first, list ):
+        glMultiDrawArrays( mode, first, count, len(first) )
+    else:
+        glDrawArrays( mode, first, count )
+    glBindBuffer( GL_ARRAY_BUFFER, 0 )
+    glPopClientAttrib()
+
+
+# The vertex buffer of a mesh
+#
+# draw() draws 'triangles' of the vertices of 'slices', each vertex
+# with its triangle's normal, or with 'smoothShading', with the
+# area-weighted average normal of the triangles around the vertex.
+#
+# If 'strips' of the same triangles are given, they are drawn instead.
+# Each strip vertex after the first two completes a triangle and is
+# given its normal.  With GL_FLAT shading, each triangle then gets the
+# normal of its last vertex, which is its own.
+#
+# While a MeshJob adds to the lists, only the new triangles (or
+# strips) are added to the buffer.  With smooth shading, the normals
+# of the vertices around them change too, so all are done again.
+
+class MeshBuffer(object):
+
+    def __init__( self ):
+
+        self.buffer    = None  # buffer ID
+        self.slices    = None  # slice stack of the triangles in it
+        self.triangles = None  # triangle list in it
+        self.smooth    = None  # whether it has smooth normals
+        self.data      = None  # what is in it
+        self.count     = 0     # number of triangles (or strips) in it
+        self.starts    = [0]   # index of the first vertex of each strip in it, and of the end
+
+    def draw( self, slices, triangles, strips=None ):
+
+        items = triangles if strips is None else strips
+
+        if slices is not self.slices or triangles is not self.triangles or smoothShading != self.smooth or (smoothShading and len(items) != self.count):
+            self.data = array.array( 'f' )
+            self.count = 0
+            self.starts = [0]
+            self.slices = slices
+            self.triangles = triangles
+            self.smooth = smoothShading
+
+        if len(items) > self.count:
+            self.append( slices, triangles, strips, self.count )
+            self.count = len(items)
+            self.buffer = uploadBuffer( self.buffer, self.data )
+
+        if self.count == 0:
+            return
+
+        if strips is None:
+            drawBuffer( self.buffer, GL_N3F_V3F, GL_TRIANGLES, 0, 3 * self.count )
+        else:
+            glShadeModel( GL_SMOOTH if smoothShading else GL_FLAT )
+            drawBuffer( self.buffer, GL_N3F_V3F, GL_TRIANGLE_STRIP, self.starts[:-1],
+                        [ b - a for a, b in zip( self.starts, self.starts[1:] ) ] )
+            glShadeModel( GL_SMOOTH )
+
+    # Add the vertices of triangles (or strips) first... to 'data'.
+    # With 'smoothShading', 'first' is 0.
+
+    def append( self, slices, triangles, strips, first ):
+
+        data = self.data
+        xs, ys, zs = slices.coordLists()
+
+        if smoothShading:
+            norms = vertexNormals( xs, ys, zs, triangles )
+
+        if strips is not None:
+            for strip in strips[first:]:
+                for k, i in enumerate(strip):
+                    if smoothShading:
+                        data.extend( norms[i] )
+                    elif k < 2:
+                        data.extend( (0.0, 0.0, 0.0) )
+                    else:
+                        a, b = strip[k-2], strip[k-1]
+                        if k % 2 == 1:
+                            a, b = b, a
+                        data.extend( triangleNormal3( xs[a], ys[a], zs[a], xs[b], ys[b], zs[b], xs[i], ys[i], zs[i] ) )
+                    data.extend( (xs[i], ys[i], zs[i]) )
+                self.starts.append( len(data) // 6 )
+        elif smoothShading:
+            for t in triangles:
+                for i in t:
+                    data.extend( norms[i] )
+                    data.extend( (xs[i], ys[i], zs[i]) )
+        else:
+            triangles = triangles[first:]
+            for t, norm in zip( triangles, triangleNormals( xs, ys, zs, triangles ) ):
+                for i in t:
+                    data.extend( norm )
+                    data.extend( (xs[i], ys[i], zs[i]) )
+
+
+meshBuffer   = MeshBuffer()  # for 'allTriangles'
+levelBuffers = {}            # level -> MeshBuffer, for the levels of 'lodFile'
+
+
+# Draw the outlines of slices first..last of 'slices'
+
+def drawOutlines( slices, first, last ):
+
+    global outlineBuffer, outlineSlices, outlineStarts
+
+    if slices is not outlineSlices:
+        data = array.array( 'f' )
+        outlineStarts = []
+        for s in range(len(slices)):
+            outlineStarts.append( len(data) // 6 )
+            appendOutline( slices, s, data )
+        outlineStarts.append( len(data) // 6 )
+        outlineBuffer = uploadBuffer( outlineBuffer, data )
+        outlineSlices = slices
+
+    drawBuffer( outlineBuffer, GL_C3F_V3F, GL_LINES, outlineStarts[first], outlineStarts[last+1] - outlineStarts[first] )
+
+
+# Append the edges of slice s to 'data', as GL_LINES vertices in
+# GL_C3F_V3F format.
+#
+# Segments fade from dark (0,0,0) at tail to light (1,1,1) at head so
+# that direction can been seen.
+
+def appendOutline( slices, s, data ):
+
+    for i in range( *slices.vertexRange( s ) ):
+        data.extend( (0,0,0) )
+        data.extend( slices.point( i ) )
+        data.extend( (1,1,1) )
+        data.extend( slices.point( slices.nextVertex( i ) ) )
+
+
+# The light is above and right of the viewer.  The eye and up vectors
+# are always rotated together, so the light is fixed in eye
+# coordinates.  Returns its position there, for setting before the
+# view transform.
+
+def viewerLight():
+
+    ex, ey, ez = normalize3( eye[0], eye[1], eye[2] )
+    ux, uy, uz = normalize3( updir[0], updir[1], updir[2] )
+    rx, ry, rz = normalize3( *cross3( updir[0], updir[1], updir[2], eye[0], eye[1], eye[2] ) )
+
+    lx, ly, lz = add3( 5*ex, 5*ey, 5*ez, ux+rx, uy+ry, uz+rz )
+
+    # Axes of eye coordinates, as gluLookAt() finds them
+
+    fx, fy, fz = normalize3( lookat[0]-eye[0], lookat[1]-eye[1], lookat[2]-eye[2] )
+    sx, sy, sz = normalize3( *cross3( fx, fy, fz, updir[0], updir[1], updir[2] ) )
+    vx, vy, vz = cross3( sx, sy, sz, fx, fy, fz )
+
+    return ( lx*sx + ly*sy + lz*sz, lx*vx + ly*vy + lz*vz, -(lx*fx + ly*fy + lz*fz), 0.0 )
+
+
+def display( wait=False ):
+
+    global lightPosition
+
+    # Handle any events that have occurred
+
+    glfw.poll_events()
+
+    # Set up window
+
+    glClearColor( 1,1,1,0 )
+    glClear( GL_COLOR_BUFFER_BIT | GL_DEPTH_BUFFER_BIT );
+    glEnable( GL_DEPTH_TEST )
+    glPolygonMode( GL_FRONT_AND_BACK, GL_FILL )
+
+    # Apply zoom to fovy
+
+    glMatrixMode( GL_PROJECTION )
+    glLoadIdentity()
+
+    gluPerspective( zoomedFovy(), float(windowWidth) / float(windowHeight), fNear, fFar );
+
+    # Apply rotation to eye position
+
+    if rotationAngle is None:
+        rotatedEye = eye
+        rotatedUp  = updir
+    else:
+        rotatedEye = rotateVector3( eye[0],   eye[1],   eye[2],   rotationAngle, rotationAxis )
+        rotatedUp  = rotateVector3( updir[0], updir[1], updir[2], rotationAngle, rotationAxis )
+
+    glMatrixMode( GL_MODELVIEW )
+    glLoadIdentity()
+
+    if lightPosition is None:
+        lightPosition = viewerLight()
+
+    glLightfv( GL_LIGHT0, GL_POSITION, lightPosition )
+
+    gluLookAt( rotatedEye[0], rotatedEye[1], rotatedEye[2],
+	       lookat[0],     lookat[1],     lookat[2],
+	       rotatedUp[0],  rotatedUp[1],  rotatedUp[2] );
+
+    # Draw slices
+
+    if showCurrentSlice:
+        firstSlice, lastSlice = currentSlice, currentSlice+1
+    else:
+        firstSlice, lastSlice = 0, len(allSlices)-1
+
+    firstVertex = allSlices.vertexRange( firstSlice )[0]
+    lastVertex = allSlices.vertexRange( lastSlice )[1]
+
+    if allTriangles == []:
+        drawOutlines( allSlices, firstSlice, lastSlice ) # draws the EDGES of each slice
+
+    # Set up lighting for triangles (the light's position was set above)
+
+    glLightfv( GL_LIGHT0, GL_AMBIENT,  [ 0.2, 0.2, 0.2, 0.0 ] )
+    glLightfv( GL_LIGHT0, GL_DIFFUSE,  [ 1.0, 1.0, 1.0, 0.0 ] )
+    glLightfv( GL_LIGHT0, GL_SPECULAR, [ 1.0, 1.0, 1.0, 0.0 ] )
+
+    glEnable( GL_LIGHT0 )
+
+    glLightModeli( GL_LIGHT_MODEL_TWO_SIDE, GL_TRUE )
+
+    # Draw triangles
+
+    glEnable( GL_LIGHTING )
+
+    if allTriangles:
+        buffer = meshBuffer if lodLevel is None else levelBuffers.setdefault( lodLevel, MeshBuffer() )
+        buffer.draw( allSlices, allTriangles, allStrips )
+
+    glDisable( GL_LIGHTING )
+
+    # Draw axes (x=red, y=green, z=blue)
+
+    glLineWidth( 3.0 )
+    glBegin( GL_LINES )
+
+    l = 10 # axis length
+
+    glColor3fv( [1,0,0] )  # x
+    glVertex3fv( [0,0,0] )
+    glVertex3fv( [l,0,0] )
+
+    glColor3fv( [0,1,0] )  # y
+    glVertex3fv( [0,0,0] )
+    glVertex3fv( [0,l,0] )
+
+    glColor3fv( [0,0,1] )  # z
+    glVertex3fv( [0,0,0] )
+    glVertex3fv( [0,0,l] )
+
+    glEnd()
+    glLineWidth( 1.0 )
+
+    # Draw labels
+
+    glDisable( GL_DEPTH_TEST )
+
+    if labelVerts:
+        glColor3f(0,0,0)
+        for i in range(firstVertex, lastVertex):
+            drawText( allSlices.point( i ), 'v%d' % i )
+    
+    if labelEdges:
+        glColor3f(0,0,0)
+        for i in range(firstVertex, lastVertex):
+            j = allSlices.nextVertex( i )
+            a, b = allSlices.point( i ), allSlices.point( j )
+            drawText( scalarMult3( 0.5, *add3( a[0], a[1], a[2], b[0], b[1], b[2] ) ), 'v%d-v%d' % (i, j) )
+    
+    if labelTris:
+        glColor3f(0,0,0)
+        for k, t in enumerate(allTriangles):
+            a, b, c = allSlices.point( t[0] ), allSlices.point( t[1] ), allSlices.point( t[2] )
+            drawText( scalarMult3( 0.3333, a[0]+(b[0]+c[0]), a[1]+(b[1]+c[1]), a[2]+(b[2]+c[2]) ), 't%d' % k )
+    
+    # Show window
+
+    glfw.swap_buffers( window.handle )
+
+    
+
+def drawText( coords, text ):
+
+    if haveGlutForFonts:
+        glRasterPos3fv( coords )
+        for ch in text:
+            GLUT.glutBitmapCharacter( GLUT.GLUT_BITMAP_8_BY_13, ord(ch) )
+
+
+
+# Handle keyboard input
+
+def keyCallback( window, key, scancode, action, mods ):
+
+    global currentSlice, showCurrentSlice, allTriangles, allStrips, labelVerts, labelEdges, labelTris, smoothShading, meshJob, lodFile, lodLevel
+    
+    if action == glfw.PRESS:
+    
+        if key == glfw.KEY_ESCAPE: # quit upon ESC
+            sys.exit(0)
+
+        elif key == ord('C') and meshJob is not None and not meshJob.done: # stop meshing
+            meshJob.cancel()
+
+        elif key == ord('C'): # compute min-area triangulation
+
+            if lodFile is not None:
+                lodFile.close()
+                lodFile = None  # of the level shown, which stays
+                lodLevel = None
+
+            if meshJob is not None:
+                meshJob.cancel()
+                meshJob = None
+
+            if not showCurrentSlice:  # mesh all slices in the background
+                meshJob = MeshJob( allSlices, useStrips, processes, glfw.post_empty_event )
+                allTriangles = []
+                allStrips = [] if useStrips else None
+            elif useStrips:
+                allStrips = buildTriangles( allSlices, currentSlice, strips=True )
+                allTriangles = trianglesOfStrips( allStrips )
+            else:
+                allTriangles = buildTriangles( allSlices, currentSlice )
+
+        elif key == ord('X'): # stop meshing
+            if meshJob is not None:
+                meshJob.cancel()
+            
+        elif key == ord('S'): # show current slice
+            showCurrentSlice = not showCurrentSlice
+
+        elif key == ord(','): # current slice moves up
+            if currentSlice > 0:
+                currentSlice -= 1
+            
+        elif key == ord('.'): # current slice moves down
+            if currentSlice < len(allSlices)-2:
+                currentSlice += 1
+
+        elif key == ord('V'): # toggle vertex labels
+            labelVerts = not labelVerts
+
+        elif key == ord('E'): # toggle edge labels
+            labelEdges = not labelEdges
+
+        elif key == ord('T'): # toggle triangle labels
+            labelTris = not labelTris
+
+        elif key == ord('N'): # toggle smooth shading
+            smoothShading = not smoothShading
+
+        elif key == ord('/'):
+
+            print( 'keys: c - compute min-area triangulation (again to stop computing it)' )
+            print( '      x - stop computing it' )
+            print( '      s - toggle current slice' )
+            print( '      < - current slice moves up' )
+            print( '      > - current slice moves down' )
+            print( '      v - toggle vertex labels' )
+            print( '      e - toggle edge labels' )
+            print( '      t - toggle triangle labels' )
+            print( '      n - toggle smooth shading' )
+            print( '' )
+            print( 'mouse: drag left button          - rotate' )
+            print( '       drag right button up/down - zoom' )
+
+
+
+# Handle window reshape
+
+def windowReshapeCallback( window, newWidth, newHeight ):
+
+    global windowWidth, windowHeight
+
+    windowWidth  = newWidth
+    windowHeight = newHeight
+
+
+
+# Handle mouse click/release
+
+initX  = 0
+initY  = 0
+button = None
+
+def mouseButtonCallback( window, btn, action, keyModifiers ):
+
+    global button, initX, initY, eye, updir, fovy, rotationAngle, rotationAxis, fovyDelta
+
+    if action == glfw.PRESS:
+
+        button = btn
+        initX, initY = glfw.get_cursor_pos( window ) # store mouse position
+
+        rotationAngle = 0
+        rotationAxis  = [1,0,0]
+
+    elif action == glfw.RELEASE:
+
+        if rotationAngle is not None:
+            eye   = rotateVector3( eye[0], eye[1], eye[2], rotationAngle, rotationAxis )
+            updir = rotateVector3( updir[0], updir[1], updir[2], rotationAngle, rotationAxis )
+
+        if fovyDelta is not None:
+            fovy = fovy + fovyDelta
+
+        button        = None
+        rotationAngle = None
+        fovyDelta     = None
+
+    
+
+# Handle mouse motion.  We don't want to transform the image and
+# redraw with each tiny mouse movement.  Instead, just record the fact
+# that the mouse moved.  After events are processed in
+# glfw.wait_events(), check whether the mouse moved and, if so, act on
+# it.
+
+
+mousePositionChanged = False
+
+def mouseMovementCallback( window, x, y ):
+
+  global mousePositionChanged
+
+  if button is not None: # button is held down
+      mousePositionChanged = True
+
+
+
+def actOnMouseMovement( window, button, x, y ):
+
+    global currentImage, rotationAngle, rotationAxis, fovyDelta
+
+    if button == glfw.MOUSE_BUTTON_LEFT:
+
+        # rotate viewpoint
+
+        # Get initial vector from (0,0,0) to mouse
+      
+        x0 =   (initX - float(windowWidth)/2.0)  / (float(windowWidth)/2.0)
+        y0 = - (initY - float(windowHeight)/2.0) / (float(windowHeight)/2.0)
+
+        dSquared = x0*x0 + y0*y0
+        if dSquared > 1:
+            d = math.sqrt(dSquared)
+            x0 /= d
+            y0 /= d
+            dSquared = 1
+
+        z0 = math.sqrt( 1 - dSquared )
+
+        # Get current vector from (0,0,0) to mouse
+        
+        x1 =   (x - float(windowWidth)/2.0)  / (float(windowWidth)/2.0)
+        y1 = - (y - float(windowHeight)/2.0) / (float(windowHeight)/2.0)
+
+        dSquared = x1*x1 + y1*y1
+        if dSquared > 1:
+            d = math.sqrt(dSquared)
+            x1 /= d
+            y1 /= d
+            dSquared = 1
+
+        z1 = math.sqrt( 1 - dSquared )
+
+        # Find rotation angle and axis (in coordinate system aligned with window x and y)
+
+        angleCos = x0*x1 + y0*y1 + z0*z1
+
+        if angleCos > 1:
+            angleCos = 1
+        elif angleCos < -1:
+            angleCos = -1
+
+        rotationAngle = math.acos( angleCos )
+
+        if abs(rotationAngle) < 0.0001:
+            rotationAngle = 0
+            rotationAxis = [ 1,0,0 ]
+        else:
+            ax, ay, az = cross3( x0, y0, z0, x1, y1, z1 )
+            d = math.sqrt( ax*ax + ay*ay + az*az )
+            rotationAxis = [ ax/d, ay/d, az/d ]
+
+        # Move rotation axis into world coordinate system
+
+        eyeZ = normalize3( eye[0]-lookat[0], eye[1]-lookat[1], eye[2]-lookat[2] )
+        eyeX = normalize3( *cross3( eyeZ[0], eyeZ[1], eyeZ[2], updir[0], updir[1], updir[2] ) )
+        eyeY = normalize3( *cross3( eyeZ[0], eyeZ[1], eyeZ[2], eyeX[0], eyeX[1], eyeX[2] ) )
+
+        rotationAxis = [ rotationAxis[0] * eyeX[0] + rotationAxis[1] * eyeY[0] + rotationAxis[2] * eyeZ[0],
+                         rotationAxis[0] * eyeX[1] + rotationAxis[1] * eyeY[1] + rotationAxis[2] * eyeZ[1],
+                         rotationAxis[0] * eyeX[2] + rotationAxis[1] * eyeY[2] + rotationAxis[2] * eyeZ[2] ]
+
+    elif button == glfw.MOUSE_BUTTON_RIGHT:
+
+        # zoom viewpoint
+
+        fovyDelta = (initY - y) / float(windowHeight) * fovy
+
+
+
+# Open the window and show the slices in 'filename', or the levels of
+# the .lod file 'filename', until the window is closed
+
+def show( filename ):
+
+    global window, allSlices, mousePositionChanged, lodFile
+
+    window = Window( "3D Meshing", windowWidth, windowHeight, keyCallback, mouseButtonCallback, mouseMovementCallback, windowReshapeCallback )
+
+    if haveGlutForFonts:
+        GLUT.glutInit()
+
+    # Read the triangles.
+
+    if filename.endswith( '.lod' ):
+        lodFile = lod.LODFile( filename )
+        showLevel( len(lodFile) - 1 )
+        diagnostics.message( 1, 'Read level %d of %d' % (lodLevel, len(lodFile)) )
+    else:
+        with open( filename, 'rb' ) as f:
+            allSlices = readSlices( f )
+        diagnostics.message( 1, 'Read %d slices' % len(allSlices) )
+
+    if len(allSlices) < 2:
+        return
+
+    # Main event loop
+
+    display( window )
+
+    while not glfw.window_should_close( window.handle ):
+
+        glfw.wait_events()
+
+        if mousePositionChanged:
+          currentX, currentY = glfw.get_cursor_pos( window.handle )
+          actOnMouseMovement( window.handle, button, currentX, currentY )
+          mousePositionChanged = False
+
+        if meshJob is not None and meshJob.collect( allTriangles, allStrips ):
+            glfw.set_window_title( window.handle, '3D Meshing' if meshJob.done else
+                                   '3D Meshing (%d of %d pairs)' % (meshJob.numDone, meshJob.numPairs) )
+
+        if lodFile is not None and refineLevel():
+            glfw.set_window_title( window.handle, '3D Meshing (level %d of %d)' % (lodLevel, len(lodFile)) )
+            glfw.post_empty_event()  # come back for the next level
+          
+        display( window )
+
+    if lodFile is not None:
+        lodFile.close()
+
+    window.close()
@@ -0,0 +1,130 @@
+# Compact storage of a stack of slices
+#
+# A SliceStack keeps all the vertices of all the slices in one array of
+# doubles, x, y, z for each vertex in turn, slice by slice and, within
+# a slice, contour by contour.  A vertex is just its index in the
+# stack, and a slice or contour is a range of indices:
+#
+#   contourStarts[k]   index of the first vertex of contour k, and at
+#                      the end, the number of vertices
+#   sliceStarts[s]     index of the first contour of slice s, and at
+#                      the end, the number of contours
+#
+# The next vertex around a contour is the next index, except at the end
+# of the contour, where it is the contour's first vertex.  Slices are
+# kept top first, as mesher.triangulateAll() takes them, so the
+# triangles between slices s and s+1 are index triples into the stack
+# once vertexRange(s)[0] is added to them.
+#
+# A vertex takes 24 bytes, rather than a Vertex object with a list of
+# coordinates, and the stack can be sent to a worker process as three
+# arrays.
+
+
+import array, bisect
+
+
+class SliceStack:
+
+    def __init__( self ):
+
+        self.coords = array.array( 'd' )
+        self.contourStarts = array.array( 'i', [0] )
+        self.sliceStarts = array.array( 'i', [0] )
+
+    # A stack of 'slices', each a list of contours, each a list of
+    # [x,y,z], top first
+
+    @classmethod
+    def fromContours( cls, slices ):
+
+        stack = cls()
+        for slice in slices:
+            stack.append( slice )
+        return stack
+
+    # A stack of the given arrays (see the top), e.g. as read from a
+    # file
+
+    @classmethod
+    def fromArrays( cls, coords, contourStarts, sliceStarts ):
+
+        stack = cls()
+        stack.coords = coords
+        stack.contourStarts = contourStarts
+        stack.sliceStarts = sliceStarts
+        return stack
+
+    def __len__( self ):
+
+        return len(self.sliceStarts) - 1
+
+    def __repr__( self ):
+
+        return 'SliceStack(%d slices, %d contours, %d vertices)' % (len(self), len(self.contourStarts) - 1, self.numVertices())
+
+    # Add a slice at the bottom
+
+    def append( self, contours ):
+
+        for c in contours:
+            for v in c:
+                self.coords.extend( v[:3] )
+            self.contourStarts.append( len(self.coords) // 3 )
+        self.sliceStarts.append( len(self.contourStarts) - 1 )
+
+    def numVertices( self ):
+
+        return len(self.coords) // 3
+
+    # First and last+1 vertex of slice s
+
+    def vertexRange( self, s ):
+
+        return self.contourStarts[self.sliceStarts[s]], self.contourStarts[self.sliceStarts[s+1]]
+
+    # (first, last+1) vertex of each contour of slice s
+
+    def contourRanges( self, s ):
+
+        starts = self.contourStarts[self.sliceStarts[s]:self.sliceStarts[s+1]+1]
+
+        return list( zip( starts, starts[1:] ) )
+
+    def point( self, i ):
+
+        return self.coords[3*i:3*i+3].tolist()
+
+    def nextVertex( self, i ):
+
+        k = bisect.bisect_right( self.contourStarts, i ) - 1
+        return i + 1 if i + 1 < self.contourStarts[k+1] else self.contourStarts[k]
+
+    # Slice s as a list of contours of [x,y,z], as mesher.py takes it
+
+    def contours( self, s ):
+
+        c = self.coords
+        return [ [ c[3*i:3*i+3].tolist() for i in range(a, b) ] for a, b in self.contourRanges( s ) ]
+
+    # Slice s as mesher.packSlice() makes it: its coordinates and its
+    # contour lengths
+
+    def packSlice( self, s ):
+
+        first, last = self.vertexRange( s )
+
+        return self.coords[3*first:3*last], array.array( 'i', [ b - a for a, b in self.contourRanges( s ) ] )
+
+    # All the x, y and z coordinates, as three lists
+
+    def coordLists( self ):
+
+        return self.coords[0::3].tolist(), self.coords[1::3].tolist(), self.coords[2::3].tolist()
+
+    # All the vertices as a list of [x,y,z]
+
+    def points( self ):
+
+        c = self.coords
+        return [ c[k:k+3].tolist() for k in range(0, len(c), 3) ]
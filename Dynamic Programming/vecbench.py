@@ -0,0 +1,173 @@
+# Micro-benchmark of the vector layers in vectors.py
+#
+# Usage: python vecbench.py [-n count] [-repeat n]
+#
+#   -n        number of random triangles (default 100000)
+#   -repeat   number of timed runs of each version; the fastest is kept (default 3)
+#
+# Times the ways that slices.py and mesher.py can compute
+# triangle areas and normals, for the same random triangles:
+#
+#   list     triangleArea(), normalize(crossProduct(subtract(),...))
+#   scalar   triangleArea3(), triangleNormal3()
+#   batch    triangleAreas(), triangleNormals()
+#   numpy    npdp.triangleAreas(), if NumPy is installed
+#
+# and the step areas of a DP table between two random slices of
+# sqrt(count) vertices each, as the DP used to compute them (list:
+# triangleArea() per entry) and as costs.AreaCost computes them a row
+# at a time from cached pair vectors (batch).
+#
+# Every version is checked to give exactly the same numbers.
+
+
+import sys, time, random
+
+import npdp
+import costs
+from vectors import subtract, crossProduct, normalize, triangleArea
+from vectors import triangleArea3, triangleNormal3, triangleAreas, triangleNormals
+
+
+def listAreas( points, triples ):
+
+    return [ triangleArea( points[i], points[j], points[k] ) for i, j, k in triples ]
+
+
+def listNormals( points, triples ):
+
+    return [ normalize( crossProduct( subtract( points[j], points[i] ), subtract( points[k], points[i] ) ) )
+             for i, j, k in triples ]
+
+
+def scalarAreas( points, triples ):
+
+    areas = []
+    for i, j, k in triples:
+        a = points[i]; b = points[j]; c = points[k]
+        areas.append( triangleArea3( a[0], a[1], a[2], b[0], b[1], b[2], c[0], c[1], c[2] ) )
+    return areas
+
+
+def scalarNormals( points, triples ):
+
+    normals = []
+    for i, j, k in triples:
+        a = points[i]; b = points[j]; c = points[k]
+        normals.append( triangleNormal3( a[0], a[1], a[2], b[0], b[1], b[2], c[0], c[1], c[2] ) )
+    return normals
+
+
+def batchAreas( points, triples ):
+
+    return triangleAreas( [ p[0] for p in points ], [ p[1] for p in points ], [ p[2] for p in points ], triples )
+
+
+def batchNormals( points, triples ):
+
+    return triangleNormals( [ p[0] for p in points ], [ p[1] for p in points ], [ p[2] for p in points ], triples )
+
+
+def numpyAreas( points, triples ):
+
+    p = npdp.numpy.asarray( points )
+    t = npdp.numpy.asarray( triples )
+    return npdp.triangleAreas( p[t[:,0]], p[t[:,1]], p[t[:,2]] ).tolist()
+
+
+# Step areas of a DP table, for 'verts0' and 'verts1' as the first and
+# second halves of 'points' ('triples' is unused)
+
+def listSteps( points, triples ):
+
+    verts0 = points[:len(points) // 2]
+    verts1 = points[len(points) // 2:]
+    steps = []
+    for r in range(len(verts1)):
+        for c in range(len(verts0)):
+            if r > 0:
+                steps.append( triangleArea( verts0[c], verts1[r - 1], verts1[r] ) )
+            if c > 0:
+                steps.append( triangleArea( verts1[r], verts0[c - 1], verts0[c] ) )
+    return steps
+
+
+def batchSteps( points, triples ):
+
+    cost = costs.AreaCost( points[:len(points) // 2], points[len(points) // 2:] )
+    steps = []
+    for r in range(cost.geom.n1):
+        rowCosts, colCosts = cost.steps( r )
+        for c in range(cost.geom.n0):
+            if r > 0:
+                steps.append( rowCosts[c] )
+            if c > 0:
+                steps.append( colCosts[c] )
+    return steps
+
+
+def best( f, repeat, *args ):
+
+    fastest = None
+    for i in range(repeat):
+        start = time.perf_counter()
+        result = f( *args )
+        elapsed = time.perf_counter() - start
+        if fastest is None or elapsed < fastest:
+            fastest = elapsed
+    return fastest, result
+
+
+def main():
+
+    count = 100000
+    repeat = 3
+
+    args = sys.argv[1:]
+    while len(args) > 1:
+        if args[0] == '-n':
+            count = int(args[1])
+        elif args[0] == '-repeat':
+            repeat = int(args[1])
+        args = args[2:]
+
+    if args:
+        print( 'Usage: %s [-n count] [-repeat n]' % sys.argv[0] )
+        sys.exit(1)
+
+    random.seed( 0 )
+    points = [ [ random.uniform(-100, 100) for i in range(3) ] for j in range(count) ]
+    triples = [ ( random.randrange(count), random.randrange(count), random.randrange(count) ) for j in range(count) ]
+
+    versions = [ ( 'area',   'list',   listAreas ),
+                 ( 'area',   'scalar', scalarAreas ),
+                 ( 'area',   'batch',  batchAreas ) ]
+    if npdp.numpy is not None:
+        versions.append( ( 'area', 'numpy', numpyAreas ) )
+    versions += [ ( 'normal', 'list',   listNormals ),
+                  ( 'normal', 'scalar', scalarNormals ),
+                  ( 'normal', 'batch',  batchNormals ) ]
+
+    n = int( count ** 0.5 )
+    sliceVerts = [ [ random.uniform(-100, 100), random.uniform(-100, 100), 0.0 ] for j in range(n) ] + \
+                 [ [ random.uniform(-100, 100), random.uniform(-100, 100), 1.0 ] for j in range(n) ]
+
+    versions += [ ( 'dp',     'list',   listSteps ),
+                  ( 'dp',     'batch',  batchSteps ) ]
+
+    print( '%d triangles, %dx%d DP table, fastest of %d runs' % (count, n, n, repeat) )
+    print( '%-8s %-8s %10s %8s  %s' % ('what', 'version', 'seconds', 'speedup', 'same') )
+
+    reference = {}
+    for what, version, f in versions:
+        elapsed, result = best( f, repeat, sliceVerts if what == 'dp' else points, triples )
+        result = [ tuple(r) if isinstance(r, list) else r for r in result ]
+        if what not in reference:
+            reference[what] = ( elapsed, result )
+        baseTime, baseResult = reference[what]
+        print( '%-8s %-8s %10.4f %7.2fx  %s' % (what, version, elapsed, baseTime / elapsed, result == baseResult) )
+
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,254 @@
+# Vector functions for the slice mesher
+#
+# There are three layers:
+#
+#   add(), subtract(), ...   take and return [x,y,z] lists.  They are
+#                            convenient, but allocate a list for every
+#                            result, even intermediate ones.
+#
+#   add3(), cross3(), ...    the scalar layer: take unpacked floats and
+#                            return a float or an (x,y,z) tuple, with
+#                            no intermediate vectors at all.
+#
+#   crossProducts(), ...     the batch layer: take many vectors at once
+#                            as separate lists of x, y and z components,
+#                            and return lists.  (npdp.py has NumPy
+#                            equivalents of some.)
+#
+# The results of all three are bit for bit the same.  For example,
+# triangleArea3() and triangleAreas() give exactly what triangleArea()
+# gives.  See vecbench.py for their speeds.
+
+
+import math
+
+
+def add( v0, v1 ):
+
+    return [ v0[0]+v1[0], v0[1]+v1[1], v0[2]+v1[2] ]
+
+
+def subtract( v0, v1 ):
+
+    return [ v0[0]-v1[0], v0[1]-v1[1], v0[2]-v1[2] ]
+
+
+def scalarMult( k, v ):
+
+    return [ k*v[0], k*v[1], k*v[2] ]
+
+              
+def dotProduct( v0, v1 ):
+
+    return v0[0]*v1[0] + v0[1]*v1[1] + v0[2]*v1[2]
+
+
+def crossProduct( v0, v1 ):
+
+    return [ v0[1]*v1[2] - v0[2]*v1[1], v0[2]*v1[0] - v0[0]*v1[2], v0[0]*v1[1] - v0[1]*v1[0] ]
+
+
+def length( v ):
+
+    return math.sqrt( v[0]*v[0] + v[1]*v[1] + v[2]*v[2] )
+
+
+def normalize( v ):
+
+    d = length( v )
+
+    if d > 0.0001:
+        return [ v[0]/d, v[1]/d, v[2]/d ]
+    else:
+        return v
+
+
+def triangleArea( v0, v1, v2 ):
+
+    return 0.5 * length( crossProduct( subtract( v1, v0 ), subtract( v2, v0 ) ) )
+
+
+def rotateVector( v, angle, axis ): # rotate v by angle about axis (axis must be unit length)
+
+    cosAngle = math.cos(angle)
+    sinAngle = math.sin(angle)
+
+    cross = crossProduct( axis, v )
+    dot   = dotProduct( axis, v ) * (1 - cosAngle)
+
+
+    return [ v[0] * cosAngle + cross[0] * sinAngle + axis[0] * dot,
+             v[1] * cosAngle + cross[1] * sinAngle + axis[1] * dot,
+             v[2] * cosAngle + cross[2] * sinAngle + axis[2] * dot ]
+
+
+
+# Scalar layer
+
+def add3( ax, ay, az, bx, by, bz ):
+
+    return ( ax+bx, ay+by, az+bz )
+
+
+def subtract3( ax, ay, az, bx, by, bz ):
+
+    return ( ax-bx, ay-by, az-bz )
+
+
+def scalarMult3( k, x, y, z ):
+
+    return ( k*x, k*y, k*z )
+
+
+def dot3( ax, ay, az, bx, by, bz ):
+
+    return ax*bx + ay*by + az*bz
+
+
+def cross3( ax, ay, az, bx, by, bz ):
+
+    return ( ay*bz - az*by, az*bx - ax*bz, ax*by - ay*bx )
+
+
+def length3( x, y, z ):
+
+    return math.sqrt( x*x + y*y + z*z )
+
+
+def normalize3( x, y, z ):
+
+    d = math.sqrt( x*x + y*y + z*z )
+
+    if d > 0.0001:
+        return ( x/d, y/d, z/d )
+    else:
+        return ( x, y, z )
+
+
+# Area of the triangle (a,b,c)
+
+def triangleArea3( ax, ay, az, bx, by, bz, cx, cy, cz ):
+
+    ux = bx-ax; uy = by-ay; uz = bz-az
+    vx = cx-ax; vy = cy-ay; vz = cz-az
+
+    x = uy*vz - uz*vy
+    y = uz*vx - ux*vz
+    z = ux*vy - uy*vx
+
+    return 0.5 * math.sqrt( x*x + y*y + z*z )
+
+
+# Unit normal of the triangle (a,b,c), counterclockwise, as normalize()
+# would give it
+
+def triangleNormal3( ax, ay, az, bx, by, bz, cx, cy, cz ):
+
+    ux = bx-ax; uy = by-ay; uz = bz-az
+    vx = cx-ax; vy = cy-ay; vz = cz-az
+
+    return normalize3( uy*vz - uz*vy, uz*vx - ux*vz, ux*vy - uy*vx )
+
+
+def rotateVector3( x, y, z, angle, axis ): # rotate (x,y,z) by angle about axis (axis must be unit length)
+
+    cosAngle = math.cos(angle)
+    sinAngle = math.sin(angle)
+
+    kx, ky, kz = axis
+
+    crossX = ky*z - kz*y
+    crossY = kz*x - kx*z
+    crossZ = kx*y - ky*x
+    dot    = (kx*x + ky*y + kz*z) * (1 - cosAngle)
+
+    return ( x * cosAngle + crossX * sinAngle + kx * dot,
+             y * cosAngle + crossY * sinAngle + ky * dot,
+             z * cosAngle + crossZ * sinAngle + kz * dot )
+
+
+
+# Batch layer
+
+# Cross products a[i] x b[i]
+
+def crossProducts( ax, ay, az, bx, by, bz ):
+
+    xs = [ y0 * z1 - z0 * y1 for y0, z0, y1, z1 in zip( ay, az, by, bz ) ]
+    ys = [ z0 * x1 - x0 * z1 for x0, z0, x1, z1 in zip( ax, az, bx, bz ) ]
+    zs = [ x0 * y1 - y0 * x1 for x0, y0, x1, y1 in zip( ax, ay, bx, by ) ]
+
+    return xs, ys, zs
+
+
+def lengths( xs, ys, zs ):
+
+    sqrt = math.sqrt
+    return [ sqrt( x*x + y*y + z*z ) for x, y, z in zip( xs, ys, zs ) ]
+
+
+# Areas of triangles (verts[i], verts[j], verts[k]) for each index
+# triple (i,j,k) in 'triples', where 'xs', 'ys' and 'zs' are the
+# components of 'verts'
+
+def triangleAreas( xs, ys, zs, triples ):
+
+    sqrt = math.sqrt
+    areas = []
+    for i, j, k in triples:
+        ax = xs[i]; ay = ys[i]; az = zs[i]
+        ux = xs[j]-ax; uy = ys[j]-ay; uz = zs[j]-az
+        vx = xs[k]-ax; vy = ys[k]-ay; vz = zs[k]-az
+        x = uy*vz - uz*vy
+        y = uz*vx - ux*vz
+        z = ux*vy - uy*vx
+        areas.append( 0.5 * sqrt( x*x + y*y + z*z ) )
+    return areas
+
+
+# Unit normals, as tuples, of the triangles given as in triangleAreas()
+
+def triangleNormals( xs, ys, zs, triples ):
+
+    sqrt = math.sqrt
+    normals = []
+    for i, j, k in triples:
+        ax = xs[i]; ay = ys[i]; az = zs[i]
+        ux = xs[j]-ax; uy = ys[j]-ay; uz = zs[j]-az
+        vx = xs[k]-ax; vy = ys[k]-ay; vz = zs[k]-az
+        x = uy*vz - uz*vy
+        y = uz*vx - ux*vz
+        z = ux*vy - uy*vx
+        d = sqrt( x*x + y*y + z*z )
+        if d > 0.0001:
+            normals.append( ( x/d, y/d, z/d ) )
+        else:
+            normals.append( ( x, y, z ) )
+    return normals
+
+
+# Area-weighted unit normals of the vertices of the triangles given as
+# in triangleAreas(), for smooth shading.  Each vertex gets the sum of
+# the cross products of the triangles around it, each of which is as
+# long as twice the triangle's area, normalized.  Returns a list of
+# tuples, one per vertex.
+
+def vertexNormals( xs, ys, zs, triples ):
+
+    nx = [ 0.0 ] * len(xs)
+    ny = [ 0.0 ] * len(xs)
+    nz = [ 0.0 ] * len(xs)
+
+    for i, j, k in triples:
+        ax = xs[i]; ay = ys[i]; az = zs[i]
+        ux = xs[j]-ax; uy = ys[j]-ay; uz = zs[j]-az
+        vx = xs[k]-ax; vy = ys[k]-ay; vz = zs[k]-az
+        x = uy*vz - uz*vy
+        y = uz*vx - ux*vz
+        z = ux*vy - uy*vx
+        for v in (i, j, k):
+            nx[v] += x
+            ny[v] += y
+            nz[v] += z
+
+    return [ normalize3( x, y, z ) for x, y, z in zip( nx, ny, nz ) ]
@@ -0,0 +1,233 @@
+# Tristrip benchmark
+#
+# Usage: python benchmark.py [-sizes n,n,...] [-kinds k,k,...] [-repeat n]
+#                            [-nomem] [-keep dir] [-save file] [-check file]
+#
+#   -sizes    triangle counts of the generated meshes (default 10000,100000,1000000)
+#   -kinds    generators from meshgen.py to use (default grid,delaunay,irregular)
+#   -repeat   number of timed runs per mesh; the fastest is kept (default 1, and at least 3 with -check)
+#   -nomem    skip the (slow) peak memory pass
+#   -keep     write the generated meshes to this directory instead of a temporary one
+#   -save     save the results as a JSON baseline
+#   -check    compare the results against a JSON baseline and exit with
+#             status 1 if anything got slower, bigger, or produced more strips.
+#             Meshes in the baseline that weren't run are listed.
+#
+# The meshes in data/ are always run, followed by the generated ones.
+# For each mesh, readMesh(), buildAdjacency() and buildTristrips()
+# are timed separately, and the number of strips and the number of
+# vertices that would be sent to the GPU (strip length + 2 per strip)
+# are recorded.  Peak memory is measured in a second, untimed pass with
+# tracemalloc, since tracing slows Python down considerably.
+
+
+import sys, os, io, time, json, platform, tempfile, tracemalloc, contextlib
+
+import tristrips
+import meshgen
+
+
+dataDir = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'data')
+dataFiles = ['200', '1000', '10000']
+
+timeTolerance = 0.25    # allowed fractional slowdown before -check complains
+timeSlack = 0.05        # ... and absolute slowdown in seconds, so that timer noise on tiny meshes is ignored
+memoryTolerance = 0.10  # allowed fractional memory growth
+checkRepeat = 3         # least number of timed runs per mesh with -check, since one run is too noisy to compare
+
+
+# Count the strips and the vertices emitted for them
+
+def stripStats(tris):
+    numStrips = 0
+    numVerts = 0
+    for tri in tris:
+        if tri.prevTri is None:
+            numStrips += 1
+            n = 0
+            while tri is not None:
+                n += 1
+                tri = tri.nextTri
+            numVerts += n + 2
+    return numStrips, numVerts
+
+
+# Run the three phases on one file, returning (times, tris)
+
+def runOnce(filename):
+    times = {}
+    with contextlib.redirect_stdout(io.StringIO()):
+        with open(filename, 'rb') as f:
+            start = time.perf_counter()
+            tris = tristrips.readMesh(f, adjacency=False).triangles
+            times['read'] = time.perf_counter() - start
+
+        start = time.perf_counter()
+        tristrips.buildAdjacency(tris)
+        times['adjacency'] = time.perf_counter() - start
+
+        start = time.perf_counter()
+        tristrips.buildTristrips(tris)
+        times['strip'] = time.perf_counter() - start
+
+    return times, tris
+
+
+def peakMemory(filename):
+    tracemalloc.start()
+    try:
+        times, tris = runOnce(filename)
+        current, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    return peak
+
+
+def benchmark(name, filename, repeat, measureMemory):
+    best = None
+    for i in range(repeat):
+        times, tris = runOnce(filename)
+        if best is None:
+            best = times
+        else:
+            best = {phase: min(best[phase], times[phase]) for phase in best}
+
+    numStrips, numVerts = stripStats(tris)
+    result = {
+        'triangles': len(tris),
+        'strips': numStrips,
+        'vertices': numVerts,
+        'time': best,
+    }
+    del tris
+
+    if measureMemory:
+        result['peakMemory'] = peakMemory(filename)
+
+    print('%-18s %8d tris %7d strips %8d verts   read %7.3fs  adj %7.3fs  strip %7.3fs%s'
+          % (name, result['triangles'], numStrips, numVerts,
+             best['read'], best['adjacency'], best['strip'],
+             '  peak %6.1f MB' % (result['peakMemory'] / 1e6) if measureMemory else ''))
+    sys.stdout.flush()
+
+    return result
+
+
+# Compare results against a baseline, returning a list of complaints
+# and a list of the baseline's meshes that weren't run
+
+def compare(results, baseline):
+    problems = []
+    missing = []
+    for name, base in baseline['meshes'].items():
+        if name not in results:
+            missing.append(name)
+            continue
+        res = results[name]
+        for key in ['strips', 'vertices']:
+            if res[key] > base[key]:
+                problems.append('%s: %s went from %d to %d' % (name, key, base[key], res[key]))
+        for phase, t in base['time'].items():
+            if res['time'][phase] > t * (1 + timeTolerance) + timeSlack:
+                problems.append('%s: %s time went from %.3fs to %.3fs'
+                                % (name, phase, t, res['time'][phase]))
+        if 'peakMemory' in base and 'peakMemory' in res:
+            if res['peakMemory'] > base['peakMemory'] * (1 + memoryTolerance):
+                problems.append('%s: peak memory went from %d to %d bytes'
+                                % (name, base['peakMemory'], res['peakMemory']))
+    return problems, missing
+
+
+def main():
+    sizes = [10000, 100000, 1000000]
+    kinds = list(meshgen.generators)
+    repeat = 1
+    measureMemory = True
+    keepDir = None
+    saveFile = None
+    checkFile = None
+
+    args = sys.argv[1:]
+    while args:
+        if args[0] == '-sizes' and len(args) > 1:
+            sizes = [int(n) for n in args[1].split(',') if n]
+            args = args[1:]
+        elif args[0] == '-kinds' and len(args) > 1:
+            kinds = [k for k in args[1].split(',') if k]
+            args = args[1:]
+        elif args[0] == '-repeat' and len(args) > 1:
+            repeat = max(1, int(args[1]))
+            args = args[1:]
+        elif args[0] == '-nomem':
+            measureMemory = False
+        elif args[0] == '-keep' and len(args) > 1:
+            keepDir = args[1]
+            args = args[1:]
+        elif args[0] == '-save' and len(args) > 1:
+            saveFile = args[1]
+            args = args[1:]
+        elif args[0] == '-check' and len(args) > 1:
+            checkFile = args[1]
+            args = args[1:]
+        else:
+            print('Usage: %s [-sizes n,n,...] [-kinds k,k,...] [-repeat n] [-nomem] '
+                  '[-keep dir] [-save file] [-check file]' % sys.argv[0])
+            sys.exit(1)
+        args = args[1:]
+
+    for kind in kinds:
+        if kind not in meshgen.generators:
+            print('Error: unknown mesh kind "%s"' % kind)
+            sys.exit(1)
+
+    if checkFile:
+        repeat = max(repeat, checkRepeat)
+
+    results = {}
+
+    for name in dataFiles:
+        results[name] = benchmark(name, os.path.join(dataDir, name), repeat, measureMemory)
+
+    with tempfile.TemporaryDirectory() as tmpDir:
+        outDir = keepDir or tmpDir
+        os.makedirs(outDir, exist_ok=True)
+        for kind in kinds:
+            for size in sizes:
+                name = '%s-%d' % (kind, size)
+                filename = os.path.join(outDir, name)
+                verts, tris = meshgen.generators[kind](size)
+                with open(filename, 'wb') as f:
+                    meshgen.writeMesh(f, verts, tris)
+                del verts, tris
+                results[name] = benchmark(name, filename, repeat, measureMemory)
+
+    report = {
+        'machine': {
+            'platform': platform.platform(),
+            'processor': platform.processor() or platform.machine(),
+            'python': platform.python_version(),
+        },
+        'meshes': results,
+    }
+
+    if saveFile:
+        with open(saveFile, 'w') as f:
+            json.dump(report, f, indent=2, sort_keys=True)
+        print('Saved baseline to %s' % saveFile)
+
+    if checkFile:
+        with open(checkFile) as f:
+            baseline = json.load(f)
+        problems, missing = compare(results, baseline)
+        if missing:
+            print('Not run, so not checked: %s' % ', '.join(missing))
+        if problems:
+            print('Regressions against %s:' % checkFile)
+            for p in problems:
+                print('  ' + p)
+            sys.exit(1)
+        print('No regressions against %s' % checkFile)
+
+
+if __name__ == '__main__':
+    main()
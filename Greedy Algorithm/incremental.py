@@ -0,0 +1,277 @@
+# Incremental re-stripification after local mesh edits
+#
+# Usage: python incremental.py filename [numEdits]
+#
+# A MeshEditor wraps a tristrips.TriangleMesh that has already been
+# through readMesh() and buildTristrips().  Triangles can then be added
+# and removed, and restrip() repairs the strips around the edits
+# without touching the rest of the mesh:
+#
+#   1. Every edited triangle and every triangle sharing an edge with
+#      one is cut out of its strip.  The part of a cut strip before
+#      the region keeps the strip's ID.  The part after it is reversed
+#      and given a new ID, so that it too ends next to the region.
+#
+#   2. Strips that now end next to the region are extended back into
+#      it with growStrip(), and the remaining free triangles in the
+#      region start new strips, in order of increasing valence, just as
+#      buildTristrips() does.
+#
+#   3. Each strip that ends next to the region is joined to any other
+#      strip that ends beside it, so that a strip cut by an edit is put
+#      back together where it can be.
+#
+# Ties in valence are broken by triangle ID, so the strips are the same
+# on every run.
+#
+# The triangles stay in the mesh's 'triangles' list, which the editor
+# keeps up to date.  A removed triangle is replaced in the list by the
+# last one, so the order of the list changes as triangles are removed.
+#
+# The editor keeps a map from each edge to the triangles on it, so that
+# adjacency can be updated locally.  Apart from building that map once,
+# the work done for an edit is proportional to the number of triangles
+# in the region and in the strips regrown, reversed or joined through
+# it.
+#
+# Run as a script, this loads a mesh, strips it, and then times a
+# number of small random edits against a full rebuild.
+
+
+import sys, io, time, random, contextlib
+
+import tristrips
+
+
+def edgeKey(v0, v1):
+    return (v0, v1) if v0 < v1 else (v1, v0)
+
+
+class MeshEditor(object):
+
+    def __init__(self, mesh):
+
+        triangles = mesh.triangles
+
+        self.mesh = mesh     # holds the vertices and triangles, and gives out triangle IDs
+        self.positions = {tri: i for i, tri in enumerate(triangles)}  # index of each triangle in mesh.triangles
+        self.edges = {}      # edge key -> triangles on that edge
+        self.region = set()  # triangles to be restripped
+        self.nextStripID = 1 + max((tri.stripID for tri in triangles if tri.stripID is not None), default=-1)
+
+        for tri in triangles:
+            for i in range(3):
+                self.edges.setdefault(edgeKey(tri.verts[i], tri.verts[(i + 1) % 3]), []).append(tri)
+
+    # Add a vertex to the mesh and return its index
+
+    def addVertex(self, x, y):
+        return self.mesh.addVertex(x, y)
+
+    # Add a triangle with vertex indices 'verts' (CCW) and return it.
+    # The new triangle and its neighbours are restripped on the next
+    # call to restrip().
+
+    def addTriangle(self, verts):
+        tri = self.mesh.newTriangle(list(verts))
+
+        for i in range(3):
+            adjTris = self.edges.setdefault(edgeKey(tri.verts[i], tri.verts[(i + 1) % 3]), [])
+            for adj in adjTris:
+                tri.adjTris.append(adj)
+                adj.adjTris.append(tri)
+                self.region.add(adj)
+            adjTris.append(tri)
+
+        self.positions[tri] = len(self.mesh.triangles)
+        self.mesh.triangles.append(tri)
+        self.region.add(tri)
+        return tri
+
+    # Remove a triangle.  Its neighbours are restripped on the next
+    # call to restrip().
+
+    def removeTriangle(self, tri):
+        self.cut(tri)
+
+        for i in range(3):
+            key = edgeKey(tri.verts[i], tri.verts[(i + 1) % 3])
+            adjTris = self.edges[key]
+            adjTris.remove(tri)
+            if not adjTris:
+                del self.edges[key]
+
+        for adj in tri.adjTris:
+            adj.adjTris.remove(tri)
+            self.region.add(adj)
+        tri.adjTris = []
+
+        triangles = self.mesh.triangles
+        i = self.positions.pop(tri)
+        last = triangles.pop()
+        if last is not tri:
+            triangles[i] = last
+            self.positions[last] = i
+        self.region.discard(tri)
+
+    # Unlink a triangle from the triangles before and after it on its
+    # strip, returning those two (each may be None).
+
+    def cut(self, tri):
+        prevTri = tri.prevTri
+        nextTri = tri.nextTri
+        if prevTri is not None:
+            prevTri.nextTri = None
+            tri.prevTri = None
+        if nextTri is not None:
+            nextTri.prevTri = None
+            tri.nextTri = None
+        tri.isOnStrip = False
+        return prevTri, nextTri
+
+    # Reverse the strip that starts at 'head' and give it 'stripID'.
+    # Returns its new first triangle.
+
+    def reverse(self, head, stripID):
+        tri = head
+        while True:
+            tri.stripID = stripID
+            tri.prevTri, tri.nextTri = tri.nextTri, tri.prevTri
+            if tri.prevTri is None:
+                return tri
+            tri = tri.prevTri
+
+    # Join the strip ending at 'tail' to another strip that has an end
+    # adjacent to it, repeatedly, and return the last triangle of the
+    # joined strip.
+
+    def join(self, tail):
+        while True:
+            for adj in sorted(tail.adjTris, key=lambda t: t.id):
+                if adj.stripID == tail.stripID or not adj.isOnStrip:
+                    continue
+                if adj.nextTri is None:  # make its last triangle its first
+                    head = adj
+                    while head.prevTri is not None:
+                        head = head.prevTri
+                    self.reverse(head, adj.stripID)
+                if adj.prevTri is None:
+                    break
+            else:
+                return tail
+
+            tail.nextTri = adj
+            adj.prevTri = tail
+            tri = adj
+            while True:
+                tri.stripID = tail.stripID
+                if tri.nextTri is None:
+                    break
+                tri = tri.nextTri
+            tail = tri
+
+    # Rebuild the strips through all triangles edited since the last
+    # call.  Returns the number of new strips started.
+
+    def restrip(self):
+        region = self.region
+        self.region = set()
+
+        valence = lambda t: (len(tristrips.freeAdjacent(t)), t.id)
+
+        tails = set()
+        heads = set()
+        for tri in region:
+            prevTri, nextTri = self.cut(tri)
+            if prevTri is not None and prevTri not in region:
+                tails.add(prevTri)
+            if nextTri is not None and nextTri not in region:
+                heads.add(nextTri)
+
+        # The part of a strip after the region becomes a strip of its
+        # own, reversed so that it ends next to the region
+
+        for tri in sorted(heads, key=lambda t: t.id):
+            self.reverse(tri, self.nextStripID)
+            self.nextStripID += 1
+            tails.add(tri)
+
+        # Let the strips that were cut grow back into the region
+
+        for tri in sorted(tails, key=valence):
+            if tri.nextTri is None:
+                tristrips.growStrip(tri)
+
+        # Start new strips from what is still free
+
+        count = 0
+        for tri in sorted(region, key=valence):
+            if tri.nextTri is None and tri.prevTri is None:
+                count += 1
+                tristrips.startStrip(tri, self.nextStripID)
+                self.nextStripID += 1
+
+        # Join each strip in or beside the region at its last triangle,
+        # then, reversed, at its first
+
+        joined = set()
+        for tri in sorted(tails | region, key=lambda t: t.id):
+            if tri not in self.positions or tri.stripID in joined:
+                continue
+            while tri.nextTri is not None:
+                tri = tri.nextTri
+            tri = self.join(tri)
+            while tri.prevTri is not None:
+                tri = tri.prevTri
+            self.reverse(tri, tri.stripID)
+            self.join(tri)
+            joined.add(tri.stripID)
+
+        return count
+
+    def countStrips(self):
+        return sum(1 for tri in self.mesh.triangles if tri.prevTri is None)
+
+
+# Remove 'numEdits' random triangles and put them back, timing the
+# incremental restrip against stripping the whole mesh again.
+
+def main():
+    if len(sys.argv) < 2:
+        print('Usage: %s filename [numEdits]' % sys.argv[0])
+        sys.exit(1)
+
+    numEdits = int(sys.argv[2]) if len(sys.argv) > 2 else 10
+
+    with open(sys.argv[1], 'rb') as f:
+        mesh = tristrips.readMesh(f)
+    triangles = mesh.triangles
+
+    start = time.perf_counter()
+    with contextlib.redirect_stdout(io.StringIO()):
+        tristrips.buildTristrips(triangles)
+    fullTime = time.perf_counter() - start
+
+    editor = MeshEditor(mesh)
+    print('%d strips after full stripification in %.4fs' % (editor.countStrips(), fullTime))
+
+    rand = random.Random(0)
+    removed = rand.sample(triangles, min(numEdits, len(triangles)))
+
+    start = time.perf_counter()
+    for tri in removed:
+        editor.removeTriangle(tri)
+    editor.restrip()
+    removeTime = time.perf_counter() - start
+    print('%d strips after removing %d triangles in %.4fs' % (editor.countStrips(), len(removed), removeTime))
+
+    start = time.perf_counter()
+    for tri in removed:
+        editor.addTriangle(tri.verts)
+    editor.restrip()
+    addTime = time.perf_counter() - start
+    print('%d strips after adding them back in %.4fs' % (editor.countStrips(), addTime))
+
+
+if __name__ == '__main__':
+    main()
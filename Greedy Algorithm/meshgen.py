@@ -0,0 +1,146 @@
+# Synthetic triangle meshes for the tristrip benchmark
+#
+# Usage: python meshgen.py grid|delaunay|irregular numTriangles [seed] > file
+#
+# Each generator returns (verts, tris) where 'verts' is a list of
+# (x,y) and 'tris' is a list of (v1,v2,v3) vertex indices in
+# counterclockwise order, as described in data/format.
+#
+#   grid       - a regular grid with every cell split along the same
+#                diagonal, so every interior triangle has valence 3.
+#
+#   delaunay   - a jittered grid with each cell split along the
+#                diagonal that makes it locally Delaunay, which looks
+#                like a typical scanned or remeshed surface.
+#
+#   irregular  - a jittered grid with random diagonals and random
+#                holes punched in it, so there are many boundary
+#                triangles and triangles of valence 1 and 2.
+
+
+import sys, math, random
+
+
+# Number of cells along each side of a square grid with at least
+# 'numTris' triangles.
+
+def gridSize(numTris):
+    return max(1, int(math.ceil(math.sqrt(numTris / 2.0))))
+
+
+# (k+1) x (k+1) vertices on [0,1]^2, each moved randomly by up to
+# 'jitter' of a cell width.  A jitter under 0.25 keeps every cell
+# convex, so either diagonal gives two CCW triangles.
+
+def gridVerts(k, jitter, rand):
+    h = 1.0 / k
+    verts = []
+    for j in range(k + 1):
+        for i in range(k + 1):
+            x = i * h
+            y = j * h
+            if jitter > 0 and 0 < i < k and 0 < j < k:
+                x += rand.uniform(-jitter, jitter) * h
+                y += rand.uniform(-jitter, jitter) * h
+            verts.append((x, y))
+    return verts
+
+
+# Corners a,b,c,d (CCW from bottom left) of cell (i,j)
+
+def cellCorners(k, i, j):
+    a = j * (k + 1) + i
+    return a, a + 1, a + k + 2, a + k + 1
+
+
+# True if point d lies strictly inside the circumcircle of the CCW
+# triangle a,b,c.
+
+def inCircle(a, b, c, d):
+    adx, ady = a[0] - d[0], a[1] - d[1]
+    bdx, bdy = b[0] - d[0], b[1] - d[1]
+    cdx, cdy = c[0] - d[0], c[1] - d[1]
+    det = ((adx * adx + ady * ady) * (bdx * cdy - cdx * bdy)
+           - (bdx * bdx + bdy * bdy) * (adx * cdy - cdx * ady)
+           + (cdx * cdx + cdy * cdy) * (adx * bdy - bdx * ady))
+    return det > 0
+
+
+def gridMesh(numTris, seed=0):
+    k = gridSize(numTris)
+    verts = gridVerts(k, 0, None)
+    tris = []
+    for j in range(k):
+        for i in range(k):
+            a, b, c, d = cellCorners(k, i, j)
+            tris.append((a, b, c))
+            tris.append((a, c, d))
+    return verts, tris
+
+
+def delaunayMesh(numTris, seed=0):
+    rand = random.Random(seed)
+    k = gridSize(numTris)
+    verts = gridVerts(k, 0.2, rand)
+    tris = []
+    for j in range(k):
+        for i in range(k):
+            a, b, c, d = cellCorners(k, i, j)
+            if inCircle(verts[a], verts[b], verts[c], verts[d]):
+                tris.append((a, b, d))
+                tris.append((b, c, d))
+            else:
+                tris.append((a, b, c))
+                tris.append((a, c, d))
+    return verts, tris
+
+
+def irregularMesh(numTris, seed=0, holeFraction=0.1):
+    rand = random.Random(seed)
+    k = gridSize(numTris / (1.0 - holeFraction))
+    verts = gridVerts(k, 0.2, rand)
+    tris = []
+    for j in range(k):
+        for i in range(k):
+            a, b, c, d = cellCorners(k, i, j)
+            if rand.random() < 0.5:
+                cell = [(a, b, d), (b, c, d)]
+            else:
+                cell = [(a, b, c), (a, c, d)]
+            for t in cell:
+                if rand.random() >= holeFraction:
+                    tris.append(t)
+    return verts, tris
+
+
+generators = {
+    'grid': gridMesh,
+    'delaunay': delaunayMesh,
+    'irregular': irregularMesh,
+}
+
+
+# Write a mesh in the data/format layout.  'f' is a binary file, as
+# readMesh() expects.
+
+def writeMesh(f, verts, tris):
+    lines = ['%d' % len(verts)]
+    lines.extend('%.7g %.7g' % v for v in verts)
+    lines.append('%d' % len(tris))
+    lines.extend('%d %d %d' % t for t in tris)
+    lines.append('')
+    f.write('\n'.join(lines).encode('ascii'))
+
+
+def main():
+    if len(sys.argv) < 3 or sys.argv[1] not in generators:
+        print('Usage: %s %s numTriangles [seed] > file' % (sys.argv[0], '|'.join(generators)))
+        sys.exit(1)
+
+    seed = int(sys.argv[3]) if len(sys.argv) > 3 else 0
+    verts, tris = generators[sys.argv[1]](int(sys.argv[2]), seed)
+    writeMesh(sys.stdout.buffer, verts, tris)
+
+
+if __name__ == '__main__':
+    main()
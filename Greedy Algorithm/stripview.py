@@ -0,0 +1,236 @@
+# Window showing the triangle strips made by tristrips.py
+#
+# Keys: f - toggle forward/backward links
+#       o - toggle triangle outlines
+#       b - toggle triangle coloured backgrounds
+#       p - proceed
+#
+# Clicking on a triangle highlights it and the triangles adjacent to it.
+#
+# tristrips.py imports this only to open its window, since it imports
+# PyOpenGL and GLFW.  It is given the tristrips.TriangleMesh, and
+# doesn't import tristrips.py, which may be running as __main__.
+
+
+import sys, os, math, array
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))  # for the shared viewer package
+
+from viewer.gl import *
+from viewer.window import View2D
+
+
+# Globals
+
+view = None  # View2D showing the triangles
+windowWidth = 1000  # window dimensions
+windowHeight = 1000
+
+r = 0.008  # point radius as fraction of window size
+
+mesh = None  # TriangleMesh being shown
+
+showForwardLinks = True
+outlineTriangles = True
+showTriangleBackground = True
+
+backgroundVerts = None  # vertex and colour arrays for the triangle backgrounds,
+backgroundColours = None  # built at render time once the strips are known
+
+# Colour
+#
+# Each strip gets a colour from the palette, varied by up to 0.3 in
+# each component.  The colour is a function of the strip ID and the
+# seed alone, so it is the same on every run and costs nothing until
+# something is drawn.
+class Colour(object):
+    def __init__(self, seed=0):
+        self.seed = seed
+        self.colours = [(.4, .2, .7), (.6, .6, 0), (.6, 0, .6), (1, 0, 0), (1, 0, 1), (0, 0, 1),
+                        (0, 1, 1), (0, 1, 0), (1, 1, 0), (.6, 0, 0), (0, 0, .6), (0, .6, 0)]
+
+    def colourOf(self, stripID):
+        t = self.colours[stripID % len(self.colours)]
+        h = hash32(stripID ^ (self.seed * 0x9E3779B1))
+        return (t[0] + (h & 0x3FF) * (0.6 / 1023) - 0.3,
+                t[1] + ((h >> 10) & 0x3FF) * (0.6 / 1023) - 0.3,
+                t[2] + ((h >> 20) & 0x3FF) * (0.6 / 1023) - 0.3)
+
+
+# Integer hash with good mixing of nearby inputs (from Chris
+# Wellons' "hash prospector")
+
+def hash32(x):
+    x &= 0xFFFFFFFF
+    x ^= x >> 16
+    x = (x * 0x7FEB352D) & 0xFFFFFFFF
+    x ^= x >> 15
+    x = (x * 0x846CA68B) & 0xFFFFFFFF
+    x ^= x >> 16
+    return x
+
+
+colour = Colour()
+
+
+# The colour of a triangle: that of its strip, or its own if it is on
+# none
+
+def triangleColour(tri):
+    return colour.colourOf(tri.stripID if tri.stripID is not None else tri.id)
+
+
+def drawTriangle(tri):
+    if tri.highlight1 or tri.highlight2:
+        glColor3f(0.9, 0.9, 0.4) if tri.highlight1 else glColor3f(1, 1, 0.8)
+        glPolygonMode(GL_FRONT_AND_BACK, GL_LINE)
+        glBegin(GL_POLYGON)
+        for i in tri.verts:
+            glVertex2f(mesh.verts[i][0], mesh.verts[i][1])
+        glEnd()
+
+    if outlineTriangles:
+        glPolygonMode(GL_FRONT_AND_BACK, GL_LINE)
+        glColor3f(0, 0, 0)
+        glBegin(GL_LINE_LOOP)
+        for i in tri.verts:
+            glVertex2f(mesh.verts[i][0], mesh.verts[i][1])
+        glEnd()
+
+
+def drawPointers(tri):
+    glColor3f(1, 1, 1) if showTriangleBackground else glColor3f(0, 0, 0)
+    if showForwardLinks and tri.nextTri:
+        drawSegment(tri.centroid[0], tri.centroid[1],
+                    tri.nextTri.centroid[0], tri.nextTri.centroid[1])
+    if not showForwardLinks and tri.prevTri:
+        drawSegment(tri.centroid[0], tri.centroid[1],
+                    tri.prevTri.centroid[0], tri.prevTri.centroid[1])
+    if not tri.nextTri and not tri.prevTri:
+        glPolygonMode(GL_FRONT_AND_BACK, GL_FILL)
+        glBegin(GL_POLYGON)
+        for i in range(100):
+            theta = 3.14159 * i / 50.0
+            glVertex2f(tri.centroid[0] + 0.5 * r * math.cos(theta),
+                       tri.centroid[1] + 0.5 * r * math.sin(theta))
+        glEnd()
+
+
+# Fill in the triangle backgrounds with a single draw call from vertex
+# and colour arrays (three vertices per triangle)
+
+def drawBackgrounds(triangles):
+    global backgroundVerts, backgroundColours
+
+    if backgroundVerts is None:
+        backgroundVerts = vertexArray(triangles)
+        backgroundColours = colourArray(triangles)
+
+    glPolygonMode(GL_FRONT_AND_BACK, GL_FILL)
+    glEnableClientState(GL_VERTEX_ARRAY)
+    glEnableClientState(GL_COLOR_ARRAY)
+    glVertexPointer(2, GL_FLOAT, 0, memoryview(backgroundVerts))
+    glColorPointer(3, GL_FLOAT, 0, memoryview(backgroundColours))
+    glDrawArrays(GL_TRIANGLES, 0, 3 * len(triangles))
+    glDisableClientState(GL_COLOR_ARRAY)
+    glDisableClientState(GL_VERTEX_ARRAY)
+
+
+def vertexArray(triangles):
+    coords = array.array('f')
+    for tri in triangles:
+        for i in tri.verts:
+            coords.extend(mesh.verts[i])
+    return coords
+
+
+# The colour of each strip is computed once and written to all three
+# vertices of each of its triangles.
+
+def colourArray(triangles):
+    stripColours = {}
+    colours = array.array('f')
+    for tri in triangles:
+        key = tri.stripID if tri.stripID is not None else -1 - tri.id
+        c = stripColours.get(key)
+        if c is None:
+            c = stripColours[key] = triangleColour(tri) * 3
+        colours.extend(c)
+    return colours
+
+
+def drawSegment(x0, y0, x1, y1):
+    glBegin(GL_LINES)
+    glVertex2f(x0, y0)
+    glVertex2f(x1, y1)
+    glEnd()
+
+
+def drawTriangles():
+    if showTriangleBackground:
+        drawBackgrounds(mesh.triangles)
+
+    for tri in mesh.triangles:
+        drawTriangle(tri)
+
+    for tri in mesh.triangles:
+        drawPointers(tri)
+
+
+def display(wait=False):
+    view.display(wait)
+
+
+# Key callback function
+def keyCallback(window, key, scancode, action, mods):
+    global showForwardLinks, outlineTriangles, showTriangleBackground
+    if action == glfw.PRESS:
+        if key == ord('F'):  # toggle forward/backward link display
+            showForwardLinks = not showForwardLinks
+        elif key == ord('O'):  # toggle triangle outlining
+            outlineTriangles = not outlineTriangles
+        elif key == ord('B'):  # toggle triangle coloured background
+            showTriangleBackground = not showTriangleBackground
+
+
+def mouseButtonCallback(window, btn, action, keyModifiers):
+    if action == glfw.PRESS:
+        x, y = glfw.get_cursor_pos(window)
+        wx, wy = view.worldPoint(x, y)
+        selectedTri = None
+        for tri in mesh.triangles:
+            if tri.containsPoint([wx, wy], mesh.verts):
+                selectedTri = tri
+                break
+        if selectedTri:
+            selectedTri.highlight1 = not selectedTri.highlight1
+            print('%s with adjacent %s' % (selectedTri, repr(selectedTri.adjTris)))
+            for t in selectedTri.adjTris:
+                t.highlight2 = not t.highlight2
+
+
+# Show the triangles of 'triangleMesh', with strip colours from 'seed',
+# until the window is closed
+
+def show(triangleMesh, seed=0):
+    global view, mesh, r, colour
+
+    mesh = triangleMesh
+    colour = Colour(seed)
+
+    minX = min(p[0] for p in mesh.verts)
+    maxX = max(p[0] for p in mesh.verts)
+    minY = min(p[1] for p in mesh.verts)
+    maxY = max(p[1] for p in mesh.verts)
+
+    if maxX - minX > maxY - minY:
+        r *= maxX - minX
+    else:
+        r *= maxY - minY
+
+    view = View2D("Assignment 2", windowWidth, windowHeight, minX, maxX, minY, maxY, drawTriangles,
+                  keyCallback=keyCallback, mouseButtonCallback=mouseButtonCallback)
+
+    display(wait=True)
+
+    view.run()
@@ -1,126 +1,88 @@
-import sys, os, math, random
-
-try:  # PyOpenGL
-    from OpenGL.GL import *
-except:
-    print('Error: PyOpenGL has not been installed.')
-    sys.exit(0)
-
-try:  # GLFW
-    import glfw
-except:
-    print('Error: GLFW has not been installed.')
-    sys.exit(0)
-
-
-# Globals
-
-window = None
-windowWidth = 1000  # window dimensions
-windowHeight = 1000
-
-minX = None  # range of vertices
-maxX = None
-minY = None
-maxY = None
-
-r = 0.008  # point radius as fraction of window size
-
-allVerts = []  # all triangle vertices
-lastKey = None  # last key pressed
-
-showForwardLinks = True
-outlineTriangles = True
-showTriangleBackground = True
-
-# Colour
-class Colour(object):
-    def __init__(self):
-        self.nextColourIndex = 0
-        self.colours = [(.4, .2, .7), (.6, .6, 0), (.6, 0, .6), (1, 0, 0), (1, 0, 1), (0, 0, 1),
-                        (0, 1, 1), (0, 1, 0), (1, 1, 0), (.6, 0, 0), (0, 0, .6), (0, .6, 0)]
-
-    def nextColour(self):
-        t = self.colours[self.nextColourIndex]
-        self.nextColourIndex = (self.nextColourIndex + 1) % len(self.colours)
-        return (t[0] + random.uniform(-0.3, 0.3),
-                t[1] + random.uniform(-0.3, 0.3),
-                t[2] + random.uniform(-0.3, 0.3))
-
-
-colour = Colour()
+# Triangle strips
+#
+# Usage: python tristrips.py [-seed n] filename
+#
+#   -seed  seed for the colours of the strips (see stripview.py)
+#
+# Reads a triangle mesh (see data/format), finds the triangles adjacent
+# to each, and greedily links them into strips: each strip starts at
+# the free triangle of lowest valence and repeatedly steps to the
+# adjacent free triangle of lowest valence.
+#
+# This module needs no OpenGL, so the benchmark (benchmark.py) and
+# other batch jobs can import it without the GL stack.  Run as a
+# script, it shows the strips in a window with stripview.py.
+#
+# Each mesh is a TriangleMesh, which has its vertices and triangles and
+# gives out its triangles' IDs.  There are no globals, so meshes can be
+# read and stripped in several threads at once:
+#
+#   with open('data/1000', 'rb') as f:
+#       mesh = readMesh(f)
+#   buildTristrips(mesh.triangles)
+
+
+import sys
+
+
+# A triangle mesh
+#
+# The vertices and triangles of one mesh, and the next ID to give a
+# triangle made for it.
+
+class TriangleMesh(object):
+
+    def __init__(self, verts=None):
+        self.verts = verts if verts is not None else []  # [x, y] of each vertex
+        self.triangles = []  # triangles, as read
+        self.nextID = 0  # ID of the next triangle made
+
+    # Add a vertex and return its index
+
+    def addVertex(self, x, y):
+        self.verts.append([float(x), float(y)])
+        return len(self.verts) - 1
+
+    # Make a triangle of the vertices with indices 'verts' (CCW), with
+    # the next ID.  It is not added to 'triangles'.
+
+    def newTriangle(self, verts):
+        tri = Triangle(verts, self.verts, self.nextID)
+        self.nextID += 1
+        return tri
 
 
 # Triangle class
+#
+# A triangle's vertices are indices into the 'verts' of its mesh.
+
 class Triangle(object):
-    nextID = 0
 
-    def __init__(self, verts):
-        self.verts = verts  # 3 vertices (each an index into allVerts)
+    def __init__(self, verts, coords, id):
+        self.verts = verts  # 3 vertices (each an index into 'coords')
         self.adjTris = []  # adjacent triangles
         self.isOnStrip = False
         self.nextTri = None  # next triangle on strip
         self.prevTri = None  # previous triangle on strip
-        self.highlight1 = False  # highlight color 1
+        self.highlight1 = False  # highlight color 1 (see stripview.py)
         self.highlight2 = False  # highlight color 2
-        self.centroid = (sum([allVerts[i][0] for i in self.verts]) / len(self.verts),
-                         sum([allVerts[i][1] for i in self.verts]) / len(self.verts))
-        self.colour = colour.nextColour()
-        self.id = Triangle.nextID
-        Triangle.nextID += 1
+        self.centroid = (sum([coords[i][0] for i in self.verts]) / len(self.verts),
+                         sum([coords[i][1] for i in self.verts]) / len(self.verts))
+        self.stripID = None  # ID of the strip this triangle is on
+        self.id = id
 
     def __repr__(self):
         return 'tri-%d' % self.id
 
-    def draw(self):
-        if self.highlight1 or self.highlight2:
-            glColor3f(0.9, 0.9, 0.4) if self.highlight1 else glColor3f(1, 1, 0.8)
-            glPolygonMode(GL_FRONT_AND_BACK, GL_LINE)
-            glBegin(GL_POLYGON)
-            for i in self.verts:
-                glVertex2f(allVerts[i][0], allVerts[i][1])
-            glEnd()
-
-        if showTriangleBackground:
-            glPolygonMode(GL_FRONT_AND_BACK, GL_FILL)
-            glColor3f(*self.colour)
-            glBegin(GL_POLYGON)
-            for i in self.verts:
-                glVertex2f(allVerts[i][0], allVerts[i][1])
-            glEnd()
-
-        if outlineTriangles:
-            glPolygonMode(GL_FRONT_AND_BACK, GL_LINE)
-            glColor3f(0, 0, 0)
-            glBegin(GL_LINE_LOOP)
-            for i in self.verts:
-                glVertex2f(allVerts[i][0], allVerts[i][1])
-            glEnd()
-
-    def drawPointers(self):
-        glColor3f(1, 1, 1) if showTriangleBackground else glColor3f(0, 0, 0)
-        if showForwardLinks and self.nextTri:
-            drawSegment(self.centroid[0], self.centroid[1],
-                        self.nextTri.centroid[0], self.nextTri.centroid[1])
-        if not showForwardLinks and self.prevTri:
-            drawSegment(self.centroid[0], self.centroid[1],
-                        self.prevTri.centroid[0], self.prevTri.centroid[1])
-        if not self.nextTri and not self.prevTri:
-            glPolygonMode(GL_FRONT_AND_BACK, GL_FILL)
-            glBegin(GL_POLYGON)
-            for i in range(100):
-                theta = 3.14159 * i / 50.0
-                glVertex2f(self.centroid[0] + 0.5 * r * math.cos(theta),
-                           self.centroid[1] + 0.5 * r * math.sin(theta))
-            glEnd()
-
-    def containsPoint(self, point):
+    # Whether 'point' is in the triangle, whose vertices are in 'coords'
+
+    def containsPoint(self, point, coords):
         def sign(p1, p2, p3):
             return (p1[0] - p3[0]) * (p2[1] - p3[1]) - (p2[0] - p3[0]) * (p1[1] - p3[1])
 
-        v1 = allVerts[self.verts[0]]
-        v2 = allVerts[self.verts[1]]
-        v3 = allVerts[self.verts[2]]
+        v1 = coords[self.verts[0]]
+        v2 = coords[self.verts[1]]
+        v3 = coords[self.verts[2]]
 
         d1 = sign(point, v1, v2)
         d2 = sign(point, v2, v3)
@@ -132,108 +94,42 @@ class Triangle(object):
         return not (has_neg and has_pos)
 
 
-def drawSegment(x0, y0, x1, y1):
-    glBegin(GL_LINES)
-    glVertex2f(x0, y0)
-    glVertex2f(x1, y1)
-    glEnd()
-
-
-# Additional functions: turn, buildTristrips, display, etc.
-# Key callback function
-def keyCallback(window, key, scancode, action, mods):
-    global lastKey, showForwardLinks, outlineTriangles, showTriangleBackground
-    if action == glfw.PRESS:
-        if key == ord('F'):  # toggle forward/backward link display
-            showForwardLinks = not showForwardLinks
-        elif key == ord('O'):  # toggle triangle outlining
-            outlineTriangles = not outlineTriangles
-        elif key == ord('B'):  # toggle triangle coloured background
-            showTriangleBackground = not showTriangleBackground
-        else:
-            lastKey = key
-
-
-def mouseButtonCallback(window, btn, action, keyModifiers):
-    if action == glfw.PRESS:
-        x, y = glfw.get_cursor_pos(window)
-        wx = (x - 0) / float(windowWidth) * (windowRight - windowLeft) + windowLeft
-        wy = (windowHeight - y) / float(windowHeight) * (windowTop - windowBottom) + windowBottom
-        selectedTri = None
-        for tri in allTriangles:
-            if tri.containsPoint([wx, wy]):
-                selectedTri = tri
-                break
-        if selectedTri:
-            selectedTri.highlight1 = not selectedTri.highlight1
-            print('%s with adjacent %s' % (selectedTri, repr(selectedTri.adjTris)))
-            for t in selectedTri.adjTris:
-                t.highlight2 = not t.highlight2
-
-
 def main():
-    global window, allTriangles, minX, maxX, minY, maxY, r
+    seed = 0
     if len(sys.argv) < 2:
-        print('Usage: %s filename' % sys.argv[0])
+        print('Usage: %s [-seed n] filename' % sys.argv[0])
         sys.exit(1)
 
     args = sys.argv[1:]
     while len(args) > 1:
+        if args[0] == '-seed' and len(args) > 2:
+            seed = int(args[1])
+            args = args[1:]
         args = args[1:]
 
-    if not glfw.init():
-        print('Error: GLFW failed to initialize')
-        sys.exit(1)
-
-    window = glfw.create_window(windowWidth, windowHeight, "Assignment 2", None, None)
-
-    if not window:
-        glfw.terminate()
-        print('Error: GLFW failed to create a window')
-        sys.exit(1)
-
-    glfw.make_context_current(window)
-    glfw.swap_interval(1)
-    glfw.set_key_callback(window, keyCallback)
-    glfw.set_mouse_button_callback(window, mouseButtonCallback)
-
     with open(args[0], 'rb') as f:
-        allTriangles = readTriangles(f)
+        mesh = readMesh(f)
 
-    if allTriangles == []:
+    if mesh.triangles == []:
         return
 
-    minX = min(p[0] for p in allVerts)
-    maxX = max(p[0] for p in allVerts)
-    minY = min(p[1] for p in allVerts)
-    maxY = max(p[1] for p in allVerts)
+    buildTristrips(mesh.triangles)
 
-    if maxX - minX > maxY - minY:
-        r *= maxX - minX
-    else:
-        r *= maxY - minY
+    import stripview  # only now, since it imports PyOpenGL and GLFW
 
-    buildTristrips(allTriangles)
-    display(wait=True)
+    stripview.show(mesh, seed)
 
-    while not glfw.window_should_close(window):
-        glfw.wait_events()
-        if lastKey == glfw.KEY_ESCAPE:
-            sys.exit(0)
-
-    glfw.destroy_window(window)
-    glfw.terminate()
-
-def readTriangles(f):
-    global allVerts
+# Read a TriangleMesh from a file (see data/format).  If the file has
+# errors, they are printed and the mesh has no triangles.
 
+def readMesh(f, adjacency=True):
     errorsFound = False
     lines = f.readlines()
 
     numVerts = int(lines[0].strip())
-    allVerts = [[float(coord) for coord in line.strip().split()] for line in lines[1:numVerts + 1]]
+    mesh = TriangleMesh([[float(coord) for coord in line.strip().split()] for line in lines[1:numVerts + 1]])
 
-    for i, vert in enumerate(allVerts):
+    for i, vert in enumerate(mesh.verts):
         if len(vert) != 2:
             print(f"Line {i + 2}: vertex does not have two coordinates.")
             errorsFound = True
@@ -253,8 +149,24 @@ def readTriangles(f):
 
     tris = []
     for verts in triVerts:
-        tris.append(Triangle(verts))
+        tris.append(mesh.newTriangle(verts))
+
+    if adjacency:
+        buildAdjacency(tris)
+
+    print(f"Read {numVerts} points and {numTris} triangles")
+
+    if not errorsFound:
+        mesh.triangles = tris
 
+    return mesh
+
+
+# Fill in the 'adjTris' of each triangle from the edges it shares
+# with other triangles.  readMesh() does this unless asked not to,
+# so that the benchmark can time the two phases separately.
+
+def buildAdjacency(tris):
     edges = {}
     for tri in tris:
         for i in range(3):
@@ -267,91 +179,56 @@ def readTriangles(f):
                 adj_tri.adjTris.append(tri)
             edges[edge_key] = tri
 
-    print(f"Read {numVerts} points and {numTris} triangles")
-
-    return [] if errorsFound else tris
-def buildTristrips(triangles):
-    count = 0
-
-    def find_adjacent_non_strip_triangles(triangle):
-        return [adj for adj in triangle.adjTris if adj.nextTri is None and adj.prevTri is None]
-
-    def start_new_strip(triangle):
-        nonlocal count
-        count += 1
-        triangle.isOnStrip = True
-        current_triangle = triangle
-        current_triangle.colour = colour.nextColour()
 
-        while True:
-            adjacent_non_strip = find_adjacent_non_strip_triangles(current_triangle)
+# A triangle is free if it is not linked into a strip.  Its "valence"
+# is its number of adjacent free triangles.
 
-            if not adjacent_non_strip:
-                break
+def freeAdjacent(triangle):
+    return [adj for adj in triangle.adjTris if adj.nextTri is None and adj.prevTri is None]
 
-            next_triangle = min(adjacent_non_strip, key=lambda t: len(find_adjacent_non_strip_triangles(t)))
 
-            current_triangle.nextTri = next_triangle
-            next_triangle.prevTri = current_triangle
+# Extend the strip that ends at 'triangle' by repeatedly stepping to the
+# adjacent free triangle of minimum valence.
 
-            next_triangle.isOnStrip = True
-            next_triangle.colour = current_triangle.colour
-            current_triangle = next_triangle
+def growStrip(triangle):
+    current_triangle = triangle
 
-    triangles_sorted_by_adjacency = sorted(triangles, key=lambda t: len(find_adjacent_non_strip_triangles(t)))
-
-    for triangle in triangles_sorted_by_adjacency:
-        if triangle.nextTri is None and triangle.prevTri is None:
-            start_new_strip(triangle)
+    while True:
+        adjacent_non_strip = freeAdjacent(current_triangle)
 
-    print('Generated %d tristrips' % count)
-def display(wait=False):
-    global lastKey, windowLeft, windowRight, windowBottom, windowTop
+        if not adjacent_non_strip:
+            break
 
-    glfw.poll_events()
+        next_triangle = min(adjacent_non_strip, key=lambda t: len(freeAdjacent(t)))
 
-    glClearColor(1, 1, 1, 0)
-    glClear(GL_COLOR_BUFFER_BIT)
-    glPolygonMode(GL_FRONT_AND_BACK, GL_FILL)
+        current_triangle.nextTri = next_triangle
+        next_triangle.prevTri = current_triangle
 
-    glMatrixMode(GL_PROJECTION)
-    glLoadIdentity()
+        next_triangle.isOnStrip = True
+        next_triangle.stripID = current_triangle.stripID
+        current_triangle = next_triangle
 
-    glMatrixMode(GL_MODELVIEW)
-    glLoadIdentity()
 
-    if maxX - minX > maxY - minY:
-        windowLeft = -0.1 * (maxX - minX) + minX
-        windowRight = 1.1 * (maxX - minX) + minX
-        windowBottom = windowLeft
-        windowTop = windowRight
-    else:
-        windowTop = -0.1 * (maxY - minY) + minY
-        windowBottom = 1.1 * (maxY - minY) + minY
-        windowLeft = windowBottom
-        windowRight = windowTop
+def startStrip(triangle, stripID):
+    triangle.isOnStrip = True
+    triangle.stripID = stripID
+    growStrip(triangle)
 
-    glOrtho(windowLeft, windowRight, windowBottom, windowTop, 0, 1)
 
-    for tri in allTriangles:
-        tri.draw()
+def buildTristrips(triangles):
+    count = 0
 
-    for tri in allTriangles:
-        tri.drawPointers()
+    triangles_sorted_by_adjacency = sorted(triangles, key=lambda t: len(freeAdjacent(t)))
 
-    glfw.swap_buffers(window)
+    for triangle in triangles_sorted_by_adjacency:
+        if triangle.nextTri is None and triangle.prevTri is None:
+            startStrip(triangle, count)
+            count += 1
 
-    if wait:
-        sys.stderr.write('Press "p" to proceed ')
-        sys.stderr.flush()
+    print('Generated %d tristrips' % count)
 
-        lastKey = None
-        while lastKey != 80 and lastKey != glfw.KEY_ESCAPE:
-            glfw.wait_events()
-            display()
+    return count
 
-        sys.stderr.write('\r                     \r')
-        sys.stderr.flush()
 
 if __name__ == '__main__':
     main()
@@ -0,0 +1,27 @@
+# Shared viewer for the algorithm scripts
+#
+# The scripts in 'Divide and Conquer', 'Greedy Algorithm' and 'Dynamic
+# Programming' show their results in a GLFW window drawn with PyOpenGL.
+# Their algorithms are in modules that import neither (hull.py,
+# tristrips.py, and mesher.py and meshing.py), so that they can be
+# imported and run by a batch job without the GL stack, and start
+# quickly.  PyOpenGL and GLFW are imported only when a window is
+# opened:
+#
+#   gl.py      imports PyOpenGL and GLFW, or exits with a message if
+#              either is not installed.  A module that is only used to
+#              draw does 'from viewer.gl import *'.
+#
+#   window.py  a GLFW window that keeps its size and the last key
+#              pressed (Window), and a window showing a 2D drawing that
+#              can pause until a key is pressed (View2D)
+#
+# A script that also runs without a window, such as tristrips.py or
+# slices.py with -o, keeps its drawing in a module of its own
+# (stripview.py, sliceview.py) that does 'from viewer.gl import *', and
+# imports that module only when it opens the window.
+#
+# The package is at the top of the repository.  A script in one of the
+# algorithm directories adds the directory above its own to sys.path
+# before importing it.
+
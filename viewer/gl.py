@@ -0,0 +1,33 @@
+# PyOpenGL and GLFW, for 'from viewer.gl import *'
+#
+# This is the one place where they are imported (see __init__.py).
+
+
+import sys
+
+try: # PyOpenGL
+    from OpenGL.GL import *
+    from OpenGL.GLU import *
+except:
+    print( 'Error: PyOpenGL has not been installed.' )
+    sys.exit(0)
+
+try: # GLFW
+    import glfw
+except:
+    print( 'Error: GLFW has not been installed.' )
+    sys.exit(0)
+
+
+# OpenGL.GLUT, which is only needed to draw text and is sometimes very
+# difficult to install
+
+def importGLUT():
+
+    try:
+        from OpenGL import GLUT
+    except:
+        print( 'Error: Could not import OpenGL.GLUT.  Set haveGlutForFonts = False unless you can install GLUT.' )
+        sys.exit(0)
+
+    return GLUT
@@ -0,0 +1,159 @@
+# GLFW windows for the viewers (see __init__.py)
+
+
+import sys
+
+from viewer.gl import *
+
+
+# A GLFW window, made current, with the given callbacks (each a GLFW
+# callback or None).  It keeps its size in 'width' and 'height' and the
+# last key pressed in 'lastKey'.
+
+class Window(object):
+
+    def __init__( self, title, width, height, keyCallback=None, mouseButtonCallback=None, cursorPosCallback=None, sizeCallback=None ):
+
+        if not glfw.init():
+            print( 'Error: GLFW failed to initialize' )
+            sys.exit(1)
+
+        self.handle = glfw.create_window( width, height, title, None, None )
+
+        if not self.handle:
+            glfw.terminate()
+            print( 'Error: GLFW failed to create a window' )
+            sys.exit(1)
+
+        self.width = width
+        self.height = height
+        self.lastKey = None
+
+        self.keyCallback = keyCallback
+        self.sizeCallback = sizeCallback
+
+        glfw.make_context_current( self.handle )
+        glfw.swap_interval( 1 )
+        glfw.set_key_callback( self.handle, self.onKey )
+        glfw.set_window_size_callback( self.handle, self.onResize )
+
+        if mouseButtonCallback is not None:
+            glfw.set_mouse_button_callback( self.handle, mouseButtonCallback )
+        if cursorPosCallback is not None:
+            glfw.set_cursor_pos_callback( self.handle, cursorPosCallback )
+
+    def onKey( self, window, key, scancode, action, mods ):
+
+        if action == glfw.PRESS:
+            self.lastKey = key
+
+        if self.keyCallback is not None:
+            self.keyCallback( window, key, scancode, action, mods )
+
+    def onResize( self, window, newWidth, newHeight ):
+
+        self.width = newWidth
+        self.height = newHeight
+
+        if self.sizeCallback is not None:
+            self.sizeCallback( window, newWidth, newHeight )
+
+    # Handle events, calling redraw() after each, until 'key' or ESC is
+    # pressed.  Exits on ESC.
+
+    def waitForKey( self, key, redraw ):
+
+        sys.stderr.write( 'Press "%s" to proceed ' % chr(key).lower() )
+        sys.stderr.flush()
+
+        self.lastKey = None
+        while self.lastKey != key and self.lastKey != glfw.KEY_ESCAPE:
+            glfw.wait_events()
+            redraw()
+
+        sys.stderr.write( '\r                     \r' )
+        sys.stderr.flush()
+
+        if self.lastKey == glfw.KEY_ESCAPE:
+            sys.exit(0)
+
+    # Handle events until the window is closed or ESC is pressed, then
+    # close it
+
+    def run( self ):
+
+        while not glfw.window_should_close( self.handle ):
+            glfw.wait_events()
+            if self.lastKey == glfw.KEY_ESCAPE:
+                sys.exit(0)
+
+        self.close()
+
+    def close( self ):
+
+        glfw.destroy_window( self.handle )
+        glfw.terminate()
+
+
+# A window showing a 2D drawing of the region minX..maxX, minY..maxY,
+# with a margin, drawn by draw()
+
+class View2D(Window):
+
+    def __init__( self, title, width, height, minX, maxX, minY, maxY, draw, **callbacks ):
+
+        Window.__init__( self, title, width, height, **callbacks )
+
+        self.draw = draw
+
+        if maxX - minX > maxY - minY:  # wider spread in x direction
+            self.left = -0.1 * (maxX - minX) + minX
+            self.right = 1.1 * (maxX - minX) + minX
+            self.bottom = self.left
+            self.top = self.right
+        else:  # wider spread in y direction
+            self.top = -0.1 * (maxY - minY) + minY
+            self.bottom = 1.1 * (maxY - minY) + minY
+            self.left = self.bottom
+            self.right = self.top
+
+    # Draw the current image.  With 'wait', then wait until 'p' is
+    # pressed.
+
+    def display( self, wait=False ):
+
+        # Handle any events that have occurred
+
+        glfw.poll_events()
+
+        # Set up window
+
+        glClearColor( 1, 1, 1, 0 )
+        glClear( GL_COLOR_BUFFER_BIT )
+        glPolygonMode( GL_FRONT_AND_BACK, GL_FILL )
+
+        glMatrixMode( GL_PROJECTION )
+        glLoadIdentity()
+
+        glMatrixMode( GL_MODELVIEW )
+        glLoadIdentity()
+
+        glOrtho( self.left, self.right, self.bottom, self.top, 0, 1 )
+
+        self.draw()
+
+        # Show window
+
+        glfw.swap_buffers( self.handle )
+
+        if wait:
+            self.waitForKey( ord('P'), self.display )
+
+    # The point of the drawing at window position (x, y)
+
+    def worldPoint( self, x, y ):
+
+        wx = x / float(self.width) * (self.right - self.left) + self.left
+        wy = (self.height - y) / float(self.height) * (self.top - self.bottom) + self.bottom
+
+        return wx, wy